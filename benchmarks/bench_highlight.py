@@ -0,0 +1,143 @@
+"""
+Sözdizimi renklendirme ölçümü: her dil için sentetik bir dosya QTextDocument'e
+yüklenir ve renklendiricinin tüm belgeyi işleme süresi ölçülür.
+
+Kullanım:
+    python benchmarks/bench_highlight.py                 # 10000 satır, tüm diller
+    python benchmarks/bench_highlight.py --lines 50000 --repeat 5
+    python benchmarks/bench_highlight.py --lang py
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QTextDocument
+
+from client.highlighter_registry import HighlighterRegistry
+
+SAMPLES = {
+    "py": [
+        'import os',
+        'from collections import OrderedDict as OD',
+        'class Sample(object):',
+        '    """Belge dizesi',
+        '    birden fazla satıra yayılır."""',
+        '    def method(self, value=None):  # yorum',
+        '        if value is not None and value in self.items:',
+        '            return "çift tırnak" + \'tek tırnak\'',
+        '        for i in range(10):',
+        '            while True:',
+        '                break',
+        '        return lambda x: x or False',
+    ],
+    "js": [
+        '/* çok satırlı',
+        '   yorum */',
+        'function sample(value) {',
+        '    const items = ["a", \'b\', `c`];',
+        '    for (let i = 0; i < items.length; i++) {  // yorum',
+        '        if (value instanceof Object) return null;',
+        '    }',
+        '    return typeof value === "string" ? true : false;',
+        '}',
+    ],
+    "html": [
+        '<!-- çok satırlı',
+        '     yorum -->',
+        '<div class="container" id=\'main\'>',
+        '  <a href="/yol?x=1" title="bağlantı">metin</a>',
+        '  <img src="resim.png" alt="" />',
+        '</div>',
+    ],
+    "css": [
+        '/* çok satırlı',
+        '   yorum */',
+        '.container #main a:hover {',
+        '    color: #333;',
+        '    margin: 0 auto;',
+        '}',
+    ],
+    "java": [
+        '/** Belge',
+        '  yorumu */',
+        '@Override',
+        'public static void main(String[] args) throws Exception {',
+        '    char c = \'x\'; String s = "çift \\" tırnak";  // yorum',
+        '    if (args.length > 0 && s != null) return;',
+        '}',
+    ],
+    "c": [
+        '#include <stdio.h>',
+        '/* çok satırlı',
+        '   yorum */',
+        'static int sample(const char *value) {',
+        '    if (value == NULL) return -1;  // yorum',
+        '    printf("%s\\n", value); char c = \'\\0\';',
+        '    return sizeof(int);',
+        '}',
+    ],
+    "cs": [
+        '#region Örnek',
+        'public sealed class Sample : IDisposable {',
+        '    private readonly string path = @"C:\\klasör\\dosya.txt";',
+        '    public async Task<int> RunAsync() { var s = $"{path}"; return await Task.FromResult(0); }',
+        '    /* yorum */ public void Dispose() { }  // yorum',
+        '}',
+    ],
+    "sql": [
+        '-- yorum',
+        'SELECT u.id, u.name FROM users u',
+        '  LEFT JOIN orders o ON o.user_id = u.id',
+        "  WHERE u.name LIKE 'a''b%' AND o.total BETWEEN 10 AND 20",
+        '  /* çok satırlı',
+        '     yorum */ ORDER BY u.name DESC;',
+    ],
+}
+
+
+def make_text(lines, total):
+    out = []
+    while len(out) < total:
+        out.extend(lines)
+    return "\n".join(out[:total])
+
+
+def bench(cls, text, repeat):
+    doc = QTextDocument()
+    doc.setPlainText(text)
+    best = None
+    for _ in range(repeat):
+        highlighter = cls(doc)
+        start = time.perf_counter()
+        highlighter.rehighlight()
+        elapsed = time.perf_counter() - start
+        highlighter.setDocument(None)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sözdizimi renklendirme ölçümü")
+    parser.add_argument("--lines", type=int, default=10000, help="Dosya başına satır sayısı")
+    parser.add_argument("--repeat", type=int, default=3, help="Tekrar sayısı (en iyisi raporlanır)")
+    parser.add_argument("--lang", choices=sorted(SAMPLES), help="Yalnızca bu dili ölç")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    registry = HighlighterRegistry()
+    for lang, lines in SAMPLES.items():
+        if args.lang and lang != args.lang:
+            continue
+        cls = registry.lexer_for_path(f"sample.{lang}")
+        text = make_text(lines, args.lines)
+        elapsed = bench(cls, text, args.repeat)
+        print(f"{lang:5s} {cls.__name__:22s} {args.lines} satır: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Dosya ağacı oluşturma karşılaştırması: önceki os.walk tabanlı build_tree ile
+file_browser.scan_tree (tek geçişli os.scandir) aynı klasör üzerinde ölçülür.
+
+Kullanım:
+    python benchmarks/bench_tree.py                # geçici sentetik paylaşım oluşturur
+    python benchmarks/bench_tree.py /yol/klasör    # var olan bir klasörü ölçer
+    python benchmarks/bench_tree.py --dirs 3000 --files 20 --repeat 5
+    python benchmarks/bench_tree.py --workers 8 --latency 2   # ağ sürücüsü benzetimi
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import file_browser
+
+logger = logging.getLogger('FileServer.Benchmark')
+
+def build_tree_walk(base_dir):
+    """
+    Belirtilen klasörden başlayarak dosya ve klasör ağacını döner.
+    Sadece isim ve alt klasör bilgisi içerir.
+    Güvenlik kontrolü yaparak base_dir dışına çıkmayı engeller.
+    Sadece izin verilen uzantılara sahip dosyaları içerir.
+    Hariç tutulan klasörleri ve dosya uzantılarını atlar.
+
+    (os.walk tabanlı önceki uygulama, karşılaştırma için aynen korunmuştur.)
+    """
+    logger.info(f"Dosya ağacı oluşturuluyor: {base_dir}")
+    
+    # Base_dir'i normalize et
+    base_dir = os.path.normpath(os.path.realpath(os.path.abspath(base_dir)))
+    
+    tree = {}
+    total_files = 0
+    allowed_files = 0
+    excluded_dirs = 0
+    excluded_files = 0
+    
+    for root, dirs, files in os.walk(base_dir):
+        # Hariç tutulan klasörleri dirs listesinden çıkar
+        # Bu, os.walk'ın bu klasörlere girmesini engeller
+        dirs[:] = [d for d in dirs if d not in file_browser.EXCLUDED_DIRECTORIES]
+        
+        # Güvenlik kontrolü: Bu klasör base_dir içinde mi?
+        rel_path_to_root = os.path.relpath(root, base_dir)
+        if not file_browser.is_safe_path(base_dir, rel_path_to_root):
+            logger.warning(f"Güvenlik kontrolü başarısız: {rel_path_to_root}")
+            continue
+            
+        # Göreli path
+        rel_path = os.path.relpath(root, base_dir)
+        
+        # Klasör hariç tutulanlar listesinde mi kontrol et
+        if any(excluded_dir in rel_path.split(os.sep) for excluded_dir in file_browser.EXCLUDED_DIRECTORIES):
+            logger.debug(f"Hariç tutulan klasör atlandı: {rel_path}")
+            excluded_dirs += 1
+            continue
+        
+        # Kök dizin için özel işlem
+        if rel_path == ".":
+            # Sadece izin verilen uzantılara sahip dosyaları filtrele
+            filtered_files = []
+            for file in files:
+                total_files += 1
+                _, ext = os.path.splitext(file)
+                
+                # Hariç tutulan uzantıları kontrol et
+                if ext.lower() in file_browser.EXCLUDED_EXTENSIONS:
+                    logger.debug(f"Hariç tutulan uzantı: {file} (uzantı: {ext})")
+                    excluded_files += 1
+                    continue
+                
+                if ext.lower() in file_browser.ALLOWED_EXTENSIONS:
+                    filtered_files.append(file)
+                    allowed_files += 1
+                    logger.debug(f"İzin verilen dosya: {file}")
+                else:
+                    logger.debug(f"Filtrelenen dosya: {file} (uzantı: {ext})")
+            
+            # Kök dizin için dosyaları ve alt klasörleri ayarla
+            tree["files"] = filtered_files
+            tree["children"] = {}
+            continue
+        
+        # Alt dizinler için
+        path_parts = rel_path.split(os.sep)
+        current = tree
+        
+        # Dizin yolunu oluştur
+        for i, part in enumerate(path_parts):
+            if i < len(path_parts) - 1:
+                current = current.setdefault("children", {}).setdefault(part, {})
+            else:
+                # Son dizin
+                if "children" not in current:
+                    current["children"] = {}
+                if part not in current["children"]:
+                    current["children"][part] = {"files": [], "children": {}}
+                
+                # Sadece izin verilen uzantılara sahip dosyaları filtrele
+                filtered_files = []
+                for file in files:
+                    total_files += 1
+                    _, ext = os.path.splitext(file)
+                    
+                    # Hariç tutulan uzantıları kontrol et
+                    if ext.lower() in file_browser.EXCLUDED_EXTENSIONS:
+                        logger.debug(f"Hariç tutulan uzantı: {os.path.join(rel_path, file)} (uzantı: {ext})")
+                        excluded_files += 1
+                        continue
+                    
+                    if ext.lower() in file_browser.ALLOWED_EXTENSIONS:
+                        filtered_files.append(file)
+                        allowed_files += 1
+                        #logger.debug(f"İzin verilen dosya: {os.path.join(rel_path, file)}")
+                    else:
+                        pass
+                        #logger.debug(f"Filtrelenen dosya: {os.path.join(rel_path, file)} (uzantı: {ext})")
+                
+                current["children"][part]["files"] = filtered_files
+
+    logger.info(f"Dosya ağacı oluşturuldu. Toplam dosya: {total_files}, İzin verilen: {allowed_files}, Hariç tutulan klasör: {excluded_dirs}, Hariç tutulan dosya: {excluded_files}")
+    logger.debug(f"Ağaç yapısı: {str(tree)[:500]}...")
+    return tree
+
+
+def _normalize(node):
+    """Sıralamadan bağımsız karşılaştırma için ağacı sıralı hale getirir."""
+    return {
+        "files": sorted(node.get("files", [])),
+        "children": {name: _normalize(child) for name, child in sorted(node.get("children", {}).items())},
+    }
+
+
+def _iter_order(node, prefix=""):
+    """Ağaçtaki dosya ve klasörleri sözlük sırasıyla dolaşır."""
+    for name in node["files"]:
+        yield prefix + name
+    for name, child in node["children"].items():
+        yield prefix + name + "/"
+        yield from _iter_order(child, prefix + name + "/")
+
+
+def make_share(root, dirs, files_per_dir, fanout=8):
+    """Verilen sayıda klasör ve her klasörde files_per_dir dosya içeren sentetik bir paylaşım oluşturur."""
+    extensions = [".py", ".txt", ".md", ".json", ".pyc", ".bin", ".csv"]
+    paths = [root]
+    created = 0
+    index = 0
+    while created < dirs:
+        parent = paths[index // fanout]
+        path = os.path.join(parent, f"d{created}")
+        os.mkdir(path)
+        paths.append(path)
+        created += 1
+        index += 1
+    for n, path in enumerate(paths):
+        for i in range(files_per_dir):
+            open(os.path.join(path, f"f{i}{extensions[(n + i) % len(extensions)]}"), "w").close()
+    # Hariç tutulan klasörlerin içine girilmediğini de ölçüme katmak için
+    excluded = os.path.join(root, "node_modules", "pkg")
+    os.makedirs(excluded)
+    for i in range(files_per_dir * 10):
+        open(os.path.join(excluded, f"m{i}.js"), "w").close()
+
+
+def add_latency(seconds):
+    """Her klasör listelemesine gecikme ekleyerek ağ sürücüsü/yavaş USB bellek benzetimi yapar."""
+    scandir = os.scandir
+
+    def slow_scandir(path="."):
+        time.sleep(seconds)
+        return scandir(path)
+
+    # os.walk da os.scandir'i kullandığı için iki yöntem aynı gecikmeyi görür
+    os.scandir = slow_scandir
+
+
+def measure(func, base_dir, repeat):
+    """En iyi süreyi ve son sonucu döner."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(base_dir)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dosya ağacı oluşturma karşılaştırması")
+    parser.add_argument("path", nargs="?", help="Ölçülecek klasör (verilmezse sentetik paylaşım oluşturulur)")
+    parser.add_argument("--dirs", type=int, default=2000, help="Sentetik paylaşımdaki klasör sayısı")
+    parser.add_argument("--files", type=int, default=15, help="Klasör başına dosya sayısı")
+    parser.add_argument("--repeat", type=int, default=3, help="Tekrar sayısı (en iyi süre raporlanır)")
+    parser.add_argument("--workers", type=int, default=8, help="Paralel tarama için thread sayısı")
+    parser.add_argument("--latency", type=float, default=0.0, help="Klasör listeleme başına eklenecek gecikme (ms)")
+    args = parser.parse_args()
+
+    # Ölçüm sırasında ayrıntılı loglar kapatılır
+    logging.basicConfig(level=logging.WARNING)
+
+    temp_dir = None
+    base_dir = args.path
+    if base_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix="kodaman-bench-")
+        print(f"Sentetik paylaşım oluşturuluyor: {args.dirs} klasör x {args.files} dosya")
+        make_share(temp_dir, args.dirs, args.files)
+        base_dir = temp_dir
+    base_dir = os.path.normpath(os.path.realpath(os.path.abspath(base_dir)))
+
+    if args.latency > 0:
+        add_latency(args.latency / 1000)
+        print(f"Klasör listeleme başına {args.latency} ms gecikme ekleniyor")
+
+    try:
+        walk_time, walk_tree = measure(build_tree_walk, base_dir, args.repeat)
+        scan_time, scan_tree = measure(file_browser.scan_tree, base_dir, args.repeat)
+        parallel_time, parallel_tree = measure(
+            lambda path: file_browser.scan_tree(path, workers=args.workers), base_dir, args.repeat)
+        print(f"os.walk build_tree : {walk_time * 1000:9.1f} ms")
+        print(f"scandir scan_tree  : {scan_time * 1000:9.1f} ms  ({walk_time / scan_time:.2f}x)")
+        print(f"paralel ({args.workers:2d} thread): {parallel_time * 1000:9.1f} ms  ({walk_time / parallel_time:.2f}x)")
+        if _normalize(walk_tree) == _normalize(scan_tree):
+            print("Ağaçlar aynı")
+        else:
+            print("UYARI: Ağaçlar farklı (sembolik bağlantılar veya tarama sırasında değişen dosyalar olabilir)")
+        # Paralel tarama sıralı taramayla aynı sırayı üretmelidir (normalize edilmeden karşılaştırılır)
+        if list(_iter_order(parallel_tree)) == list(_iter_order(scan_tree)):
+            print("Paralel tarama sıralı taramayla aynı")
+        else:
+            print("UYARI: Paralel tarama farklı sonuç verdi")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
 import sys
 import socket
-import json
 import logging
 import os
+import time
+import threading
 
 # Add project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,14 +20,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger('FileClient')
 
+# Yanıtı bu süre içinde gelmeyen istekler zaman aşımına uğrar; akışlarda her parça süreyi yeniler
+REQUEST_TIMEOUT = 30.0
+
+
+class PendingRequest:
+    """Yanıtı beklenen bir istek: kimliği, komutu ve (varsa) ilgili yol ile bayt aralığı."""
+
+    def __init__(self, request_id, command, path=None, offset=None, length=None):
+        self.request_id = request_id
+        self.command = command
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.deadline = time.monotonic() + REQUEST_TIMEOUT
+
+
 class ClientConnection:
     running = None
-    def __init__(self, host='127.0.0.1', port=9009):
+    def __init__(self, host='127.0.0.1', port=9009, framing=protocol.FRAMING_NEWLINE, compression=True):
         self.host = host
         self.port = port
+        # Satır sonlu mod her sunucuda çalışır; çerçeveli modu (ve sıkıştırmayı) yalnızca
+        # yeni sunucular tanır, eski sunucu çerçeveyi satır sonu bekleyerek okumaya çalışır
+        self.framing = framing
+        # login sırasında sunucuya sıkıştırma önerilsin mi (yalnızca çerçeveli modda)
+        self.compression = compression
         self.sock = None
+        self.reader = None
+        # Her isteğe bir kimlik verilir; yanıtlar sırası karışık gelse de kimlikle eşleşir.
+        # Tablo hem arayüz hem alıcı iş parçacığından kullanıldığı için kilitlidir
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._last_request_id = 0
+        # Sunucunun login yanıtında bildirdiği isteğe bağlı özellikler (eski sunucular yanıt vermez)
+        self.server_features = set()
+        # list_dir'i tanımayan eski sunucularda ağacın tamamı get_tree ile istenir
+        self.list_dir_supported = True
         self._create_socket()
-        self.buffer = ""
         logger.info(f"Client bağlantısı oluşturuldu: {host}:{port}")
 
     def _create_socket(self):
@@ -44,6 +75,11 @@ class ClientConnection:
         try:
             logger.info(f"Sunucuya bağlanılıyor: {self.host}:{self.port}")
             self.sock.connect((self.host, self.port))
+            self.reader = protocol.MessageReader(self.sock, self.framing)
+            with self._pending_lock:
+                self._pending.clear()
+            self.server_features = set()
+            self.list_dir_supported = True
             self.running = True
             logger.info(f"Sunucuya bağlanıldı: {self.host}:{self.port}")
         except Exception as e:
@@ -55,105 +91,251 @@ class ClientConnection:
     def close(self):
         """Bağlantıyı kapat"""
         self.running = False
-        if self.sock:
+        # Alıcı iş parçacığı da bağlantı bitince close çağırır; soket önce alınır ki iki taraf çakışmasın
+        sock, self.sock = self.sock, None
+        if sock:
             try:
                 # Gracefully shutdown the socket
                 logger.debug("Soket kapatılıyor...")
-                self.sock.shutdown(socket.SHUT_RDWR)
+                sock.shutdown(socket.SHUT_RDWR)
             except OSError:
                 # Socket already closed
                 logger.debug("Soket zaten kapalı")
                 pass
             finally:
                 # Ensure socket is closed
-                self.sock.close()
-                self.sock = None
+                sock.close()
                 logger.info("Bağlantı kapatıldı")
 
-    def send(self, message):
+    def send(self, message, request_id=None):
         try:
             logger.debug(f"Gönderilen mesaj: {message[:100]}...")
-            self.sock.sendall(message.encode("utf-8"))
+            self.sock.sendall(protocol.to_wire(message, self.framing, request_id=request_id))
             logger.debug(f"Mesaj gönderildi: {message[:50]}...")
         except Exception as e:
             logger.error(f"Mesaj gönderme hatası: {str(e)}")
             raise
 
+    def send_request(self, message, command, path=None, offset=None, length=None):
+        """
+        Mesajı yeni bir istek kimliğiyle gönderir ve yanıtı beklenenler tablosuna ekler.
+        Kimliği döner; yanıtın her parçası (file_chunk akışları dahil) bu kimliği taşır.
+        """
+        with self._pending_lock:
+            self._last_request_id = self._last_request_id % protocol.MAX_REQUEST_ID + 1
+            request_id = self._last_request_id
+            self._pending[request_id] = PendingRequest(request_id, command, path, offset, length)
+        try:
+            self.send(message, request_id)
+        except Exception:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise
+        return request_id
+
+    def cancel(self, request_id):
+        """
+        Yanıtı artık beklenmeyen isteği iptal eder: geç gelen yanıtları atılır, sunucu da
+        kuyruktaki isteği atlar veya süren akışı durdurur. İstek zaten tamamlandıysa False.
+        """
+        with self._pending_lock:
+            request = self._pending.pop(request_id, None)
+        if request is None:
+            return False
+        logger.debug(f"İstek iptal edildi: {request_id} {request.command} {request.path or ''}")
+        self._send_cancel(request_id)
+        return True
+
+    def is_pending(self, request_id):
+        with self._pending_lock:
+            return request_id in self._pending
+
+    def expire_requests(self):
+        """Süresi dolan istekleri tablodan çıkarıp (sunucuda da iptal ederek) döner."""
+        now = time.monotonic()
+        with self._pending_lock:
+            expired = [request for request in self._pending.values() if request.deadline <= now]
+            for request in expired:
+                del self._pending[request.request_id]
+        for request in expired:
+            logger.warning(f"İstek zaman aşımına uğradı: {request.request_id} {request.command} {request.path or ''}")
+            self._send_cancel(request.request_id)
+        return expired
+
+    def _send_cancel(self, request_id):
+        if not self.running or protocol.FEATURE_CANCEL not in self.server_features:
+            # cancel'i bilmeyen sunucu "Bilinmeyen komut" hatası döner; geç gelen yanıt zaten atılır
+            return
+        try:
+            self.send(protocol.make_cancel_message(request_id))
+        except Exception:
+            # Bağlantı koptuysa sunucu isteği zaten bırakır
+            pass
+
+    def _resolve(self, message):
+        """
+        Yanıtı bekleyen isteğiyle eşleştirir; isteğin son yanıtıysa tablodan çıkarır.
+        Kimliği olup tabloda olmayan yanıtlar (iptal edilmiş veya zaman aşımına uğramış
+        isteklerin geç kalan yanıtları) için False döner. Kimliksiz mesajlar (sunucu
+        bildirimleri, kimlik desteklemeyen sunucular) her zaman kabul edilir.
+        İsteğin son yanıtına (hata veya eof parçası dahil) isteğin kendisi "request" alanında
+        eklenir; arayüz hangi komutun, yolun ve bayt aralığının yanıtlandığını buradan öğrenir.
+        """
+        request_id = message.get("id")
+        if request_id is None:
+            if message.get("response") == "error":
+                self._match_unknown_command(message)
+            return True
+        with self._pending_lock:
+            request = self._pending.get(request_id)
+            if request is None:
+                return False
+            if message.get("response") == "file_chunk" and not message.get("eof"):
+                request.deadline = time.monotonic() + REQUEST_TIMEOUT
+            else:
+                del self._pending[request_id]
+                message["request"] = request
+        return True
+
+    def _match_unknown_command(self, message):
+        """
+        Kimlik taşımayan eski sunucuların "Bilinmeyen komut" hatasını o komutun bekleyen en eski
+        isteğiyle eşleştirir; hata böylece kimlikli hatalar gibi isteğine ulaşır.
+        """
+        error = message.get("error", "")
+        if not error.startswith(protocol.UNKNOWN_COMMAND_ERROR):
+            return
+        command = error[len(protocol.UNKNOWN_COMMAND_ERROR):]
+        with self._pending_lock:
+            request = next((r for r in self._pending.values() if r.command == command), None)
+            if request is None:
+                return
+            del self._pending[request.request_id]
+        if command == "list_dir":
+            logger.info("Sunucu list_dir desteklemiyor, ağacın tamamı istenecek")
+            self.list_dir_supported = False
+        message["id"] = request.request_id
+        message["request"] = request
+
     def receive_messages(self):
         """
-        Socket'tan gelen verileri okur ve \n ile ayrılmış JSON mesajlarını yield eder.
+        Socket'tan gelen JSON mesajlarını (çerçeveli veya \n ile ayrılmış) yield eder.
         """
         logger.info("Mesaj dinleme başladı")
         while self.running:
             try:
-                data = self.sock.recv(1024).decode("utf-8")
-                if not data:  # Sunucu bağlantıyı kapattı
+                payload = self.reader.read_payload()
+                if payload is None:  # Sunucu bağlantıyı kapattı
                     logger.warning("Sunucu bağlantıyı kapattı")
                     self.running = False
                     break
                 
-                logger.debug(f"Ham veri alındı: {data[:100]}...")
-                self.buffer += data
-                
-                while '\n' in self.buffer:
-                    line, self.buffer = self.buffer.split('\n', 1)
-                    message = protocol.parse_message(line)
-                    if message:
-                        logger.debug(f"İşlenen mesaj: {str(message)[:200]}...")
-                        
-                        # Hata yanıtlarını işle
-                        if message.get("response") == "error":
-                            error_msg = message.get("error", "Bilinmeyen hata")
-                            logger.warning(f"Sunucu hatası: {error_msg}")
-                            yield {"type": "error", "message": error_msg}
-                        elif message.get("response") == "tree":
-                            logger.info("Dosya ağacı alındı")
-                            tree_data = message.get("data", {})
-                            logger.debug(f"Ağaç verisi: {str(tree_data)[:200]}...")
-                            yield message
-                        elif message.get("response") == "file":
-                            path = message.get("path", "")
-                            content_length = len(message.get("content", ""))
-                            logger.info(f"Dosya alındı: {path} ({content_length} karakter)")
-                            yield message
-                        else:
-                            logger.info(f"Diğer mesaj alındı: {message.get('response', 'bilinmeyen')}")
-                            yield message
-            except (ConnectionError, OSError, socket.error) as e:
+                logger.debug(f"Mesaj alındı: {len(payload)} byte")
+                message = protocol.parse_message(payload)
+                if message:
+                    logger.debug(f"İşlenen mesaj: {message.get('response')} {message.get('path', '')}")
+                    if self.reader.request_id is not None:
+                        message["id"] = self.reader.request_id
+                    if not self._resolve(message):
+                        logger.debug(f"Beklenmeyen yanıt atlandı: {message.get('id')} {message.get('response')}")
+                        continue
+                    if message.get("response") == "login":
+                        self.server_features = set(message.get("features") or [])
+                    
+                    # Hata yanıtlarını işle (kimlikli hatalar isteğiyle eşleşebilsin diye olduğu gibi iletilir)
+                    if message.get("response") == "error" and message.get("id") is None:
+                        error_msg = message.get("error", "Bilinmeyen hata")
+                        logger.warning(f"Sunucu hatası: {error_msg}")
+                        yield {"type": "error", "message": error_msg}
+                    elif message.get("response") == "tree":
+                        logger.info("Dosya ağacı alındı")
+                        yield message
+                    elif message.get("response") == "file":
+                        path = message.get("path", "")
+                        content_length = len(message.get("content", ""))
+                        logger.info(f"Dosya alındı: {path} ({content_length} karakter)")
+                        yield message
+                    else:
+                        logger.info(f"Diğer mesaj alındı: {message.get('response', 'bilinmeyen')}")
+                        yield message
+            except (ConnectionError, OSError, socket.error, protocol.ProtocolError) as e:
                 # Bağlantı hatası oluştu
                 logger.error(f"Bağlantı hatası: {str(e)}")
                 self.running = False
                 yield {"type": "error", "message": f"Bağlantı hatası: {str(e)}"}
                 break
         
-        # Bağlantı koptuğunda soketi temizle
+        # Bağlantı koptuğunda soketi temizle; bekleyen isteklerin yanıtı artık gelmez
         logger.info("Mesaj dinleme sonlandı")
         self.close()
+        with self._pending_lock:
+            self._pending.clear()
         yield {"type": "connection_lost", "message": "Sunucu bağlantısı kesildi"}
 
     # === Yardımcı metodlar ===
-    def request_tree(self):
-        """Dosya ağacını iste"""
+    def login(self, name):
+        """
+        Giriş mesajı gönderir. Sıkıştırma açıksa desteklenen yöntemler de sunulur;
+        sunucu seçtiği yöntemi login yanıtında bildirir.
+        """
+        offered = None
+        if self.compression and self.framing == protocol.FRAMING_FRAMED:
+            offered = protocol.available_compressions()
+        logger.info(f"Giriş yapılıyor: {name} (sıkıştırma: {offered})")
+        self.send(protocol.make_login_message(name, offered, list(protocol.FEATURES)))
+
+    def request_tree(self, version=None):
+        """Dosya ağacını iste. version verilirse ağaç değişmediğinde not_modified yanıtı gelir."""
         try:
             logger.info("Dosya ağacı isteniyor")
-            self.send(protocol.make_get_tree_message())
+            return self.send_request(protocol.make_get_tree_message(version), "get_tree")
         except Exception as e:
             logger.error(f"Dosya ağacı isteme hatası: {str(e)}")
             raise
 
+    def request_dir(self, path="", depth=1):
+        """Bir klasörün içeriğini iste; yanıt dir_listing mesajı olarak gelir."""
+        try:
+            logger.info(f"Klasör içeriği isteniyor: {path or '.'} (derinlik {depth})")
+            return self.send_request(protocol.make_list_dir_message(path, depth), "list_dir", path)
+        except Exception as e:
+            logger.error(f"Klasör isteme hatası: {str(e)}")
+            raise
+
+    def request_search(self, query, limit=100):
+        """Paylaşılan dosyalarda arama iste; yanıt search_results mesajı olarak gelir."""
+        try:
+            logger.info(f"Arama isteniyor: {query}")
+            return self.send_request(protocol.make_search_message(query, limit), "search")
+        except Exception as e:
+            logger.error(f"Arama isteme hatası: {str(e)}")
+            raise
+
+    def request_find_path(self, query, limit=50, mode="fuzzy"):
+        """Adı veya yolu sorguyla eşleşen dosyaları iste; yanıt path_matches mesajı olarak gelir."""
+        try:
+            logger.debug(f"Yol araması isteniyor: {query}")
+            return self.send_request(protocol.make_find_path_message(query, limit, mode), "find_path")
+        except Exception as e:
+            logger.error(f"Yol araması isteme hatası: {str(e)}")
+            raise
+
     def request_users(self):
         """
         Sunucudan aktif kullanıcı listesini ister.
         """
         try:
             logger.info("Kullanıcı listesi isteniyor")
-            self.send(protocol.make_get_users_message())
+            return self.send_request(protocol.make_get_users_message(), "get_users")
         except Exception as e:
             logger.error(f"Kullanıcı listesi isteme hatası: {str(e)}")
             raise
 
-    def request_file(self, rel_path):
-        """Dosya içeriğini iste"""
+    def request_file(self, rel_path, version=None):
+        """
+        Dosya içeriğini iste. version verilirse dosya değişmediğinde not_modified yanıtı gelir.
+        İstek kimliğini döner; yol güvenli değilse False.
+        """
         try:
             # Path güvenlik kontrolü - client tarafında da kontrol edelim
             if ".." in rel_path.split("/"):
@@ -161,8 +343,25 @@ class ClientConnection:
                 return False
                 
             logger.info(f"Dosya isteniyor: {rel_path}")
-            self.send(protocol.make_get_file_message(rel_path))
-            return True
+            return self.send_request(protocol.make_get_file_message(rel_path, version), "get_file", rel_path)
+        except Exception as e:
+            logger.error(f"Dosya isteme hatası: {str(e)}")
+            raise
+    def request_file_range(self, rel_path, offset=0, length=None, version=None):
+        """
+        Dosyayı (veya bir bölümünü) file_chunk mesajları halinde iste.
+        İlk parça geldiğinde gösterilmeye başlanabilir; son parçada eof=True olur.
+        İstek kimliğini döner; yol güvenli değilse False.
+        """
+        try:
+            # Path güvenlik kontrolü - client tarafında da kontrol edelim
+            if ".." in rel_path.split("/"):
+                logger.warning(f"Güvenlik uyarısı: Dosya yolu '..' içeriyor: {rel_path}")
+                return False
+
+            logger.info(f"Dosya akışı isteniyor: {rel_path} [{offset}+{length}]")
+            return self.send_request(protocol.make_get_file_range_message(rel_path, offset, length, version),
+                                     "get_file_range", rel_path, offset, length)
         except Exception as e:
             logger.error(f"Dosya isteme hatası: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,192 @@
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger('FileClient.ContentCache')
+
+# Varsayılan bütçeler (tercihlerde cache.memory_mb / cache.disk_mb ile değiştirilebilir)
+CACHE_MEMORY_BYTES = 64 * 1024 * 1024
+CACHE_DISK_BYTES = 256 * 1024 * 1024
+
+
+class ContentCache:
+    """
+    Açılan dosyaların içeriğini yol ve sunucu sürümüyle birlikte tutan istemci önbelleği.
+
+    Önbellekteki bir dosya tıklandığında içerik hemen gösterilir, sunucuya sürümüyle birlikte
+    istek gider: dosya değişmediyse kısa bir not_modified yanıtı döner, değiştiyse yeni içerik
+    önbelleği günceller. Bağlantı koptuğunda önbellekteki dosyalar okunmaya devam edilir.
+
+    Bellek bütçesi aşılınca en uzun süredir kullanılmayan dosyalar çıkarılır; spill_dir
+    verildiyse çıkarılanlar diske yazılır ve oradan geri okunabilir (disk bütçesi aşılınca en
+    eski dosyalar silinir). Farklı sunucuların aynı yoldaki dosyaları karışmasın diye her
+    sunucunun disk kayıtları ayrı bir alt klasörde tutulur.
+    """
+
+    def __init__(self, max_bytes=CACHE_MEMORY_BYTES, spill_dir=None, max_disk_bytes=CACHE_DISK_BYTES):
+        """
+        Args:
+            max_bytes (int): Bellek bütçesi (bayt); 0 ise bellekte tutulmaz
+            spill_dir (str): Bellekten çıkarılan dosyaların yazılacağı klasör; None ise diske yazılmaz
+            max_disk_bytes (int): Disk bütçesi (bayt)
+        """
+        self.max_bytes = max_bytes
+        # Bütçenin tamamını tek bir dosyanın doldurmaması için dosya başına sınır
+        self.max_entry_bytes = max_bytes // 4
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.server = None
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries = OrderedDict()  # yol -> (sürüm, içerik, bayt)
+        self._disk_dir = None
+        self._disk_size = 0
+        self._disk = OrderedDict()  # dosya adı -> bayt (en eski önce)
+
+    def set_server(self, server):
+        """
+        Önbelleği verilen sunucuya ("host:port") geçirir. Sunucu değiştiyse bellekteki
+        içerik atılır; disk kayıtları sunucunun kendi klasöründen okunur.
+        """
+        if server == self.server:
+            return
+        self.server = server
+        self._entries.clear()
+        self._size = 0
+        self._disk.clear()
+        self._disk_size = 0
+        self._disk_dir = None
+        if self.spill_dir and server:
+            self._disk_dir = os.path.join(self.spill_dir, hashlib.sha1(server.encode("utf-8")).hexdigest()[:16])
+            self._scan_disk()
+        logger.info(f"İçerik önbelleği sunucusu: {server}")
+
+    def get(self, path):
+        """Dosyanın önbellekteki içeriğini döner: (içerik, sürüm) veya (None, None)."""
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1], entry[0]
+        loaded = self._read_disk(path)
+        if loaded is None:
+            self.misses += 1
+            return None, None
+        version, content = loaded
+        self.hits += 1
+        self._store(path, version, content, len(content.encode("utf-8")))
+        return content, version
+
+    def put(self, path, version, content):
+        """Sunucudan gelen içeriği kaydeder; sürümü olmayan içerik doğrulanamayacağından tutulmaz."""
+        if not version or content is None:
+            return
+        self._drop(path)
+        self._remove_disk(path)
+        nbytes = len(content.encode("utf-8"))
+        if nbytes > self.max_entry_bytes:
+            # Belleğe sığmayan dosya doğrudan diske yazılır
+            self._write_disk(path, version, content, nbytes)
+            return
+        self._store(path, version, content, nbytes)
+
+    def discard(self, path):
+        """Dosyayı bellekten ve diskten siler."""
+        self._drop(path)
+        self._remove_disk(path)
+
+    def _store(self, path, version, content, nbytes):
+        if nbytes > self.max_entry_bytes:
+            return
+        self._entries[path] = (version, content, nbytes)
+        self._size += nbytes
+        while self._size > self.max_bytes and self._entries:
+            old_path, (old_version, old_content, old_bytes) = self._entries.popitem(last=False)
+            self._size -= old_bytes
+            # put eski disk kaydını sildiğinden diskte kalan kayıt aynı sürümdür, yeniden yazılmaz
+            if not self._has_disk(old_path):
+                self._write_disk(old_path, old_version, old_content, old_bytes)
+
+    def _drop(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    # === Disk ===
+    def _disk_name(self, path):
+        return hashlib.sha1(path.encode("utf-8")).hexdigest() + ".txt"
+
+    def _has_disk(self, path):
+        return self._disk_dir is not None and self._disk_name(path) in self._disk
+
+    def _scan_disk(self):
+        try:
+            os.makedirs(self._disk_dir, exist_ok=True)
+            entries = [e for e in os.scandir(self._disk_dir) if e.is_file() and e.name.endswith(".txt")]
+        except OSError as e:
+            logger.error(f"Önbellek klasörü okunamadı: {str(e)}")
+            self._disk_dir = None
+            return
+        stats = [(e.stat().st_mtime, e.name, e.stat().st_size) for e in entries]
+        for _mtime, name, size in sorted(stats):
+            self._disk[name] = size
+            self._disk_size += size
+        logger.info(f"Disk önbelleği: {len(self._disk)} dosya, {self._disk_size // 1024} KB")
+
+    def _write_disk(self, path, version, content, nbytes):
+        if self._disk_dir is None or nbytes > self.max_disk_bytes // 4:
+            return
+        name = self._disk_name(path)
+        full_path = os.path.join(self._disk_dir, name)
+        header = json.dumps({"path": path, "version": version}, ensure_ascii=False)
+        try:
+            with open(full_path + ".tmp", "w", encoding="utf-8", newline="") as f:
+                f.write(header + "\n")
+                f.write(content)
+            os.replace(full_path + ".tmp", full_path)
+        except OSError as e:
+            logger.error(f"Önbellek dosyası yazılamadı: {path}: {str(e)}")
+            return
+        size = len(header.encode("utf-8")) + 1 + nbytes
+        self._disk_size += size - self._disk.pop(name, 0)
+        self._disk[name] = size
+        while self._disk_size > self.max_disk_bytes and self._disk:
+            old_name, old_size = self._disk.popitem(last=False)
+            self._disk_size -= old_size
+            self._unlink(old_name)
+
+    def _read_disk(self, path):
+        if not self._has_disk(path):
+            return None
+        name = self._disk_name(path)
+        full_path = os.path.join(self._disk_dir, name)
+        try:
+            with open(full_path, "r", encoding="utf-8", newline="") as f:
+                header = json.loads(f.readline())
+                content = f.read()
+            # Yeniden başlatmada da en son kullanılanlar korunsun
+            os.utime(full_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Önbellek dosyası okunamadı: {path}: {str(e)}")
+            self._remove_disk(path)
+            return None
+        if header.get("path") != path:
+            return None
+        self._disk.move_to_end(name)
+        return header.get("version"), content
+
+    def _remove_disk(self, path):
+        if not self._has_disk(path):
+            return
+        name = self._disk_name(path)
+        self._disk_size -= self._disk.pop(name)
+        self._unlink(name)
+
+    def _unlink(self, name):
+        try:
+            os.remove(os.path.join(self._disk_dir, name))
+        except OSError:
+            pass
@@ -0,0 +1,474 @@
+import logging
+from array import array
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt, pyqtSignal
+
+logger = logging.getLogger('FileClient.TreeModel')
+
+# Klasör ve dosya öğelerinin göreli yolu (kök için boş string)
+PATH_ROLE = Qt.UserRole + 2
+
+# Düğüm bayrakları
+FLAG_DIR = 1        # klasör
+FLAG_LOADED = 2     # klasör içeriği listelendi
+FLAG_LOADING = 4    # içerik sunucudan istendi, yanıt bekleniyor
+FLAG_FREE = 8       # silinmiş düğüm; numarası yeniden kullanılır
+
+# Kök klasör her zaman 0 numaralı düğümdür
+ROOT = 0
+# Bir klasörde bundan fazla öğe değişirse satır sinyalleri yerine tek bir düzen değişikliği yayılır
+MAX_ROW_CHANGES = 64
+
+
+class PreparedListing:
+    """
+    Modele uygulanmaya hazır klasör listesi: sıralı (ad, klasör mü) çiftleri, alt klasör listeleri ve
+    içerik imzası. Qt nesnesine dokunmadan üretildiğinden alıcı iş parçacığında hazırlanabilir.
+    """
+    __slots__ = ("entries", "dirs_start", "subs", "signature")
+
+    def __init__(self, entries, dirs_start, subs):
+        self.entries = entries
+        # entries içinde ilk klasörün konumu; subs[i] entries[dirs_start + i] klasörünün listesidir
+        self.dirs_start = dirs_start
+        self.subs = subs
+        # Aynı liste tekrar geldiğinde klasörün çocukları hiç karşılaştırılmaz
+        self.signature = hash(tuple(entries))
+
+
+def prepare_listing(listing):
+    """
+    list_dir yanıtındaki klasör sözlüğünü (alt klasörleriyle) sıralar ve imzalarını hesaplar.
+    Zaten hazırlanmış liste olduğu gibi döner.
+    """
+    if isinstance(listing, PreparedListing):
+        return listing
+    files = listing.get("files")
+    children = listing.get("children")
+    files = sorted(files) if isinstance(files, list) else []
+    children = children if isinstance(children, dict) else {}
+    dir_names = sorted(children)
+    entries = [(name, False) for name in files] + [(name, True) for name in dir_names]
+    subs = [None if children[name] is None else prepare_listing(children[name]) for name in dir_names]
+    return PreparedListing(entries, len(files), subs)
+
+
+class FileTreeModel(QAbstractItemModel):
+    """
+    Dosya ağacı modeli. Düğümler dizi tabanlı bir depoda tutulur (üst düğüm, ad numarası, bayraklar, satır);
+    dosya başına Qt nesnesi oluşturulmaz ve QTreeView yalnızca ekranda görünen satırları sorar.
+    Klasörün çocukları önce sıralı dosyalar, sonra sıralı klasörlerdir; yol aramaları ikili aramayla yapılır.
+    İçeriği listelenmemiş klasör açıldığında fetch_requested sinyali yayılır.
+    """
+    fetch_requested = pyqtSignal(str)
+
+    def __init__(self, dir_icon=None, file_icon=None, parent=None):
+        super().__init__(parent)
+        self._dir_icon = dir_icon
+        self._file_icon = file_icon
+        self._header = ""
+        self._root_label = "Kök Dizin"
+        self._init_store()
+
+    def _init_store(self):
+        self._parent = array('i')
+        self._name = array('i')
+        self._flags = array('B')
+        self._row = array('i')
+        # Listelenmiş klasör düğümü -> sıralı çocuk numaraları
+        self._children = {}
+        # Klasör düğümü -> son uygulanan listenin imzası; çocuklar başka yolla değişince silinir
+        self._signatures = {}
+        self._free = []
+        # Ad numarası -> ad; aynı ad (ör. __init__.py) bir kez saklanır
+        self._names = []
+        self._name_ids = {}
+        self._has_root = False
+
+    # === QAbstractItemModel ===
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, 0, ROOT) if row == 0 and self._has_root else QModelIndex()
+        children = self._children.get(parent.internalId())
+        if children is None or row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = self._parent[index.internalId()]
+        if parent < 0:
+            return QModelIndex()
+        return self.createIndex(self._row[parent], 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return 1 if self._has_root else 0
+        if parent.column() > 0:
+            return 0
+        return len(self._children.get(parent.internalId(), ()))
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self._has_root
+        node = parent.internalId()
+        flags = self._flags[node]
+        if not flags & FLAG_DIR:
+            return False
+        if not flags & FLAG_LOADED:
+            # İçeriği açıldığında listelenecek
+            return True
+        return bool(self._children.get(node))
+
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return False
+        return self._flags[parent.internalId()] & (FLAG_DIR | FLAG_LOADED | FLAG_LOADING) == FLAG_DIR
+
+    def fetchMore(self, parent):
+        """Listelenmemiş klasörün içeriğini ister; yanıt apply_listing ile işlenir."""
+        if not self.canFetchMore(parent):
+            return
+        node = parent.internalId()
+        self._flags[node] |= FLAG_LOADING
+        self.dataChanged.emit(parent, parent)
+        self.fetch_requested.emit(self.node_path(node))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalId()
+        flags = self._flags[node]
+        if role == Qt.DisplayRole:
+            if node == ROOT:
+                return self._root_label
+            name = self._names[self._name[node]]
+            return f"{name} (Yükleniyor...)" if flags & FLAG_LOADING else name
+        if role == Qt.DecorationRole:
+            return self._dir_icon if flags & FLAG_DIR else self._file_icon
+        if role == Qt.UserRole:
+            # Dosya öğelerinde dosya yolu, klasörlerde None
+            return None if flags & FLAG_DIR else self.node_path(node)
+        if role == PATH_ROLE:
+            return self.node_path(node)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self._header
+        return None
+
+    def set_header_label(self, text):
+        self._header = text
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+    # === Yol işlemleri ===
+    def node_path(self, node):
+        """Düğümün göreli yolunu döner; kök için boş string."""
+        parts = []
+        while node != ROOT:
+            parts.append(self._names[self._name[node]])
+            node = self._parent[node]
+        return "/".join(reversed(parts))
+
+    def node_for_path(self, path):
+        """Yolu verilen düğümün numarası; modelde yoksa -1."""
+        if not self._has_root:
+            return -1
+        node = ROOT
+        for part in path.split("/") if path else ():
+            row = self._find_child(node, part)
+            if row < 0:
+                return -1
+            node = self._children[node][row]
+        return node
+
+    def index_for_path(self, path):
+        node = self.node_for_path(path)
+        if node < 0:
+            return QModelIndex()
+        return self.createIndex(self._row[node], 0, node)
+
+    def contains(self, path):
+        return self.node_for_path(path) >= 0
+
+    def is_loaded(self, index):
+        """Klasörün içeriği listelendiyse True."""
+        return index.isValid() and bool(self._flags[index.internalId()] & FLAG_LOADED)
+
+    def is_within_unloaded(self, path):
+        """Yol, içeriği henüz listelenmemiş bir klasörün altındaysa (veya o klasörse) True."""
+        if not self._has_root:
+            return True
+        node = ROOT
+        for part in path.split("/") if path else ():
+            if not self._flags[node] & FLAG_LOADED:
+                return True
+            row = self._find_child(node, part)
+            if row < 0:
+                return False
+            node = self._children[node][row]
+        return self._flags[node] & (FLAG_DIR | FLAG_LOADED) == FLAG_DIR
+
+    def loaded_dir_paths(self):
+        """İçeriği listelenmiş klasörlerin yolları (kök önce)."""
+        return sorted(self.node_path(node) for node in self._children)
+
+    def cancel_fetch(self, path):
+        """İstek gönderilemediyse klasör tekrar açıldığında yeniden istenebilsin."""
+        node = self.node_for_path(path)
+        if node >= 0 and self._flags[node] & FLAG_LOADING:
+            self._flags[node] &= ~FLAG_LOADING
+            index = self.createIndex(self._row[node], 0, node)
+            self.dataChanged.emit(index, index)
+
+    def cancel_all_fetches(self):
+        """Bağlantı koptuğunda yanıtı beklenen tüm klasörleri tekrar istenebilir hale getirir."""
+        for node, flags in enumerate(self._flags):
+            if flags & FLAG_LOADING and not flags & FLAG_FREE:
+                self._flags[node] = flags & ~FLAG_LOADING
+                index = self.createIndex(self._row[node], 0, node)
+                self.dataChanged.emit(index, index)
+
+    # === Güncellemeler ===
+    def clear(self):
+        self.beginResetModel()
+        self._init_store()
+        self.endResetModel()
+
+    def apply_listing(self, path, listing):
+        """
+        list_dir (veya tüm ağaç) yanıtını modele işler. Yalnızca değişen satırlar eklenir veya çıkarılır;
+        görünüm açık klasörleri ve seçimi korur. listing sözlük veya prepare_listing sonucu olabilir.
+
+        Returns:
+            bool: Klasör modelde bulunup güncellendiyse True
+        """
+        if not self._has_root:
+            if path:
+                return False
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self._new_node(-1, "", True)
+            self._has_root = True
+            self.endInsertRows()
+        node = self.node_for_path(path)
+        if node < 0 or not self._flags[node] & FLAG_DIR:
+            return False
+        self._merge(node, prepare_listing(listing or {}))
+        return True
+
+    def add_path(self, path, is_dir, listing=None):
+        """
+        Tek bir dosya veya klasörü sıralı konumuna ekler. listing verilen klasörün içeriği de eklenir.
+
+        Returns:
+            bool: Üst klasör modelde listelenmişse True
+        """
+        parent_path, _, name = path.rpartition("/")
+        parent = self.node_for_path(parent_path)
+        if parent < 0 or not self._flags[parent] & FLAG_LOADED:
+            return False
+        if self._find_child(parent, name) >= 0:
+            return True
+        row = self._insert_position(parent, name, is_dir)
+        self._insert(parent, row, [(name, is_dir)])
+        if is_dir and listing is not None:
+            self._merge(self._children[parent][row], prepare_listing(listing))
+        return True
+
+    def remove_path(self, path):
+        """Dosya veya klasörü (alt öğeleriyle) çıkarır. Yol modelde yoksa False."""
+        node = self.node_for_path(path)
+        if node <= ROOT:
+            return False
+        self._remove(self._parent[node], self._row[node], 1)
+        return True
+
+    def _merge(self, node, listing):
+        wanted = listing.entries
+        flags = self._flags[node]
+        if not flags & FLAG_LOADED:
+            self._flags[node] = (flags | FLAG_LOADED) & ~FLAG_LOADING
+            self._children[node] = array('i')
+            self._insert(node, 0, wanted)
+        elif self._signatures.get(node) != listing.signature:
+            current = [self._entry(child) for child in self._children[node]]
+            if current != wanted:
+                kept = len(set(current).intersection(wanted))
+                if len(current) + len(wanted) - 2 * kept > MAX_ROW_CHANGES:
+                    self._replace_children(node, wanted)
+                else:
+                    self._diff(node, wanted)
+        self._signatures[node] = listing.signature
+        if flags & FLAG_LOADING:
+            index = self._index(node)
+            self.dataChanged.emit(index, index)
+
+        # İçeriği de gönderilen (açılmış) alt klasörler; çocuklar artık entries sırasındadır
+        current = self._children[node]
+        for i, sub in enumerate(listing.subs):
+            if sub is not None:
+                self._merge(current[listing.dirs_start + i], sub)
+
+    def _diff(self, node, wanted):
+        """Klasörün çocuklarını listeye göre günceller: silinenler çıkarılır, yeniler sırasına eklenir."""
+        children = self._children[node]
+        wanted_set = set(wanted)
+        # Artık olmayanlar sondan başa, ardışık gruplar halinde çıkarılır
+        row = len(children)
+        while row > 0:
+            row -= 1
+            if self._entry(children[row]) in wanted_set:
+                continue
+            end = row
+            while row > 0 and self._entry(children[row - 1]) not in wanted_set:
+                row -= 1
+            self._remove(node, row, end - row + 1)
+
+        # Kalan öğeler zaten sıralı; listeyle birlikte yürünerek eksikler araya toplu eklenir
+        index = 0
+        pending = []
+        for entry in wanted:
+            if index < len(children) and self._entry(children[index]) == entry:
+                if pending:
+                    self._insert(node, index, pending)
+                    index += len(pending)
+                    pending = []
+                index += 1
+            else:
+                pending.append(entry)
+        if pending:
+            self._insert(node, index, pending)
+
+    def _replace_children(self, node, wanted):
+        """
+        Dağınık çok sayıda değişiklikte her satır grubu için ayrı sinyal (ve satır numaralandırma) yerine
+        çocuklar tek seferde değiştirilir; açık klasörler ve seçim kalıcı indeksler güncellenerek korunur.
+        """
+        self.layoutAboutToBeChanged.emit()
+        kept = {self._entry(child): child for child in self._children[node]}
+        children = array('i')
+        for name, is_dir in wanted:
+            child = kept.pop((name, is_dir), None)
+            children.append(self._new_node(node, name, is_dir) if child is None else child)
+        self._children[node] = children
+        # Yeni düğümler ayrıldıktan sonra serbest bırakılır; eski indeksler yeni düğümlere kaymaz
+        self._release(kept.values())
+        self._renumber(children, 0)
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [
+            QModelIndex() if self._flags[index.internalId()] & FLAG_FREE else self._index(index.internalId())
+            for index in persistent])
+        self.layoutChanged.emit()
+
+    def _insert(self, node, row, entries):
+        if not entries:
+            return
+        self.beginInsertRows(self._index(node), row, row + len(entries) - 1)
+        self._signatures.pop(node, None)
+        children = self._children[node]
+        children[row:row] = array('i', [self._new_node(node, name, is_dir) for name, is_dir in entries])
+        self._renumber(children, row)
+        self.endInsertRows()
+
+    def _remove(self, node, row, count):
+        self.beginRemoveRows(self._index(node), row, row + count - 1)
+        self._signatures.pop(node, None)
+        children = self._children[node]
+        removed = children[row:row + count]
+        del children[row:row + count]
+        self._release(removed)
+        self._renumber(children, row)
+        self.endRemoveRows()
+
+    def _renumber(self, children, start):
+        row = self._row
+        for i in range(start, len(children)):
+            row[children[i]] = i
+
+    def _new_node(self, parent, name, is_dir):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        flags = FLAG_DIR if is_dir else 0
+        if self._free:
+            node = self._free.pop()
+            self._parent[node] = parent
+            self._name[node] = name_id
+            self._flags[node] = flags
+            self._row[node] = 0
+            return node
+        self._parent.append(parent)
+        self._name.append(name_id)
+        self._flags.append(flags)
+        self._row.append(0)
+        return len(self._parent) - 1
+
+    def _release(self, nodes):
+        """Çıkarılan düğümleri ve alt düğümlerini yeniden kullanılmak üzere serbest bırakır."""
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            stack.extend(self._children.pop(node, ()))
+            self._signatures.pop(node, None)
+            self._parent[node] = -1
+            self._flags[node] = FLAG_FREE
+            self._free.append(node)
+
+    def _index(self, node):
+        return self.createIndex(self._row[node], 0, node)
+
+    def _entry(self, node):
+        return self._names[self._name[node]], bool(self._flags[node] & FLAG_DIR)
+
+    def _find_child(self, node, name):
+        """Adı verilen çocuğun satırı; yoksa -1."""
+        children = self._children.get(node)
+        if not children:
+            return -1
+        split = self._dirs_start(children)
+        for lo, hi in ((0, split), (split, len(children))):
+            row = self._bisect(children, lo, hi, name)
+            if row < hi and self._names[self._name[children[row]]] == name:
+                return row
+        return -1
+
+    def _insert_position(self, node, name, is_dir):
+        """Sırayı (önce sıralı dosyalar, sonra sıralı klasörler) koruyan ekleme satırı."""
+        children = self._children[node]
+        split = self._dirs_start(children)
+        if is_dir:
+            return self._bisect(children, split, len(children), name)
+        return self._bisect(children, 0, split, name)
+
+    def _dirs_start(self, children):
+        """İlk klasör çocuğun satırı (dosyalar klasörlerden önce gelir)."""
+        lo, hi = 0, len(children)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._flags[children[mid]] & FLAG_DIR:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _bisect(self, children, lo, hi, name):
+        """children[lo:hi] içinde adı name'den küçük olmayan ilk satır."""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._names[self._name[children[mid]]] < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
@@ -0,0 +1,167 @@
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, QPoint
+from PyQt5.QtGui import QTextBlock, QTextLayout
+
+from .highlighter_engine import NO_SPAN
+
+logger = logging.getLogger('FileClient.Highlight')
+
+# Bir zaman diliminde renklendirmeye ayrılan süre; dilimler arasında arayüz olayları işlenir
+SLICE_SECONDS = 0.008
+# Görünür alan taramasında en fazla bu kadar blok boyanır
+MAX_VIEWPORT_BLOCKS = 400
+
+
+class HighlightScheduler(QObject):
+    """
+    Bir QTextEdit belgesini QSyntaxHighlighter yerine arka planda renklendirir.
+
+    Belge değişince (yeni dosya, akışla eklenen parça) iş hemen yapılmaz; QTimer ile
+    zaman dilimlerine bölünür. Her dilimde önce görünen bloklar boyanır: önceki satırın
+    durumu henüz hesaplanmadıysa tahmin edilir. Ardından belge baştan sona sırayla işlenir
+    ve tahminle boyanan bloklar gerçek durum farklıysa yeniden boyanır. Böylece büyük bir
+    dosya açıldığında ilk çizim beklemez. Renklendirici değişince (başka dosya açıldı)
+    süren iş bırakılır ve baştan başlanır.
+    """
+
+    def __init__(self, text_edit, parent=None):
+        super().__init__(parent)
+        self.text_edit = text_edit
+        self.document = text_edit.document()
+        self.lexer = None
+        # Sıralı geçişte sıradaki blok, numarası ve ondan önceki bloğun satır sonu durumu
+        self._next = QTextBlock()
+        self._next_number = 0
+        self._state = NO_SPAN
+        # Görünür alan için tahmini durumla boyanan blok numarası -> kullanılan durum
+        self._guessed = {}
+        self._viewport_pending = False
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_slice)
+        self.document.contentsChange.connect(self._on_contents_change)
+        text_edit.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def set_lexer(self, lexer):
+        """
+        Renklendiriciyi (TokenHighlighter alt sınıfı) değiştirir. None verilirse süren iş
+        bırakılır ve mevcut renkler arka planda silinir.
+        """
+        if lexer is self.lexer:
+            return
+        self.lexer = lexer
+        self._restart(self.document.begin())
+
+    def is_active(self):
+        return self._timer.isActive()
+
+    def _restart(self, block):
+        """Sıralı geçişi verilen bloktan yeniden başlatır; önce görünen bloklar boyanır."""
+        if not block.isValid():
+            block = self.document.begin()
+        previous = block.previous()
+        self._next = block
+        self._next_number = block.blockNumber()
+        self._state = max(previous.userState(), NO_SPAN) if previous.isValid() else NO_SPAN
+        self._guessed.clear()
+        self._viewport_pending = True
+        self._timer.start()
+
+    def _on_contents_change(self, position, removed, added):
+        if self.lexer is None and not self._timer.isActive():
+            # Renklendirme yok ve silinecek renk kalmadı
+            return
+        block = self.document.findBlock(position)
+        # Değişiklik geçişin gerisindeyse oradan devam edilir; ilerisi zaten sırası gelince işlenir
+        if not self._timer.isActive() or block.blockNumber() <= self._next_number:
+            self._restart(block)
+        else:
+            self._guessed.clear()
+            self._viewport_pending = True
+
+    def _on_scrolled(self, _value):
+        if self._timer.isActive():
+            self._viewport_pending = True
+
+    def _run_slice(self):
+        if self._viewport_pending:
+            self._viewport_pending = False
+            self._highlight_viewport()
+
+        deadline = time.perf_counter() + SLICE_SECONDS
+        block, number, state = self._next, self._next_number, self._state
+        first = block
+        guessed = self._guessed
+        while block.isValid():
+            if guessed and guessed.pop(number, None) == state:
+                # Görünür alan taramasında doğru durumla boyanmış
+                state = block.userState()
+            else:
+                state = self._highlight(block, state)
+            block = block.next()
+            number += 1
+            if time.perf_counter() >= deadline:
+                break
+        # Yeniden yerleşim her çağrıda belgenin tamamını dolaştığından dilim başına bir kez istenir
+        self._mark_dirty(first, block)
+        self._next, self._next_number, self._state = block, number, state
+
+        if not block.isValid():
+            self._timer.stop()
+            self._guessed.clear()
+            logger.debug(f"Renklendirme tamamlandı: {number} blok")
+
+    def _highlight_viewport(self):
+        """Görünen blokları, sıralı geçiş henüz ulaşmadıysa tahmini durumla boyar."""
+        viewport = self.text_edit.viewport()
+        block = self.text_edit.cursorForPosition(QPoint(0, 0)).block()
+        last = self.text_edit.cursorForPosition(QPoint(0, viewport.height())).block()
+        if not block.isValid() or not self._next.isValid():
+            return
+        number = block.blockNumber()
+        last_number = min(last.blockNumber(), number + MAX_VIEWPORT_BLOCKS)
+        first = None
+        while block.isValid() and number <= last_number:
+            if number >= self._next_number and number not in self._guessed:
+                previous = block.previous()
+                state = max(previous.userState(), NO_SPAN) if previous.isValid() else NO_SPAN
+                self._guessed[number] = state
+                self._highlight(block, state)
+                if first is None:
+                    first = block
+            block = block.next()
+            number += 1
+        if first is not None:
+            self._mark_dirty(first, block)
+
+    def _highlight(self, block, state):
+        """Bloğu boyar ve satır sonu durumunu döner."""
+        layout = block.layout()
+        if self.lexer is None:
+            if layout.formats():
+                layout.setFormats([])
+            block.setUserState(NO_SPAN)
+            return NO_SPAN
+        tokens, state = self.lexer.tokenize(block.text(), state)
+        ranges = []
+        for start, end, fmt in tokens:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = end - start
+            format_range.format = fmt
+            ranges.append(format_range)
+        layout.setFormats(ranges)
+        block.setUserState(state)
+        return state
+
+    def _mark_dirty(self, first, end):
+        """first'ten end'e kadarki (end hariç) blokların yeniden yerleşimini ister."""
+        if not first.isValid():
+            return
+        start = first.position()
+        stop = end.position() if end.isValid() else self.document.characterCount()
+        if stop > start:
+            self.document.markContentsDirty(start, stop - start)
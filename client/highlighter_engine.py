@@ -0,0 +1,154 @@
+import re
+
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+
+# Blok durumu: 0 = açık kalan çok satırlı öğe yok, n > 0 = SPANS[n - 1] sonraki satıra taşıyor
+NO_SPAN = 0
+
+# BMP dışı karakterler (emoji vb.) Qt tarafında iki UTF-16 birimi tutar
+_ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def make_format(color, bold=False, italic=False):
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold:
+        fmt.setFontWeight(QFont.Bold)
+    if italic:
+        fmt.setFontItalic(True)
+    return fmt
+
+
+def keyword_pattern(keywords):
+    """Anahtar kelimeleri tek bir \\b(...)\\b alternatifinde birleştirir."""
+    return r'\b(?:' + '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)) + r')\b'
+
+
+class TokenHighlighter(QSyntaxHighlighter):
+    """
+    Tek geçişli renklendirici tabanı. Alt sınıflar yalnızca tabloları tanımlar:
+
+    FORMATS: {biçim adı: (renk, kalın, italik)}
+    RULES:   [(biçim adı, desen)] -- sıra önemlidir, aynı konumda ilk eşleşen kazanır
+    INNER:   {biçim adı: [(biçim adı, desen)]} -- eşleşmenin içinde ayrıca taranan kurallar
+    SPANS:   [(biçim adı, başlangıç deseni, bitiş deseni)] -- satır sonunu aşabilen öğeler
+
+    Tüm kurallar sınıf başına bir kez tek bir alternatif desende derlenir ve her blok
+    soldan sağa tek geçişte taranır (tokenize). tokenize belgeye bağlı değildir; aynı
+    tablolar QSyntaxHighlighter olarak ya da HighlightScheduler ile kullanılabilir. Kapanmayan bir SPANS öğesi setCurrentBlockState ile
+    sonraki bloğa taşınır. Bitiş deseni başlangıcın hemen arkasından match ile denenir ve
+    kapanışa kadar olan metni (kapanış dahil) tüketmelidir.
+    """
+    FORMATS = {}
+    RULES = []
+    INNER = {}
+    SPANS = []
+    FLAGS = 0
+
+    def __init__(self, document):
+        super().__init__(document)
+        self.compiled()
+
+    @classmethod
+    def compiled(cls):
+        """Sınıfın derlenmiş tablolarını döner; ilk çağrıda derlenir."""
+        if '_compiled' not in cls.__dict__:
+            cls._compile()
+        return cls._compiled
+
+    @classmethod
+    def _compile(cls):
+        formats = {name: make_format(*spec) for name, spec in cls.FORMATS.items()}
+        inner = {}
+        for name, rules in cls.INNER.items():
+            pattern = re.compile('|'.join(f'(?P<i{i}>{p})' for i, (_n, p) in enumerate(rules)), cls.FLAGS)
+            inner[name] = (pattern, {f'i{i}': formats[n] for i, (n, _p) in enumerate(rules)})
+
+        parts = []
+        actions = {}
+        # Çok satırlı öğelerin başlangıçları tek satırlık kurallardan önce denenir (""" ile "" gibi)
+        for i, (name, start, _end) in enumerate(cls.SPANS):
+            group = f's{i}'
+            parts.append(f'(?P<{group}>{start})')
+            actions[group] = (formats[name], i + 1, None)
+        for i, (name, pattern) in enumerate(cls.RULES):
+            group = f't{i}'
+            parts.append(f'(?P<{group}>{pattern})')
+            actions[group] = (formats[name], NO_SPAN, inner.get(name))
+        lexer = re.compile('|'.join(parts), cls.FLAGS)
+
+        span_ends = [re.compile(end, cls.FLAGS) for _name, _start, end in cls.SPANS]
+        span_formats = [formats[name] for name, _start, _end in cls.SPANS]
+        cls._compiled = (lexer, actions, span_ends, span_formats)
+
+    @classmethod
+    def tokenize(cls, text, state=NO_SPAN):
+        """
+        Bir satırı tek geçişte tarar. state önceki satırdan taşan öğeyi belirtir.
+        ([(başlangıç, bitiş, biçim)], satır sonundaki durum) döner; aralıklar çakışmaz,
+        soldan sağa sıralıdır ve konumlar Qt'nin kullandığı UTF-16 birimleridir.
+        """
+        lexer, actions, span_ends, span_formats = cls.compiled()
+        tokens = []
+        length = len(text)
+        pos = 0
+
+        if state > NO_SPAN:
+            # Önceki satırdan taşan öğe: kapanışı ara, yoksa tüm satır o öğeye ait
+            end = span_ends[state - 1].match(text)
+            if end is None:
+                tokens.append((0, length, span_formats[state - 1]))
+                return _to_utf16(text, tokens), state
+            pos = end.end()
+            tokens.append((0, pos, span_formats[state - 1]))
+
+        state = NO_SPAN
+        while pos < length:
+            m = lexer.search(text, pos)
+            if m is None:
+                break
+            fmt, span, inner = actions[m.lastgroup]
+            start, pos = m.span()
+            if span:
+                end = span_ends[span - 1].match(text, pos)
+                if end is None:
+                    tokens.append((start, length, fmt))
+                    state = span
+                    break
+                pos = end.end()
+            elif pos == start:
+                # Boş eşleşme sonsuz döngüye sokmasın
+                pos += 1
+                continue
+            if inner is None:
+                tokens.append((start, pos, fmt))
+                continue
+            # İç eşleşmeler dış biçimin arasına yerleştirilir
+            pattern, inner_formats = inner
+            for sub in pattern.finditer(text, start, pos):
+                if sub.start() > start:
+                    tokens.append((start, sub.start(), fmt))
+                tokens.append((sub.start(), sub.end(), inner_formats[sub.lastgroup]))
+                start = sub.end()
+            if start < pos:
+                tokens.append((start, pos, fmt))
+
+        return _to_utf16(text, tokens), state
+
+    def highlightBlock(self, text):
+        tokens, state = self.tokenize(text, self.previousBlockState())
+        for start, end, fmt in tokens:
+            self.setFormat(start, end - start, fmt)
+        self.setCurrentBlockState(state)
+
+
+def _to_utf16(text, tokens):
+    """Metinde BMP dışı karakter varsa karakter konumlarını UTF-16 konumlarına çevirir."""
+    if text.isascii() or not _ASTRAL.search(text):
+        return tokens
+    offsets = [0]
+    unit = 0
+    for ch in text:
+        unit += 2 if ord(ch) > 0xFFFF else 1
+        offsets.append(unit)
+    return [(offsets[start], offsets[end], fmt) for start, end, fmt in tokens]
@@ -0,0 +1,124 @@
+import os
+import re
+import json
+import logging
+
+from .highlighter_engine import TokenHighlighter, keyword_pattern
+
+logger = logging.getLogger('FileClient.Highlighters')
+
+SYNTAX_DIR = os.path.join(os.path.dirname(__file__), "syntax")
+
+
+class HighlighterRegistry:
+    """
+    Dosya uzantılarını syntax klasöründeki dil tanımlarına (JSON) eşler. Yeni bir dil için
+    klasöre bir tanım dosyası eklemek yeterlidir:
+
+        {
+            "name": "Python",
+            "extensions": ["py"],
+            "ignore_case": false,
+            "formats":  {"keyword": {"color": "blue", "bold": true, "italic": false}, ...},
+            "spans":    [{"format": "string", "start": "\"\"\"", "end": "..."}],
+            "rules":    [{"format": "comment", "pattern": "#.*"}],
+            "keywords": {"keyword": ["def", "class", ...]},
+            "inner":    {"tag": [{"format": "value", "pattern": "..."}]}
+        }
+
+    Alanların anlamı TokenHighlighter tablolarıyla aynıdır; keywords kuralları rules'un
+    arkasına eklenir. Uzantı eşlemesi ilk sorguda okunur, bir dil ise ancak o türden bir
+    dosya ilk kez açıldığında TokenHighlighter alt sınıfına dönüştürülüp derlenir.
+    """
+
+    def __init__(self, syntax_dir=SYNTAX_DIR):
+        self.syntax_dir = syntax_dir
+        self._extensions = None  # uzantı -> tanım dosyası
+        self._lexers = {}  # tanım dosyası -> derlenmiş sınıf (yüklenemediyse None)
+
+    def lexer_for_path(self, path):
+        """Dosyanın uzantısına göre renklendirici sınıfını döner; tanım yoksa None."""
+        ext = os.path.splitext(path)[1].lower().lstrip('.')
+        if not ext:
+            return None
+        if self._extensions is None:
+            self._extensions = self._scan()
+        file_name = self._extensions.get(ext)
+        if file_name is None:
+            return None
+        if file_name not in self._lexers:
+            self._lexers[file_name] = self._load(file_name)
+        return self._lexers[file_name]
+
+    def extensions(self):
+        """Renklendirilebilen uzantıların listesi."""
+        if self._extensions is None:
+            self._extensions = self._scan()
+        return sorted(self._extensions)
+
+    def _scan(self):
+        extensions = {}
+        try:
+            file_names = sorted(f for f in os.listdir(self.syntax_dir) if f.endswith('.json'))
+        except OSError as e:
+            logger.error(f"Dil tanımları okunamadı: {str(e)}")
+            return extensions
+        for file_name in file_names:
+            definition = self._read(file_name)
+            if definition is None:
+                continue
+            for ext in definition.get("extensions", []):
+                ext = ext.lower().lstrip('.')
+                if ext in extensions:
+                    logger.warning(f"{ext} uzantısı iki dilde tanımlı, {extensions[ext]} kullanılıyor")
+                    continue
+                extensions[ext] = file_name
+        logger.info(f"Dil tanımları bulundu: {len(file_names)} dosya, {len(extensions)} uzantı")
+        return extensions
+
+    def _read(self, file_name):
+        try:
+            with open(os.path.join(self.syntax_dir, file_name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Dil tanımı okunamadı: {file_name}: {str(e)}")
+            return None
+
+    def _load(self, file_name):
+        definition = self._read(file_name)
+        if definition is None:
+            return None
+        try:
+            lexer = build_lexer(definition, os.path.splitext(file_name)[0])
+            lexer.compiled()
+        except (KeyError, TypeError, re.error) as e:
+            logger.error(f"Dil tanımı derlenemedi: {file_name}: {str(e)}")
+            return None
+        logger.info(f"Renklendirici yüklendi: {lexer.LANGUAGE} ({file_name})")
+        return lexer
+
+
+def build_lexer(definition, default_name):
+    """Dil tanımından TokenHighlighter alt sınıfı oluşturur (desenler ilk kullanımda derlenir)."""
+    name = definition.get("name", default_name)
+    formats = {
+        fmt: (spec["color"], spec.get("bold", False), spec.get("italic", False))
+        for fmt, spec in definition["formats"].items()
+    }
+    rules = [(rule["format"], rule["pattern"]) for rule in definition.get("rules", [])]
+    for fmt, words in definition.get("keywords", {}).items():
+        rules.append((fmt, keyword_pattern(words)))
+    spans = [(span["format"], span["start"], span["end"]) for span in definition.get("spans", [])]
+    inner = {
+        outer: [(rule["format"], rule["pattern"]) for rule in inner_rules]
+        for outer, inner_rules in definition.get("inner", {}).items()
+    }
+    class_name = re.sub(r'\W', '', default_name.title())
+    return type(f"{class_name}Highlighter", (TokenHighlighter,), {
+        'LANGUAGE': name,
+        'FORMATS': formats,
+        'RULES': rules,
+        'SPANS': spans,
+        'INNER': inner,
+        'FLAGS': re.IGNORECASE if definition.get("ignore_case") else 0,
+    })
@@ -1,18 +1,19 @@
 import sys
 import logging
 import os
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTreeWidget, QTreeWidgetItem, QTextEdit, QVBoxLayout, QWidget, \
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTreeView, QTextEdit, QVBoxLayout, QWidget, \
     QMessageBox, QHBoxLayout, QLineEdit, QPushButton, QLabel, QFrame, QSplitter, QStyle, QDialog, QListWidget, \
-    QListWidgetItem, QDialogButtonBox, QGridLayout, QInputDialog, QComboBox
+    QListWidgetItem, QDialogButtonBox, QGridLayout, QInputDialog, QComboBox, QShortcut, QStackedWidget
 from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
-from PyQt5.QtGui import QIcon, QFont, QColor
+from PyQt5.QtGui import QIcon, QFont, QColor, QTextCursor, QKeySequence
 from qt_material import apply_stylesheet, QtStyleTools, list_themes
 from .client import ClientConnection
-from .css_highlighter import CssHighlighter
-from .js_highlighter import JsHighlighter
-from .html_higlighter import HtmlHighlighter
-from .python_highlighter import PythonHighlighter
+from .highlighter_registry import HighlighterRegistry
+from .content_cache import ContentCache, CACHE_MEMORY_BYTES, CACHE_DISK_BYTES
+from .highlight_scheduler import HighlightScheduler
+from .file_tree_model import FileTreeModel, prepare_listing
 from .lang_manager import LangManager
+from .large_file_viewer import LargeFileViewer, LARGE_FILE_THRESHOLD
 from .preferences import Preferences
 
 # Logging ayarları
@@ -26,6 +27,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger('FileClient.GUI')
 
+def normalize_newlines(text):
+    """\r\n ve tek \r satır sonlarını \n'e çevirir."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 class ReceiverThread(QThread):
     message_received = pyqtSignal(dict)
     connection_lost = pyqtSignal()
@@ -35,6 +43,8 @@ class ReceiverThread(QThread):
         super().__init__()
         self.client = client
         self.running = True
+        # Parça sonunda kalan \r'si bir sonraki parçayı bekleyen dosyalar (\r\n bölünmesin)
+        self._pending_cr = set()
 
     def run(self):
         for msg in self.client.receive_messages():
@@ -52,8 +62,45 @@ class ReceiverThread(QThread):
                 logger.error(f"Hata: {error_message}")
                 self.error_occurred.emit(error_message)
             else:
-                # Normal mesaj
-                self.message_received.emit(msg)
+                # Normal mesaj; arayüze uygulanmaya hazır olarak iletilir
+                self.message_received.emit(self.prepare(msg))
+
+    def prepare(self, msg):
+        """
+        Mesajın ağır kısımlarını arayüz iş parçacığına gelmeden hazırlar: klasör listeleri sıralanıp
+        imzalanır, dosya metnindeki satır sonları \n'e çevrilir. Arayüzde yalnızca model/metin güncellemesi kalır.
+        """
+        response = msg.get("response")
+        if response in ("tree", "dir_listing"):
+            msg["data"] = prepare_listing(msg.get("data") or {})
+        elif response == "tree_delta":
+            for change in msg.get("changes", []):
+                if change.get("type") == "dir" and change.get("tree") is not None:
+                    change["tree"] = prepare_listing(change["tree"])
+        elif response == "file":
+            msg["content"] = normalize_newlines(msg.get("content", ""))
+        elif response == "file_chunk":
+            msg["content"] = self._prepare_chunk(msg)
+        return msg
+
+    def _prepare_chunk(self, msg):
+        # Aynı dosyanın akışları (açılış ve görüntüleyici sayfaları) karışık gelebilir
+        key = (msg.get("path"), msg.get("id"))
+        content = msg.get("content", "")
+        # Büyük dosya görüntüleyici sayfaları bayt konumlarıyla tuttuğundan çevrilmemiş metni kullanır
+        msg["raw_content"] = content
+        if msg.get("offset", 0) == 0:
+            # Yeni akış; önceki yarım kalan akışın \r'si geçersiz
+            self._pending_cr.discard(key)
+        if key in self._pending_cr:
+            self._pending_cr.discard(key)
+            # Bekletilen \r bu parçanın başındaki \n ile birlikte tek satır sonudur
+            if not content.startswith("\n"):
+                content = "\n" + content
+        if content.endswith("\r") and not msg.get("eof"):
+            self._pending_cr.add(key)
+            content = content[:-1]
+        return normalize_newlines(content)
 
     def stop(self):
         self.running = False
@@ -307,16 +354,19 @@ class NavBar(QWidget):
                 # Client'ı günculle
                 self.client.host = host
                 self.client.port = port
+                if self.main_gui:
+                    # Çerçeveli mod (ve sıkıştırma) yeni sunucularda tercihlerden "framed" ile açılır
+                    self.client.framing = self.main_gui.preferences.get('connection.framing', 'newline')
+                    self.client.compression = self.main_gui.preferences.get('connection.compression', True)
                 
                 # Bağlantıyı kur
                 self.client.connect()
                 self.set_status("connected")
                 
                 # Gönder login mesaj
-                # Kullanıcı adını kullanarak login mesajı gönder
-                if username:
-                    from shared import protocol
-                    self.client.send(protocol.make_login_message(username))
+                # Kullanıcı adını kullanarak login mesajı gönder (sıkıştırma anlaşması da burada yapılır)
+                if username or self.client.compression:
+                    self.client.login(username)
                 
                 # Bağlantı başarılı sinyali gönder
                 self.connection_successful.emit()
@@ -453,17 +503,151 @@ class NavBar(QWidget):
                 self.main_gui.update_font_size()
 
 
+class QuickOpenDialog(QDialog):
+    """
+    Dosya adının bir kısmını yazarak dosya açma penceresi.
+    Eşleşmeler yazarken sunucudan (find_path) istenir; Enter veya çift tıklama dosyayı açar.
+    """
+    file_selected = pyqtSignal(str)
+
+    def __init__(self, client, lang_manager, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.lang_manager = lang_manager
+        self.resize(520, 360)
+
+        layout = QVBoxLayout(self)
+        self.input = QLineEdit(self)
+        self.input.textChanged.connect(self._schedule_query)
+        self.input.returnPressed.connect(self._open_current)
+        layout.addWidget(self.input)
+        self.results = QListWidget(self)
+        self.results.itemActivated.connect(self._open_item)
+        layout.addWidget(self.results)
+
+        # Her tuş vuruşunda istek gönderilmez; yazma durunca sorgulanır
+        self._query_timer = QTimer(self)
+        self._query_timer.setSingleShot(True)
+        self._query_timer.setInterval(150)
+        self._query_timer.timeout.connect(self._send_query)
+        # Son istenen ve listede gösterilen sorgular
+        self._last_query = None
+        self._shown_query = None
+        # Sonuçlar gelmeden Enter'a basıldıysa ilk sonuç açılır
+        self._open_first = False
+
+    def popup(self):
+        """Pencereyi metinleri güncelleyerek gösterir; önceki sorgu seçili kalır."""
+        self._open_first = False
+        self.setWindowTitle(self.lang_manager.get_text("quick_open.title"))
+        self.input.setPlaceholderText(self.lang_manager.get_text("quick_open.placeholder"))
+        self.input.selectAll()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.input.setFocus()
+
+    def set_matches(self, query, paths):
+        """Sunucudan gelen eşleşmeleri listeler; eski bir sorgunun yanıtıysa yok sayılır."""
+        if query != self._last_query:
+            return
+        self._shown_query = query
+        self.results.clear()
+        for path in paths:
+            name = path.rpartition("/")[2]
+            item = QListWidgetItem(f"{name}    {path}")
+            item.setData(Qt.UserRole, path)
+            self.results.addItem(item)
+        if paths:
+            self.results.setCurrentRow(0)
+        if self._open_first:
+            self._open_first = False
+            if paths:
+                self._open_item(self.results.item(0))
+
+    def keyPressEvent(self, event):
+        # Yukarı/aşağı oklar yazı kutusundayken de sonuçlar arasında gezinir
+        if event.key() in (Qt.Key_Down, Qt.Key_Up) and self.results.count():
+            step = 1 if event.key() == Qt.Key_Down else -1
+            row = max(0, min(self.results.count() - 1, self.results.currentRow() + step))
+            self.results.setCurrentRow(row)
+            return
+        super().keyPressEvent(event)
+
+    def _schedule_query(self):
+        self._query_timer.start()
+
+    def _send_query(self):
+        query = self.input.text().strip()
+        if not query:
+            self._last_query = self._shown_query = None
+            self.results.clear()
+            return
+        if query == self._last_query:
+            return
+        self._last_query = query
+        try:
+            self.client.request_find_path(query)
+        except Exception as e:
+            logger.error(f"Yol araması hatası: {str(e)}")
+
+    def _open_current(self):
+        if self._query_timer.isActive():
+            self._query_timer.stop()
+            self._send_query()
+        if self._last_query != self._shown_query:
+            # Son yazılanın sonuçları henüz gelmedi
+            self._open_first = True
+            return
+        item = self.results.currentItem()
+        if item is not None:
+            self._open_item(item)
+
+    def _open_item(self, item):
+        path = item.data(Qt.UserRole)
+        if path:
+            self.accept()
+            self.file_selected.emit(path)
+
+
 class FileBrowserGUI(QMainWindow, QtStyleTools):
-    def __init__(self):
+    def __init__(self, config_dir=None):
         super().__init__()
         
-        # Tercihler yöneticisini oluştur
-        config_dir = os.path.dirname(__file__)
+        # Tercihler yöneticisini oluştur (tercihler ve önbellek varsayılan olarak istemci klasöründe tutulur)
+        config_dir = config_dir or os.path.dirname(__file__)
         self.preferences = Preferences(config_dir)
+
+        # Açılan dosyaların içeriği; bağlantı koptuğunda da okunabilir
+        spill_dir = os.path.join(config_dir, "cache") if self.preferences.get('cache.spill', True) else None
+        self.content_cache = ContentCache(
+            self.preferences.get('cache.memory_mb', CACHE_MEMORY_BYTES // (1024 * 1024)) * 1024 * 1024,
+            spill_dir,
+            self.preferences.get('cache.disk_mb', CACHE_DISK_BYTES // (1024 * 1024)) * 1024 * 1024)
+
+        # Metin alanında gösterilen dosya ve değişiklik sonrası geri yüklenecek scroll konumu
+        self.current_file_path = None
+        self._pending_scroll = None
+        # Sunucudan alınan ağaç ve açık dosya sürümleri (koşullu istekler için)
+        self.tree_version = None
+        self.current_file_version = None
+        # list_dir'i tanımayan eski sunucudan istenen tüm ağacın yanıtı bekleniyor
+        self._full_tree_requested = False
+        # Parçaları gelmekte olan dosya (akış yoksa None), isteğinin kimliği ve önbelleğe yazılacak parçaları
+        self._stream_path = None
+        self._stream_request = None
+        self._stream_started = False
+        self._stream_parts = None
+        # Büyük dosya görüntüleyicinin yanıtı beklenen sayfa isteklerinin kimlikleri
+        self._range_requests = set()
+        # Arama sonucundan açılan dosyada gidilecek satır: (yol, satır)
+        self._pending_line = None
         
         # Dil yöneticisini oluştur
         lang_dir = os.path.join(os.path.dirname(__file__), "lang")
         self.lang_manager = LangManager(lang_dir)
+        # Dil tanımları syntax klasöründen, o türden ilk dosya açıldığında yüklenir
+        self.highlighters = HighlighterRegistry()
         
         self.setWindowTitle("Öğretmen Sunucusu Dosya Görüntüleyici")  # Geçici başlık
         self.resize(1000, 600)
@@ -486,10 +670,26 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         self.splitter = QSplitter(Qt.Horizontal)
         
         # Dosya ağacı
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabel("Dosyalar")  # Geçici başlık
-        self.tree.itemClicked.connect(self.on_item_clicked)
-        self.tree.setFixedWidth(200)
+        # Dosyalar dizi tabanlı modelde tutulur; görünüm yalnızca ekrandaki satırları çizer
+        self.tree_model = FileTreeModel(self.style().standardIcon(QStyle.SP_DirIcon),
+                                        self.style().standardIcon(QStyle.SP_FileIcon), self)
+        self.tree_model.set_header_label("Dosyalar")  # Geçici başlık
+        # Klasör içerikleri ilk açılışta istenir
+        self.tree_model.fetch_requested.connect(self._request_dir)
+        self.tree = QTreeView()
+        self.tree.setModel(self.tree_model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.clicked.connect(self.on_item_clicked)
+        # Hızlı açma ile seçilen ve ağaçta gösterilmeyi bekleyen dosya
+        self._reveal_target = None
+
+        # Dosyalarda arama kutusu ve sonuç listesi (ağacın üstünde/altında)
+        self.search_input = QLineEdit()
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.returnPressed.connect(self.on_search)
+        self.search_results = QListWidget()
+        self.search_results.itemClicked.connect(self.on_search_result_clicked)
+        self.search_results.hide()
         
 
         
@@ -521,12 +721,20 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         self.apply_tree_theme()
 
         
-        self.splitter.addWidget(self.tree)
+        tree_panel = QWidget()
+        tree_panel_layout = QVBoxLayout(tree_panel)
+        tree_panel_layout.setContentsMargins(0, 0, 0, 0)
+        tree_panel_layout.addWidget(self.search_input)
+        tree_panel_layout.addWidget(self.tree, 2)
+        tree_panel_layout.addWidget(self.search_results, 1)
+        tree_panel.setFixedWidth(200)
+        self.splitter.addWidget(tree_panel)
 
         # Metin alanı
         self.text_area = QTextEdit()
         self.text_area.setReadOnly(True)
-        self.highlighter = PythonHighlighter(self.text_area.document())
+        # Renklendirme arka planda, görünen satırlardan başlayarak yapılır; ilk çizim beklemez
+        self.text_area.highlighter = HighlightScheduler(self.text_area, self)
         # Seçim değişince timer başlat, seçim bitince panoya kopyala ve log paneline yaz
         self.text_area.selectionChanged.connect(self.on_text_area_selection_changed)
         self._selection_copy_timer = QTimer(self)
@@ -557,7 +765,13 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         button_layout.setContentsMargins(0, 5, 5, 0)
         button_layout.addWidget(self.refresh_button)
         
-        self.splitter.addWidget(self.text_area)
+        # Eşiği aşan dosyalar tamamı yüklenmeden sayfa sayfa gösterilir
+        self.large_viewer = LargeFileViewer(self.lang_manager)
+        self.large_viewer.range_requested.connect(self._request_range)
+        self.viewer_stack = QStackedWidget()
+        self.viewer_stack.addWidget(self.text_area)
+        self.viewer_stack.addWidget(self.large_viewer)
+        self.splitter.addWidget(self.viewer_stack)
         
         # Log alanı
         self.log_area = QTextEdit()
@@ -583,6 +797,12 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         # Client bağlantısını oluştur
         self.client = ClientConnection()
         self.navbar.set_client(self.client)
+
+        # Dosya adıyla hızlı açma (Ctrl+P)
+        self.quick_open = QuickOpenDialog(self.client, self.lang_manager, self)
+        self.quick_open.file_selected.connect(self.open_path)
+        self.quick_open_shortcut = QShortcut(QKeySequence("Ctrl+P"), self)
+        self.quick_open_shortcut.activated.connect(self.show_quick_open)
         
         # Tercihleri yükle
         self.navbar.load_preferences()
@@ -599,66 +819,233 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         logger.info("FileBrowserGUI başlatıldı")
 
         # Dakikada bir otomatik güncelleme başlat
+        # (sunucu değişiklikleri anında bildiriyorsa ağaç yanıtı geldiğinde durdurulur)
         self.auto_refresh_timer = QTimer(self)
         self.auto_refresh_timer.timeout.connect(self.auto_refresh)
         self.auto_refresh_timer.start(60000)  # 60 saniye
 
+        # Yanıtı gelmeyen isteklerin zaman aşımı kontrolü
+        self.request_timer = QTimer(self)
+        self.request_timer.timeout.connect(self._check_request_timeouts)
+        self.request_timer.start(1000)
+
     def auto_refresh(self):
         """Klasör ve açık dosya içeriğini ve kullanıcı listesini otomatik günceller. Seçili dosya ve scroll korunur."""
+        if self.navbar.connection_status != "connected":
+            # Çevrimdışıyken ağaç ve açık dosya olduğu gibi kalır
+            return
         # Seçili dosya path'i (varsa)
-        selected_item = self.tree.currentItem()
-        selected_path = None
-        if selected_item:
-            selected_path = selected_item.data(0, Qt.UserRole)
+        selected_path = self.tree.currentIndex().data(Qt.UserRole)
         # TextArea scroll pozisyonu
         scroll_bar = self.text_area.verticalScrollBar()
         scroll_value = scroll_bar.value()
-        # Dosya ağacını güncelle
+        # Dosya ağacını güncelle (değişmediyse sunucu kısa bir not_modified yanıtı döner)
         self.update_tree_structure()
         # Dosya seçiliyse tekrar seç
         if selected_path:
             self.select_tree_item_by_path(selected_path)
             # Seçili dosya açıksa içeriğini tekrar iste
-            self.client.request_file(selected_path)
+            self.open_file(selected_path, self._version_for(selected_path))
         # Scroll pozisyonunu geri yükle
         QTimer.singleShot(200, lambda: scroll_bar.setValue(scroll_value))
-        # Kullanıcı listesini güncelle (sadece bağlantı varsa)
+        # Kullanıcı listesini güncelle
+        self.client.request_users()
+
+    def _retry_file_request(self, path):
+        """Yoğunluk nedeniyle reddedilen dosya isteğini, dosya hâlâ seçiliyse tekrarlar."""
+        if self.tree.currentIndex().data(Qt.UserRole) == path \
+                and self.navbar.connection_status == "connected":
+            self.open_file(path, self._version_for(path))
+
+    def open_file(self, path, version=None):
+        """
+        Dosyayı parça parça ister; ilk parça gelince gösterilmeye başlanır.
+        Yalnızca eşik kadarı istenir: daha büyük dosyalar büyük dosya görüntüleyicide sayfalanır.
+        Başka bir dosyaya geçilirken dosya önbellekteyse hemen gösterilir ve sunucudan yalnızca
+        sürümü doğrulanır; bağlantı yoksa önbellekteki içerikle yetinilir.
+        """
+        if path != self.current_file_path:
+            content, cached_version = self.content_cache.get(path)
+            if content is not None:
+                self._show_cached_file(path, content, cached_version)
+                version = cached_version
+        if self.navbar.connection_status != "connected":
+            if path != self.current_file_path:
+                self.log_message(f"Bağlantı yok ve dosya önbellekte değil: {path}", "warning")
+                return False
+            return True
+        request_id = self.client.request_file_range(path, 0, LARGE_FILE_THRESHOLD, version=version)
+        if not request_id:
+            return False
+        # Önceki akışın geç gelen parçaları yeni dosyanın üstüne yazılmasın
+        self._cancel_stream()
+        self._stream_path = path
+        self._stream_request = request_id
+        self._stream_started = False
+        return True
+
+    def _cancel_stream(self):
+        """Süren dosya akışını bırakır; sunucu akışı durdurur, gelmekte olan parçalar atılır."""
+        if self._stream_request is not None:
+            self.client.cancel(self._stream_request)
+        self._stream_path = None
+        self._stream_request = None
+        # Yarım kalan akışın parçaları sonraki dosyanın önbellek kaydına karışmasın
+        self._stream_parts = None
+
+    def _check_request_timeouts(self):
+        """Yanıtı zamanında gelmeyen istekleri bırakır; ilgili dosya/klasör tekrar istenebilir."""
+        for request in self.client.expire_requests():
+            if request.request_id == self._stream_request:
+                self.log_message(f"Dosya isteği zaman aşımına uğradı: {request.path}", "warning")
+            elif request.command == "list_dir":
+                self.log_message(f"Klasör isteği zaman aşımına uğradı: {request.path or '.'}", "warning")
+            self._forget_request(request)
+
+    def _forget_request(self, request):
+        """Yanıtı artık gelmeyecek isteğin bıraktığı durumu temizler; dosya, sayfa veya klasör yeniden istenebilir."""
+        if request.request_id == self._stream_request:
+            self._stream_path = None
+            self._stream_request = None
+            self._stream_parts = None
+        elif request.request_id in self._range_requests:
+            self._range_requests.discard(request.request_id)
+            if request.path == self.large_viewer.path:
+                self.large_viewer.release_range(request.offset, request.length)
+        elif request.command == "list_dir":
+            # Klasör yükleniyor olarak kalırsa bir daha açılamaz
+            self.tree_model.cancel_fetch(request.path)
+        elif request.command == "get_tree":
+            self._full_tree_requested = False
+
+    def _show_cached_file(self, path, content, version):
+        self._cancel_stream()
+        self._show_text_area()
+        self.text_area.setPlainText(content)
+        self.current_file_path = path
+        self.current_file_version = version
+        self._pending_scroll = None
+        self._go_to_pending_line(path)
+        logger.info(f"Dosya önbellekten gösterildi: {path} ({len(content)} karakter)")
+
+    def on_search(self):
+        """Arama kutusunda Enter'a basıldığında sunucuda arama yapar."""
+        query = self.search_input.text().strip()
+        if len(query) < 3:
+            self.search_results.clear()
+            self.search_results.hide()
+            return
+        if self.navbar.connection_status != "connected":
+            return
+        try:
+            self.client.request_search(query)
+        except Exception as e:
+            self.log_message(f"Arama hatası: {str(e)}", "error")
+
+    def show_search_results(self, results, truncated):
+        """Arama sonuçlarını listeler; her satır dosya yolu, satır numarası ve satır parçasıdır."""
+        self.search_results.clear()
+        for result in results:
+            item = QListWidgetItem(f"{result['path']}:{result['line']}  {result.get('snippet', '')}")
+            item.setToolTip(result.get('snippet', ''))
+            item.setData(Qt.UserRole, (result['path'], result['line']))
+            self.search_results.addItem(item)
+        if not results or truncated:
+            key = "search.truncated" if results else "search.no_results"
+            item = QListWidgetItem(self.lang_manager.get_text(key))
+            item.setFlags(Qt.NoItemFlags)
+            self.search_results.addItem(item)
+        self.search_results.show()
+
+    def on_search_result_clicked(self, item):
+        """Sonuçtaki dosyayı açar ve eşleşen satıra gider."""
+        target = item.data(Qt.UserRole)
+        if not target:
+            return
+        path, line = target
+        self._pending_line = (path, line)
+        if not self.open_path(path):
+            self._pending_line = None
+
+    def show_quick_open(self):
+        """Hızlı açma penceresini gösterir (yalnızca bağlıyken)."""
         if self.navbar.connection_status == "connected":
-            self.client.request_users()
+            self.quick_open.popup()
+
+    def open_path(self, path):
+        """Dosyayı açar ve ağaçta gösterir; üst klasörleri henüz listelenmediyse açılarak listelenir."""
+        self._reveal_target = path
+        self._continue_reveal()
+        if not self.open_file(path, self._version_for(path)):
+            self.log_message(f"Dosya istenemedi: {path}", "error")
+            return False
+        self.apply_highlighter(path, self.text_area)
+        return True
+
+    def _continue_reveal(self):
+        """Gösterilmeyi bekleyen dosyanın üst klasörlerini sırayla açar; hepsi listelenince dosyayı seçer."""
+        path = self._reveal_target
+        if not path or self.tree_model.rowCount() == 0:
+            return
+        parts = path.split("/")
+        for depth in range(1, len(parts)):
+            index = self.tree_model.index_for_path("/".join(parts[:depth]))
+            if not index.isValid():
+                # Klasör ağaçta yok (silinmiş veya filtrelenmiş)
+                self._reveal_target = None
+                return
+            self.tree.expand(index)
+            if not self.tree_model.is_loaded(index):
+                # İçeriği istenir; dir_listing gelince devam edilir
+                self.tree_model.fetchMore(index)
+                return
+        self._reveal_target = None
+        index = self.tree_model.index_for_path(path)
+        if index.isValid():
+            self.tree.setCurrentIndex(index)
+            self.tree.scrollTo(index)
+
+    def _go_to_pending_line(self, path):
+        """Arama sonucundan açılan dosya gösterildiğinde imleci eşleşen satıra taşır."""
+        if not self._pending_line or self._pending_line[0] != path:
+            return
+        line = self._pending_line[1]
+        self._pending_line = None
+        self._pending_scroll = None
+        if self.viewer_stack.currentWidget() is self.large_viewer:
+            self.large_viewer.go_to_line(line)
+            return
+        block = self.text_area.document().findBlockByLineNumber(max(0, line - 1))
+        if block.isValid():
+            self.text_area.setTextCursor(QTextCursor(block))
+            self.text_area.ensureCursorVisible()
+
+    def _set_live_updates(self, live_updates):
+        """Sunucu değişiklikleri bildiriyorsa periyodik yenilemeye gerek yok."""
+        if live_updates:
+            if self.auto_refresh_timer.isActive():
+                self.auto_refresh_timer.stop()
+                logger.info("Sunucu anlık bildirim destekliyor, otomatik yenileme durduruldu")
+        elif not self.auto_refresh_timer.isActive():
+            self.auto_refresh_timer.start(60000)
+
+    def _version_for(self, path):
+        """Metin alanında gösterilen dosyanın sürümünü döner; başka bir dosya için None."""
+        return self.current_file_version if path == self.current_file_path else None
 
     def select_tree_item_by_path(self, path):
         """Verilen path'e sahip öğeyi seçer."""
-        def recursive_search(item):
-            for i in range(item.childCount()):
-                child = item.child(i)
-                if child.data(0, Qt.UserRole) == path:
-                    self.tree.setCurrentItem(child)
-                    return True
-                if recursive_search(child):
-                    return True
-            return False
-        root = self.tree.topLevelItem(0)
-        if root:
-            recursive_search(root)
+        index = self.tree_model.index_for_path(path)
+        if index.isValid():
+            self.tree.setCurrentIndex(index)
 
 
     def apply_highlighter(self, path, text_edit):
-        ext = path.lower().split('.')[-1]
-
-        # Önce eski renklendiriciyi sil
-        if hasattr(text_edit, 'highlighter') and text_edit.highlighter is not None:
-            text_edit.highlighter.setDocument(None)
-
-        if ext == 'py':
-            text_edit.highlighter = PythonHighlighter(text_edit.document())
-        elif ext == 'html' or ext == 'htm':
-            text_edit.highlighter = HtmlHighlighter(text_edit.document())
-        elif ext == 'js':
-            text_edit.highlighter = JsHighlighter(text_edit.document())
-        elif ext == 'css':
-            text_edit.highlighter = CssHighlighter(text_edit.document())
-        else:
-            text_edit.highlighter = None  # Renklendirme yapılmaz
+        # Tanımı olmayan uzantılar için None döner, renklendirme yapılmaz
+        lexer = self.highlighters.lexer_for_path(path)
+
+        # Önceki dosyanın süren renklendirmesi bırakılır; yeni içerik geldikçe yeniden başlar
+        text_edit.highlighter.set_lexer(lexer)
 
     def on_text_area_selection_changed(self):
         """Text area'da seçim değişince timer başlat"""
@@ -709,14 +1096,51 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
 
     def handle_message(self, msg):
         """Sunucudan gelen mesajları işle. Kullanıcı listesi güncellemesini de destekler."""
-        logger.debug(f"Mesaj alındı: {str(msg)[:200]}...")
+        # Mesajın tamamı metne çevrilmez; büyük ağaç ve dosyalarda arayüzü bekletir
+        logger.debug(f"Mesaj alındı: {msg.get('response')} {msg.get('path', '')}")
         
         if msg.get("response") == "tree":
             # Dosya ağacı yanıtı
             tree_data = msg.get("data", {})
-            logger.info("Dosya ağacı alındı, ağaç oluşturuluyor")
-            self.populate_tree(tree_data)
+            logger.info("Dosya ağacı alındı, ağaç güncelleniyor")
+            self.apply_dir_listing("", tree_data)
+            self.tree_version = msg.get("version")
+            self._full_tree_requested = False
             self.log_message("Dosya ağacı güncellendi", "success")
+            self._set_live_updates(msg.get("live_updates"))
+
+        elif msg.get("response") == "dir_listing":
+            # Klasör içeriği (ağaç klasörler açıldıkça doldurulur)
+            self.apply_dir_listing(msg.get("path", ""), msg.get("data") or {})
+            self._set_live_updates(msg.get("live_updates"))
+            self._continue_reveal()
+
+        elif msg.get("response") == "tree_delta":
+            # Dosya ağacı değişiklikleri
+            if msg.get("reset"):
+                self.tree_version = None
+                self.update_tree_structure()
+            else:
+                self.apply_tree_delta(msg.get("changes", []))
+                self.tree_version = msg.get("version")
+
+        elif msg.get("response") == "not_modified":
+            # Koşullu isteğe "değişmedi" yanıtı; mevcut ağaç/içerik geçerli
+            logger.info(f"Değişiklik yok: {msg.get('target')} {msg.get('path', '')}")
+            if msg.get("target") == "tree":
+                self._full_tree_requested = False
+            self._pending_scroll = None
+            self._go_to_pending_line(msg.get("path"))
+            if msg.get("path") == self._stream_path and msg.get("id") in (None, self._stream_request):
+                self._stream_path = None
+                self._stream_request = None
+
+        elif msg.get("response") == "file_changed":
+            # Açık dosya değiştiyse içeriği scroll konumu korunarak yeniden iste
+            if self.current_file_path in msg.get("paths", []):
+                self._pending_scroll = (self.current_file_path, self.text_area.verticalScrollBar().value())
+                self.open_file(self.current_file_path)
+                self.log_message(f"Dosya değişti, yeniden yükleniyor: {self.current_file_path}", "info")
             
         elif msg.get("response") == "file":
             # Dosya içeriği yanıtı
@@ -724,21 +1148,147 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
             content = msg.get("content", "")
             
             # Dosya içeriğini göster
+            self._show_text_area()
             self.text_area.setPlainText(content)
+            self.current_file_path = path
+            self.current_file_version = msg.get("version")
+            self.content_cache.put(path, self.current_file_version, content)
+            if self._pending_scroll and self._pending_scroll[0] == path:
+                scroll_value = self._pending_scroll[1]
+                QTimer.singleShot(0, lambda: self.text_area.verticalScrollBar().setValue(scroll_value))
+            self._pending_scroll = None
             self.log_message(f"Dosya yüklendi: {path}", "success")
             logger.info(f"Dosya içeriği gösterildi: {path} ({len(content)} karakter)")
             
+        elif msg.get("response") == "file_chunk":
+            # Akış halinde gelen dosya parçası
+            self.handle_file_chunk(msg)
+
+        elif msg.get("response") == "search_results":
+            # Dosyalarda arama sonuçları
+            self.show_search_results(msg.get("results", []), msg.get("truncated", False))
+
+        elif msg.get("response") == "path_matches":
+            # Hızlı açma eşleşmeleri
+            self.quick_open.set_matches(msg.get("query"), msg.get("paths", []))
+
+        elif msg.get("response") == "busy":
+            # Sunucu yoğun; dosya hâlâ seçiliyse önerilen süre sonra tekrar iste
+            path = msg.get("path")
+            retry_ms = int(float(msg.get("retry_after", 1.0)) * 1000)
+            self.log_message(f"Sunucu yoğun, tekrar denenecek: {path}", "warning")
+            logger.warning(f"Sunucu yoğun: {msg.get('command')} {path}")
+            if path:
+                QTimer.singleShot(retry_ms, lambda: self._retry_file_request(path))
+
+        elif msg.get("response") == "login":
+            # Sunucunun seçtiği sıkıştırma yöntemi; çerçeveler bayraklarına göre açılır
+            logger.info(f"Sunucu sıkıştırması: {msg.get('compression') or 'yok'}")
+
         elif msg.get("response") == "users":
             # Kullanıcı listesi yanıtı
             users = msg.get("users", [])
             logger.info(f"Kullanıcı listesi güncellendi: {users}")
             
         elif msg.get("response") == "error":
-            # Hata yanıtı
+            # Kimlikli hata yanıtı; isteğin beklediği dosya akışı, sayfa veya klasör bırakılır
+            request = msg.get("request")
+            if request is not None:
+                self._forget_request(request)
+                if request.command == "list_dir" and not self.client.list_dir_supported:
+                    # Eski sunucu list_dir'i tanımıyor; ağacın tamamı istenir
+                    self._request_full_tree()
             error_msg = msg.get("error", "Bilinmeyen hata")
             self.handle_error(error_msg)
 
 
+    def handle_file_chunk(self, msg):
+        """Dosya parçasını metin alanına ekler; ilk parça önceki içeriğin yerini alır."""
+        path = msg.get("path", "")
+        request_id = msg.get("id")
+        if path != self._stream_path or request_id not in (None, self._stream_request):
+            # Büyük dosya görüntüleyicinin istediği sayfa; değilse kullanıcı bu arada başka bir dosya açtı
+            if msg.get("eof"):
+                self._range_requests.discard(request_id)
+            if path == self.large_viewer.path:
+                self.large_viewer.add_chunk(msg)
+                request = msg.get("request")
+                if request is not None:
+                    # Sunucu aralığın başını karakter sınırına kaydırmış olabilir; istenen aralığın tamamı bırakılır
+                    self.large_viewer.release_range(request.offset, request.length)
+            return
+        content = msg.get("content", "")
+        if not self._stream_started:
+            self._stream_started = True
+            if path == self.current_file_path and self._pending_scroll is None:
+                # Önbellekten gösterilen dosyanın yeni sürümü: okunan yer korunur
+                self._pending_scroll = (path, self.text_area.verticalScrollBar().value())
+            self.current_file_path = path
+            self.current_file_version = None
+            total_size = msg.get("total_size", 0)
+            if total_size > LARGE_FILE_THRESHOLD:
+                # Büyük dosya: yalnızca görünen sayfalar gösterilir, renklendirme yapılmaz ve önbelleğe alınmaz
+                self._stream_parts = None
+                self._show_large_viewer(path, total_size, msg.get("version"))
+                self.large_viewer.add_chunk(msg)
+            else:
+                self._show_text_area()
+                self.text_area.setPlainText(content)
+                self._stream_parts = [content]
+        elif self.viewer_stack.currentWidget() is self.large_viewer:
+            self.large_viewer.add_chunk(msg)
+        else:
+            cursor = QTextCursor(self.text_area.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(content)
+            self._stream_parts.append(content)
+
+        if msg.get("eof"):
+            self._stream_path = None
+            self._stream_request = None
+            self.current_file_version = msg.get("version")
+            if self._stream_parts is not None:
+                # Büyük dosya görüntüleyicideki dosyalar önbelleğe alınmaz
+                self.content_cache.put(path, self.current_file_version, "".join(self._stream_parts))
+                self._stream_parts = None
+            if self._pending_scroll and self._pending_scroll[0] == path:
+                scroll_value = self._pending_scroll[1]
+                QTimer.singleShot(0, lambda: self.text_area.verticalScrollBar().setValue(scroll_value))
+            self._pending_scroll = None
+            self._go_to_pending_line(path)
+            self.log_message(f"Dosya yüklendi: {path}", "success")
+            logger.info(f"Dosya içeriği gösterildi: {path} ({msg.get('total_size', 0)} bayt)")
+
+    def _show_large_viewer(self, path, total_size, version):
+        self._cancel_ranges()
+        self.text_area.highlighter.set_lexer(None)
+        # Önceki dosyanın metni bellekte tutulmaz
+        self.text_area.clear()
+        self.large_viewer.open(path, total_size, version, LARGE_FILE_THRESHOLD)
+        self.viewer_stack.setCurrentWidget(self.large_viewer)
+        self.log_message(f"Büyük dosya sayfa sayfa gösteriliyor: {path} ({total_size // (1024 * 1024)} MB)", "info")
+
+    def _show_text_area(self):
+        if self.viewer_stack.currentWidget() is not self.text_area:
+            self._cancel_ranges()
+            self.large_viewer.close_file()
+            self.viewer_stack.setCurrentWidget(self.text_area)
+
+    def _cancel_ranges(self):
+        """Kapanan büyük dosyanın henüz gelmemiş sayfalarını iptal eder."""
+        for request_id in self._range_requests:
+            self.client.cancel(request_id)
+        self._range_requests.clear()
+
+    def _request_range(self, path, offset, length):
+        """Büyük dosya görüntüleyicinin istediği sayfayı ister."""
+        try:
+            request_id = self.client.request_file_range(path, offset, length)
+            if request_id:
+                self._range_requests.add(request_id)
+        except Exception as e:
+            self.log_message(f"Dosya isteme hatası: {str(e)}", "error")
+
     def handle_error(self, error_message):
         """Hata mesajlarını işle"""
         logger.error(f"Sunucu hatası: {error_message}")
@@ -758,89 +1308,81 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         logger.warning("Sunucu bağlantısı kesildi")
         QMessageBox.warning(self, "Bağlantı Kesildi", "Sunucu bağlantısı kesildi.")
 
-    def populate_tree(self, tree_data, parent=None, path_prefix=""):
-        """Dosya ağacını doldur"""
-        logger.debug(f"Ağaç doldurma başladı: {str(tree_data)[:100]}...")
-        
-        if parent is None:
-            # Kök düğümü temizle
-            self.tree.clear()
-            parent = self.tree
-            
-            # Kök klasör öğesi oluştur
-            root_item = QTreeWidgetItem(parent)
-            root_item.setText(0, "Kök Dizin")
-            root_item.setIcon(0, self.style().standardIcon(QStyle.SP_DirIcon))
-            parent = root_item
-            logger.debug("Kök dizin öğesi oluşturuldu")
-            
-            # Kök dizindeki dosyaları ekle
-            if "files" in tree_data and isinstance(tree_data["files"], list):
-                logger.debug(f"Kök dizin dosya listesi: {tree_data['files']}")
-                for file_name in sorted(tree_data["files"]):
-                    file_item = QTreeWidgetItem(parent)
-                    file_item.setText(0, file_name)
-                    file_item.setIcon(0, self.style().standardIcon(QStyle.SP_FileIcon))
-                    #logger.debug(f"Dosya eklendi: {file_name}")
-                    
-                    # Dosya yolunu sakla
-                    file_path = file_name
-                    file_item.setData(0, Qt.UserRole, file_path)
-                    #logger.debug(f"Dosya yolu ayarlandı: {file_path}")
-            
-            # Alt klasörleri işle
-            if "children" in tree_data and isinstance(tree_data["children"], dict):
-                for dir_name, dir_data in tree_data["children"].items():
-                    dir_item = QTreeWidgetItem(parent)
-                    dir_item.setText(0, dir_name)
-                    dir_item.setIcon(0, self.style().standardIcon(QStyle.SP_DirIcon))
-                    #logger.debug(f"Klasör eklendi: {dir_name}")
-                    
-                    # Alt klasörleri ekle (recursive)
-                    self.populate_tree(dir_data, dir_item, dir_name)
-        else:
-            # Alt klasörlerdeki dosyaları ekle
-            if "files" in tree_data and isinstance(tree_data["files"], list):
-                logger.debug(f"Klasör dosya listesi: {tree_data['files']}")
-                for file_name in sorted(tree_data["files"]):
-                    file_item = QTreeWidgetItem(parent)
-                    file_item.setText(0, file_name)
-                    file_item.setIcon(0, self.style().standardIcon(QStyle.SP_FileIcon))
-                    #logger.debug(f"Dosya eklendi: {file_name}")
-                    
-                    # Dosya yolunu sakla
-                    file_path = f"{path_prefix}/{file_name}"
-                    file_item.setData(0, Qt.UserRole, file_path)
-                    #logger.debug(f"Dosya yolu ayarlandı: {file_path}")
-            
-            # Alt klasörleri işle
-            if "children" in tree_data and isinstance(tree_data["children"], dict):
-                for dir_name, dir_data in tree_data["children"].items():
-                    dir_item = QTreeWidgetItem(parent)
-                    dir_item.setText(0, dir_name)
-                    dir_item.setIcon(0, self.style().standardIcon(QStyle.SP_DirIcon))
-                    #logger.debug(f"Klasör eklendi: {dir_name}")
-                    
-                    # Alt klasörleri ekle (recursive)
-                    new_path_prefix = f"{path_prefix}/{dir_name}" if path_prefix else dir_name
-                    self.populate_tree(dir_data, dir_item, new_path_prefix)
-        
-        # Ağacı genişlet
-        self.tree.expandItem(self.tree.topLevelItem(0))
-        #logger.debug("Ağaç genişletildi")
-
-    def on_item_clicked(self, item, column):
+    def _request_dir(self, path):
+        """Model, listelenmemiş bir klasör açıldığında içeriğini ister."""
+        try:
+            if self.client.list_dir_supported:
+                self.client.request_dir(path)
+            else:
+                self._request_full_tree()
+        except Exception as e:
+            self.tree_model.cancel_fetch(path)
+            self.log_message(f"Klasör isteme hatası: {str(e)}", "error")
+
+    def _request_loaded_dirs(self):
+        """Açılmış klasörleri (hiçbiri yoksa kökü) yeniden ister; list_dir'i tanımayan sunucudan ağacın tamamı istenir."""
+        if not self.client.list_dir_supported:
+            self._request_full_tree()
+            return
+        for path in self.tree_model.loaded_dir_paths() or [""]:
+            self.client.request_dir(path)
+
+    def _request_full_tree(self):
+        """Ağacın tamamını get_tree ile ister; yanıtı beklenen istek varsa yenisi gönderilmez."""
+        if self._full_tree_requested:
+            return
+        self._full_tree_requested = True
+        self.client.request_tree(self.tree_version)
+
+    def apply_dir_listing(self, path, node):
+        """list_dir (veya tüm ağaç) yanıtını modele işler; yalnızca değişen satırlar güncellenir, açık klasörler korunur."""
+        created = self.tree_model.rowCount() == 0
+        if not self.tree_model.apply_listing(path, node):
+            # Klasör bu arada silindi veya yerel ağaç eskidi
+            logger.debug(f"Klasör listesi uygulanamadı: {path}")
+            return
+        if created:
+            # Ağacı genişlet
+            self.tree.expand(self.tree_model.index(0, 0))
+
+    def apply_tree_delta(self, changes):
+        """Sunucudan gelen ağaç değişikliklerini ağacı yeniden kurmadan uygular."""
+        for change in changes:
+            path = change.get("path", "")
+            parent_path = path.rpartition("/")[0]
+            if self.tree_model.is_within_unloaded(parent_path):
+                # Klasör henüz açılmadı; içeriği açıldığında güncel olarak listelenecek
+                continue
+            if not self.tree_model.contains(parent_path):
+                # Yerel ağaç sunucuyla uyumsuz, tamamını yeniden iste
+                logger.warning(f"Ağaç değişikliği uygulanamadı: {path}")
+                self.tree_version = None
+                self.update_tree_structure()
+                return
+
+            if change.get("op") == "remove":
+                self.tree_model.remove_path(path)
+                self.content_cache.discard(path)
+                if path == self.current_file_path:
+                    self.log_message(f"Açık dosya sunucuda silindi: {path}", "warning")
+            elif change.get("op") == "add":
+                is_dir = change.get("type") == "dir"
+                self.tree_model.add_path(path, is_dir, change.get("tree", {}) if is_dir else None)
+        logger.info(f"Ağaç değişiklikleri uygulandı: {len(changes)} değişiklik")
+
+    def on_item_clicked(self, index):
         """Ağaç öğesi tıklandığında çağrılır"""
         # Dosya yolunu al
-        file_path = item.data(0, Qt.UserRole)
+        file_path = index.data(Qt.UserRole)
         
         # Eğer dosya yolu varsa (klasör değil dosya ise)
         if file_path:
             try:
                 # Dosya içeriğini iste
                 logger.info(f"Dosya tıklandı: {file_path}")
-                if self.client.request_file(file_path):
-                    self.log_message(f"Dosya isteniyor: {file_path}", "info")
+                if self.open_file(file_path, self._version_for(file_path)):
+                    if self.navbar.connection_status == "connected":
+                        self.log_message(f"Dosya isteniyor: {file_path}", "info")
                 else:
                     self.log_message(f"Dosya istenemedi: {file_path}", "error")
             except Exception as e:
@@ -852,8 +1394,20 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
     def on_connection_successful(self):
         try:
             logger.info("Bağlantı başarılı, dosya ağacı isteniyor")
-            self.client.request_tree()
+            server = f"{self.client.host}:{self.client.port}"
+            if server != self.content_cache.server:
+                # Başka bir sunucu: önceki sunucunun ağacı ve dosyası gösterilmez
+                self.tree_model.clear()
+                self.text_area.clear()
+                self._show_text_area()
+                self.current_file_path = None
+                self.current_file_version = None
+                self.content_cache.set_server(server)
+            # Bağlantı kopmadan önce açılmış klasörler ve açık dosya sunucuyla yeniden eşitlenir
+            self._request_loaded_dirs()
             self.log_message("Dosya ağacı isteniyor...", "info")
+            if self.current_file_path:
+                self.open_file(self.current_file_path, self.current_file_version)
         except Exception as e:
             self.log_message(f"Dosya ağacı isteme hatası: {str(e)}", "error")
             logger.error(f"Dosya ağacı isteme hatası: {str(e)}")
@@ -864,8 +1418,21 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
             self.log_message("Sunucuya bağlandı", "success")
         elif status == "disconnected":
             self.log_message("Sunucu bağlantısı kesildi", "warning")
-            self.tree.clear()
-            self.text_area.clear()
+            # Ağaç ve açık dosya korunur; önbellekteki dosyalar çevrimdışı da açılabilir
+            self.tree_model.cancel_all_fetches()
+            if self._stream_path is not None or self.viewer_stack.currentWidget() is self.large_viewer:
+                # Yarım kalan dosya ya da sayfaları sunucudan gelen büyük dosya gösterilmez
+                self.text_area.clear()
+                self._show_text_area()
+                self.current_file_path = None
+                self.current_file_version = None
+            self.tree_version = None
+            self._full_tree_requested = False
+            self._stream_path = None
+            self._stream_request = None
+            self._stream_parts = None
+            self._range_requests.clear()
+            self.log_message("Çevrimdışı: önbellekteki dosyalar görüntülenebilir", "info")
         elif status == "connecting":
             self.log_message("Sunucuya bağlanıyor...", "info")
         elif status == "error":
@@ -960,7 +1527,8 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         self.setWindowTitle(self.lang_manager.get_text("window_title"))
         
         # Dosya ağacı başlığını güncelle
-        self.tree.setHeaderLabel(self.lang_manager.get_text("tree.header"))
+        self.tree_model.set_header_label(self.lang_manager.get_text("tree.header"))
+        self.search_input.setPlaceholderText(self.lang_manager.get_text("search.placeholder"))
         
         # Navbar metinlerini güncelle
         self.navbar.update_texts()
@@ -971,7 +1539,8 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         self.setWindowTitle(self.lang_manager.get_text("window_title"))
         
         # Dosya ağacı başlığını güncelle
-        self.tree.setHeaderLabel(self.lang_manager.get_text("tree.header"))
+        self.tree_model.set_header_label(self.lang_manager.get_text("tree.header"))
+        self.search_input.setPlaceholderText(self.lang_manager.get_text("search.placeholder"))
 
     def _on_theme_changed(self, theme):
         """Tema değiştiğinde çağrılır"""
@@ -987,8 +1556,8 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
 
     def _on_refresh_clicked(self):
         """Refresh butonuna tıklandığında çağrılır"""
-        if self.tree.currentItem():
-            self.on_item_clicked(self.tree.currentItem(), 0)
+        if self.tree.currentIndex().isValid():
+            self.on_item_clicked(self.tree.currentIndex())
 
     def _on_tree_refresh_clicked(self):
         """Tree refresh butonuna tıklandığında çağrılır"""
@@ -997,7 +1566,8 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
     def update_tree_structure(self):
         try:
             logger.info("Dosya ağacı güncelleniyor...")
-            self.client.request_tree()
+            # Yalnızca açılmış klasörler yeniden listelenir
+            self._request_loaded_dirs()
             self.log_message("Dosya ağacı güncelleniyor...", "info")
         except Exception as e:
             self.log_message(f"Dosya ağacı güncelleme hatası: {str(e)}", "error")
@@ -1009,10 +1579,11 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
         font = self.text_area.font()
         font.setPointSize(self.font_size)
         self.text_area.setFont(font)
+        self.large_viewer.text_edit.setFont(font)
 
     def apply_tree_theme(self):
         """
-        QTreeWidget ve bulunduğu layout'un stilini temaya göre uygular.
+        QTreeView ve bulunduğu layout'un stilini temaya göre uygular.
         """
         is_dark = self.current_theme.startswith('dark_')
         if is_dark:
@@ -1028,7 +1599,7 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
             sel_bg = '#d0eaff'
             sel_fg = '#222'
         self.tree.setStyleSheet(f'''
-            QTreeWidget {{
+            QTreeView {{
                 background-color: {bg};
                 border: 1.5px solid {border};
                 font-size: 14px;
@@ -1036,11 +1607,11 @@ class FileBrowserGUI(QMainWindow, QtStyleTools):
                 selection-background-color: {sel_bg};
                 selection-color: {sel_fg};
             }}
-            QTreeWidget::item {{
+            QTreeView::item {{
                 padding: 4px;
                 min-height: 22px;
             }}
-            QTreeWidget::branch {{
+            QTreeView::branch {{
                 padding: 1px;
             }}
         ''')
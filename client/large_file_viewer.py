@@ -0,0 +1,376 @@
+import bisect
+import logging
+from collections import OrderedDict
+from PyQt5.QtWidgets import QWidget, QPlainTextEdit, QScrollBar, QLabel, QHBoxLayout, QVBoxLayout
+from PyQt5.QtCore import Qt, pyqtSignal
+
+logger = logging.getLogger('FileClient.LargeFileViewer')
+
+# Bu boyutu aşan dosyalar büyük dosya görüntüleyicide sayfa sayfa gösterilir
+LARGE_FILE_THRESHOLD = 2 * 1024 * 1024
+# Sayfa isteği boyutu; sunucunun parça boyutuyla aynı olduğundan her istek tek file_chunk ile gelir
+PAGE_SIZE = 64 * 1024
+# Metin alanındaki pencere en fazla bu kadar ardışık sayfadan oluşur
+WINDOW_PAGES = 4
+# Satıra gidilirken dosya baştan bu büyüklükteki isteklerle taranır
+SCAN_SIZE = 1024 * 1024
+# Bellekte tutulan sayfa metinlerinin üst sınırı (karakter)
+MAX_CACHED_CHARS = 8 * 1024 * 1024
+# Pencerenin başına/sonuna bu kadar satır kala komşu sayfalara kaydırılır
+EDGE_LINES = 3
+
+
+def _line_offsets(text):
+    """Metindeki satır başlarının bayt konumları; ilk satır 0'dan başlar."""
+    data = text.encode("utf-8")
+    offsets = [0]
+    index = data.find(b"\n")
+    while index >= 0:
+        offsets.append(index + 1)
+        index = data.find(b"\n", index + 1)
+    return offsets
+
+
+class LargeFileViewer(QWidget):
+    """
+    Büyük dosyalar için sayfalı görüntüleyici. Dosyanın tamamı istenmez; metin alanında yalnızca
+    birkaç sayfalık bir pencere bulunur ve kaydırdıkça komşu sayfalar aralık istekleriyle alınır.
+
+    Alınan her sayfanın bayt aralığı ve satır sayısı saklanır (satır indeksi); sayfa metinleri ise
+    LRU ile sınırlıdır, atılan sayfa gerektiğinde yeniden istenir. Sağdaki çubuk dosya genelindeki
+    konumu gösterir ve dosyanın herhangi bir yerine atlamayı sağlar.
+    """
+    # (yol, bayt konumu, uzunluk) aralığının istenmesi gerektiğinde yayılır
+    range_requested = pyqtSignal(str, int, int)
+
+    def __init__(self, lang_manager, parent=None):
+        super().__init__(parent)
+        self.lang_manager = lang_manager
+
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text_edit.verticalScrollBar().valueChanged.connect(self._on_window_scrolled)
+
+        # Dosya genelindeki konum (bayt / ölçek); bırakıldığında o konuma atlanır
+        self.position_bar = QScrollBar(Qt.Vertical)
+        self.position_bar.setTracking(False)
+        self.position_bar.valueChanged.connect(self._on_position_changed)
+
+        self.status_label = QLabel()
+
+        content_layout = QHBoxLayout()
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        content_layout.addWidget(self.text_edit)
+        content_layout.addWidget(self.position_bar)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(content_layout)
+        layout.addWidget(self.status_label)
+
+        self.path = None
+        self._clear(0, None)
+
+    def _clear(self, total_size, version):
+        self.total_size = total_size
+        self.version = version
+        # Sayfa başlangıçları (sıralı), başlangıç -> bitiş ve başlangıç -> satır sonu sayısı
+        self._starts = []
+        self._ends = {}
+        self._line_counts = {}
+        # Başlangıç -> sayfa metni (LRU)
+        self._texts = OrderedDict()
+        self._cached_chars = 0
+        # Yanıtı beklenen aralıklar: (başlangıç, bitiş)
+        self._requested = []
+        # Pencerenin ilk sayfasını belirleyen bayt konumu ve gösterilen pencere
+        self._anchor = 0
+        self._window = []
+        self._window_start = 0
+        # Penceredeki satırların pencere başına göre bayt konumları (satır i -> bayt)
+        self._line_offsets = [0]
+        # Pencerenin ilk satırının dosyadaki numarası (0'dan); önceki sayfalar bilinmiyorsa None
+        self._window_line = None
+        # Pencere gelince en üstte gösterilecek bayt konumu (atlama veya satıra gitme)
+        self._pending_top = None
+        self._target_line = None
+        self._rendering = False
+        # QScrollBar int sınırını aşan dosyalar için konum ölçeği
+        self._scale = total_size // 0x7fffffff + 1
+
+    def open(self, path, total_size, version, streamed_length=0):
+        """
+        Yeni dosyayı (veya aynı dosyanın yeni sürümünü) göstermeye başlar; aynı dosyada konum korunur.
+        streamed_length: Dosyanın başından zaten istenmiş ve parçaları gelmekte olan bayt sayısı.
+        """
+        top = self._top_byte() if path == self.path and self._window else 0
+        self.path = path
+        self._clear(total_size, version)
+        if streamed_length:
+            self._requested.append((0, min(streamed_length, total_size)))
+        self._anchor = self._pending_top = top if top < total_size else 0
+        self._rendering = True
+        self.text_edit.clear()
+        self.position_bar.setRange(0, total_size // self._scale)
+        self.position_bar.setPageStep(max(1, PAGE_SIZE * WINDOW_PAGES // self._scale))
+        self.position_bar.setValue(self._anchor // self._scale)
+        self._rendering = False
+        logger.info(f"Büyük dosya görüntüleyici: {path} ({total_size} bayt)")
+
+    def close_file(self):
+        """Görüntüleyiciyi boşaltır; sayfa metinleri bırakılır."""
+        self.path = None
+        self._clear(0, None)
+        self.text_edit.clear()
+        self.status_label.clear()
+
+    def release_range(self, offset, length):
+        """
+        Yanıtı tamamlanan veya hiç gelmeyecek (iptal edilmiş, zaman aşımına uğramış) aralığı bekleyenlerden çıkarır.
+        Sunucu karakterin ortasına denk gelen başlangıcı ileri kaydırdığında parçalar aralığın başını
+        kapsamaz; aralık ancak bu çağrıyla tamamen bırakılır.
+        """
+        end = offset + (length if length is not None else self.total_size)
+        self._requested = [r for r in self._requested if r[1] <= offset or r[0] >= end]
+
+    def add_chunk(self, msg):
+        """Sunucudan gelen file_chunk mesajını sayfa olarak ekler ve gerekiyorsa pencereyi günceller."""
+        if msg.get("path") != self.path:
+            return
+        start = msg.get("offset", 0)
+        end = start + msg.get("length", 0)
+        # Gelen parça bekleyen aralıkların başından düşülür; çok parçalı istekler tamamlanana kadar bekler
+        requested = []
+        for requested_start, requested_end in self._requested:
+            if requested_end <= start or requested_start >= end:
+                requested.append((requested_start, requested_end))
+            elif end < requested_end:
+                requested.append((end, requested_end))
+        self._requested = requested
+        if msg.get("version") != self.version:
+            # Dosya bu arada değişti; yeni sürüm açıldığında yeniden istenir
+            return
+        if end <= start:
+            return
+        # Sayfalar sunucunun bayt konumlarıyla anahtarlandığından metin satır sonları çevrilmeden saklanır
+        content = msg.get("raw_content", msg.get("content", ""))
+        if self._ends.get(start) == end:
+            # Bellekten atılmış sayfa yeniden geldi
+            if start not in self._texts:
+                self._store_text(start, content)
+        elif self._is_free(start, end):
+            bisect.insort(self._starts, start)
+            self._ends[start] = end
+            self._line_counts[start] = content.count("\n")
+            self._store_text(start, content)
+        else:
+            return
+        if self._target_line is not None:
+            self._seek_line()
+        self._render()
+
+    def go_to_line(self, line):
+        """1'den başlayan satıra gider; satır indeksi o satıra ulaşmıyorsa dosya baştan taranır."""
+        self._target_line = max(1, line)
+        self._seek_line()
+        self._render()
+
+    # === Sayfa deposu ===
+    def _store_text(self, start, text):
+        self._texts[start] = text
+        self._cached_chars += len(text)
+        # Pencerede olmayan en eski sayfalar atılır; satır indeksi korunur
+        for old in list(self._texts):
+            if self._cached_chars <= MAX_CACHED_CHARS:
+                break
+            if old in self._window or old == start:
+                continue
+            self._cached_chars -= len(self._texts.pop(old))
+
+    def _is_free(self, start, end):
+        """[start, end) aralığı bilinen hiçbir sayfayla çakışmıyorsa True."""
+        i = bisect.bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[self._starts[i]] > start:
+            return False
+        return i + 1 >= len(self._starts) or self._starts[i + 1] >= end
+
+    def _segment_at(self, position):
+        """position baytını içeren sayfanın başlangıcı; bilinmiyorsa None."""
+        i = bisect.bisect_right(self._starts, position) - 1
+        if i >= 0 and position < self._ends[self._starts[i]]:
+            return self._starts[i]
+        return None
+
+    def _fetch(self, position, size=PAGE_SIZE):
+        """position baytını içeren boşluğu, komşu sayfalarla çakışmayacak şekilde ister."""
+        if self.path is None or position >= self.total_size:
+            return
+        known = self._segment_at(position)
+        if known is not None:
+            # Sayfa biliniyor ama metni bellekten atılmış
+            start, end = known, self._ends[known]
+        else:
+            i = bisect.bisect_right(self._starts, position) - 1
+            previous_end = self._ends[self._starts[i]] if i >= 0 else 0
+            next_start = self._starts[i + 1] if i + 1 < len(self._starts) else self.total_size
+            # Önceki sayfaya yakınsa onun bitişinden, değilse sayfa sınırından başlanır
+            start = previous_end if position - previous_end < size else max(previous_end, position - position % PAGE_SIZE)
+            end = min(start + size, next_start)
+            if end - start < size:
+                # Sonraki sayfaya dayanan kısa boşluk geriye doğru büyütülür. Sunucunun karakter sınırına
+                # kaydırdığı sayfanın önündeki birkaç baytlık boşluk tek başına istenirse yanıt boş gelir
+                start = max(previous_end, end - size)
+        if any(r[0] <= position < r[1] for r in self._requested):
+            return
+        self._requested.append((start, end))
+        self.range_requested.emit(self.path, start, end - start)
+
+    # === Satır indeksi ===
+    def _lines_before(self, position):
+        """position baytından önceki satır sonu sayısı; baştan o konuma kadar tüm sayfalar bilinmiyorsa None."""
+        lines = 0
+        start = 0
+        while start < position:
+            end = self._ends.get(start)
+            if end is None or end > position:
+                return None
+            lines += self._line_counts[start]
+            start = end
+        return lines
+
+    def _seek_line(self):
+        """Hedef satırın bulunduğu sayfaya kadar satır indeksini izler; eksik sayfayı ister."""
+        remaining = self._target_line - 1
+        start = 0
+        while start < self.total_size:
+            end = self._ends.get(start)
+            if end is None:
+                self._fetch(start, SCAN_SIZE)
+                return
+            if remaining <= self._line_counts[start]:
+                text = self._texts.get(start)
+                if text is None:
+                    self._fetch(start)
+                    return
+                # Sayfa içindeki satır başının bayt konumu
+                index = 0
+                for _ in range(remaining):
+                    index = text.index("\n", index) + 1
+                self._anchor = self._pending_top = start + len(text[:index].encode("utf-8"))
+                self._target_line = None
+                return
+            remaining -= self._line_counts[start]
+            start = end
+        self._target_line = None
+
+    # === Pencere ===
+    def _render(self):
+        """Bağlantı noktasından başlayan ardışık sayfaları pencere olarak gösterir; eksik sayfaları ister."""
+        if self.path is None or self._target_line is not None:
+            return
+        segment = self._segment_at(self._anchor)
+        if segment is None:
+            self._fetch(self._anchor)
+            return
+        window = []
+        while segment is not None and len(window) < WINDOW_PAGES:
+            if segment not in self._texts:
+                self._fetch(segment)
+                break
+            window.append(segment)
+            end = self._ends[segment]
+            if end >= self.total_size:
+                break
+            segment = end if end in self._ends else None
+            if segment is None:
+                self._fetch(end)
+        if window and window[0] > 0:
+            # Yukarı kaydırma için önceki sayfa da önceden istenir
+            if self._segment_at(window[0] - 1) is None:
+                self._fetch(window[0] - 1)
+        if not window or (window == self._window and self._pending_top is None):
+            return
+        self._show(window)
+
+    def _show(self, window):
+        top = self._pending_top if self._pending_top is not None else self._top_byte()
+        text = "".join(self._texts[segment] for segment in window)
+        start = window[0]
+        first_line = self._lines_before(start)
+        if start > 0:
+            # İlk satır önceki sayfada başlıyor; o satır önceki pencerede gösterilir
+            cut = text.find("\n") + 1
+            start += len(text[:cut].encode("utf-8"))
+            text = text[cut:]
+            if first_line is not None and cut:
+                first_line += 1
+        if self._ends[window[-1]] < self.total_size:
+            # Son satır sonraki sayfada bitiyor
+            cut = text.rfind("\n")
+            if cut >= 0:
+                text = text[:cut]
+
+        self._rendering = True
+        try:
+            self._window = window
+            self._window_start = start
+            self._line_offsets = _line_offsets(text)
+            self._window_line = first_line
+            # Satırlar \n ile ayrılır; \r'ler yalnızca gösterimden çıkarılır, bayt konumları ham metinden hesaplanır
+            self.text_edit.setPlainText(text.replace("\r", "") if "\r" in text else text)
+            self._scroll_to_byte(top)
+            self._pending_top = None
+            for segment in window:
+                self._texts.move_to_end(segment)
+        finally:
+            self._rendering = False
+        self._update_position()
+
+    def _top_byte(self):
+        """Ekranın en üstündeki satırın dosyadaki bayt konumu."""
+        line = min(self.text_edit.firstVisibleBlock().blockNumber(), len(self._line_offsets) - 1)
+        return self._window_start + self._line_offsets[line]
+
+    def _scroll_to_byte(self, position):
+        offset = position - self._window_start
+        if offset <= 0:
+            self.text_edit.verticalScrollBar().setValue(0)
+            return
+        self.text_edit.verticalScrollBar().setValue(bisect.bisect_right(self._line_offsets, offset) - 1)
+
+    def _on_window_scrolled(self, value):
+        if self._rendering or not self._window:
+            return
+        bar = self.text_edit.verticalScrollBar()
+        if value >= bar.maximum() - EDGE_LINES and self._ends[self._window[-1]] < self.total_size \
+                and len(self._window) > 1:
+            # Pencerenin sonuna gelindi; yarım pencere ileri kaydırılır
+            self._anchor = self._window[len(self._window) // 2]
+            self._render()
+        elif value <= EDGE_LINES and self._window_start > 0:
+            # Pencerenin başına gelindi; bir sayfa geri kaydırılır
+            self._anchor = self._window[0] - 1
+            self._render()
+        self._update_position()
+
+    def _on_position_changed(self, value):
+        if self._rendering or self.path is None:
+            return
+        self._anchor = self._pending_top = min(value * self._scale, max(0, self.total_size - 1))
+        self._target_line = None
+        self._render()
+
+    def _update_position(self):
+        if not self._window:
+            return
+        top = self._top_byte()
+        self.position_bar.blockSignals(True)
+        self.position_bar.setValue(top // self._scale)
+        self.position_bar.blockSignals(False)
+        size_mb = f"{self.total_size / (1024 * 1024):.1f}"
+        percent = top * 100 // max(1, self.total_size)
+        if self._window_line is None:
+            self.status_label.setText(self.lang_manager.get_text("large_file.status", size_mb, percent))
+        else:
+            line = self._window_line + self.text_edit.firstVisibleBlock().blockNumber() + 1
+            self.status_label.setText(self.lang_manager.get_text("large_file.status_line", size_mb, percent, line))
@@ -10,11 +10,18 @@ class Preferences:
         self.defaults = {
             'connection': {
                 'ip': '0.0.0.0',
-                'port': 9009
+                'port': 9009,
+                'framing': 'newline',
+                'compression': True
             },
             'ui': {
                 'language': 'tr',
                 'theme': 'dark_purple.xml'
+            },
+            'cache': {
+                'memory_mb': 64,
+                'disk_mb': 256,
+                'spill': True
             }
         }
         self.current = self.load()
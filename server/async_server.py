@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from . import server
+from shared import protocol
+
+# Logger oluştur
+logger = logging.getLogger('FileServer.Async')
+
+
+class AsyncClientSession(server.ClientSession):
+    """
+    asyncio motorundaki bir istemci bağlantısı.
+    send_raw herhangi bir thread'den (iş parçacığı havuzu, değişiklik izleyici) çağrılabilir;
+    yazma işlemi olay döngüsüne aktarılır.
+    """
+
+    def __init__(self, writer, addr, loop):
+        super().__init__(None, addr)
+        self.writer = writer
+        self.loop = loop
+
+    def send_raw(self, data):
+        """
+        Baytları olay döngüsü üzerinden yazar ve soket tamponu boşalana kadar bekler.
+        Böylece uzun dosya akışları yavaş istemcilerde bellekte birikmez.
+        Olay döngüsü thread'inden çağrılmamalıdır.
+        """
+        if self.loop.is_closed():
+            raise ConnectionError("Olay döngüsü kapalı")
+        future = asyncio.run_coroutine_threadsafe(self._write(data), self.loop)
+        while True:
+            try:
+                return future.result(timeout=1.0)
+            except FutureTimeoutError:
+                # Döngü durdurulduysa yazma hiç çalışmayabilir
+                if not self.loop.is_running():
+                    future.cancel()
+                    raise ConnectionError("Olay döngüsü durduruldu")
+
+    async def _write(self, data):
+        if self.writer.is_closing():
+            raise ConnectionError("Bağlantı kapalı")
+        self.writer.write(data)
+        await self.writer.drain()
+
+
+class AsyncServerEngine:
+    """
+    Thread-per-connection yerine tek bir asyncio olay döngüsünde çalışan sunucu motoru.
+
+    Her bağlantı bir coroutine ile okunur; mesaj işleme (disk okuma, JSON kodlama)
+    sınırlı boyutlu bir thread havuzunda yapılır. stop() dinleyen soketi ve tüm
+    bağlantıları hemen kapatır.
+    """
+
+    def __init__(self, host, port, max_workers=8):
+        """
+        Args:
+            host (str): Dinlenecek adres
+            port (int): Dinlenecek port
+            max_workers (int): Mesaj işleme havuzundaki en fazla thread sayısı
+        """
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers
+        self.loop = None
+        self._stopped = None
+        self._stop_requested = False
+        self._connections = {}  # görev -> StreamWriter
+        self._executor = None
+
+    def run(self):
+        """Sunucuyu çalıştırır; stop() çağrılana kadar bloklar. Başarılıysa True döner."""
+        self.loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="FileServerWorker")
+        try:
+            self.loop.run_until_complete(self._serve())
+            logger.info("[SERVER] Durduruldu")
+            return True
+        except Exception as e:
+            logger.error(f"[SERVER] Başlatma hatası: {e}")
+            return False
+        finally:
+            self._executor.shutdown(wait=False)
+            self.loop.close()
+
+    def stop(self):
+        """Sunucuyu durdurur; herhangi bir thread'den çağrılabilir."""
+        self._stop_requested = True
+        loop = self.loop
+        if loop is not None and not loop.is_closed() and self._stopped is not None:
+            try:
+                loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                # Döngü bu arada kapandı
+                pass
+
+    async def _serve(self):
+        self._stopped = asyncio.Event()
+        listener = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=protocol.MAX_REQUEST_SIZE)
+        logger.info(f"[SERVER] Dinleniyor (asyncio, {self.max_workers} işçi)...")
+        async with listener:
+            if not self._stop_requested:
+                await self._stopped.wait()
+        # Açık bağlantılar kapatılır; okuyan coroutine'ler EOF alıp kendiliğinden biter
+        for writer in list(self._connections.values()):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def _handle_connection(self, reader, writer):
+        addr = writer.get_extra_info("peername")
+        logger.info(f"[+] Yeni bağlantı: {addr}")
+        session = AsyncClientSession(writer, addr, self.loop)
+        server.active_sessions[addr] = session
+        self._connections[asyncio.current_task()] = writer
+        message_reader = protocol.AsyncMessageReader(reader, max_size=protocol.MAX_REQUEST_SIZE)
+        try:
+            while True:
+                message = await message_reader.read_payload()
+                if message is None:
+                    logger.info(f"[-] Bağlantı kapandı: {addr}")
+                    break
+                session.framing = message_reader.framing
+                # Bloklayan disk/JSON işleri olay döngüsünü durdurmasın
+                await self.loop.run_in_executor(
+                    self._executor, server.process_message, session, message, message_reader.request_id)
+        except ConnectionError:
+            logger.info(f"[-] Bağlantı kesildi: {addr}")
+        except protocol.ProtocolError as e:
+            logger.warning(f"Protokol hatası: {str(e)} - {addr}")
+        except Exception as e:
+            logger.error(f"Beklenmeyen hata: {str(e)} - {addr}")
+        finally:
+            server._unregister_session(addr)
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+            logger.info(f"[-] Bağlantı kapatıldı: {addr}")
@@ -1,5 +1,10 @@
+import io
 import os
+import stat
+import threading
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Paylaşılacak dosya uzantıları
 ALLOWED_EXTENSIONS = [
@@ -22,12 +27,25 @@ EXCLUDED_EXTENSIONS = [
 # Logger oluştur
 logger = logging.getLogger('FileServer.Browser')
 
+# İçerik önbelleğinin varsayılan bellek bütçesi (bayt)
+CONTENT_CACHE_BYTES = 64 * 1024 * 1024
+
+def _compile_filters():
+    """Filtre listelerini hızlı üyelik kontrolü için kümelere çevirir; ayarlar her değiştiğinde çağrılır."""
+    global _filters
+    _filters = (frozenset(ALLOWED_EXTENSIONS), frozenset(EXCLUDED_EXTENSIONS), frozenset(EXCLUDED_DIRECTORIES))
+
+# (izin verilen uzantılar, hariç tutulan uzantılar, hariç tutulan klasörler)
+_filters = None
+_compile_filters()
+
 def set_allowed_extensions(extensions):
     """
     İzin verilen dosya uzantılarını ayarla
     """
     global ALLOWED_EXTENSIONS
     ALLOWED_EXTENSIONS = extensions
+    _compile_filters()
     logger.info(f"İzin verilen dosya uzantıları güncellendi: {ALLOWED_EXTENSIONS}")
 
 def set_excluded_directories(directories):
@@ -36,6 +54,7 @@ def set_excluded_directories(directories):
     """
     global EXCLUDED_DIRECTORIES
     EXCLUDED_DIRECTORIES = directories
+    _compile_filters()
     logger.info(f"Hariç tutulan klasörler güncellendi: {EXCLUDED_DIRECTORIES}")
 
 def set_excluded_extensions(extensions):
@@ -44,8 +63,134 @@ def set_excluded_extensions(extensions):
     """
     global EXCLUDED_EXTENSIONS
     EXCLUDED_EXTENSIONS = extensions
+    _compile_filters()
     logger.info(f"Hariç tutulan dosya uzantıları güncellendi: {EXCLUDED_EXTENSIONS}")
 
+def get_filter_key():
+    """
+    Geçerli izin/hariç tutma ayarlarını temsil eden değiştirilemez bir anahtar döner.
+    Ağaç önbelleği bu anahtar değiştiğinde ağacı yeniden oluşturur.
+    """
+    return (tuple(ALLOWED_EXTENSIONS), tuple(EXCLUDED_DIRECTORIES), tuple(EXCLUDED_EXTENSIONS))
+
+def is_allowed_file(file_name):
+    """
+    Dosya adının uzantısına göre paylaşılıp paylaşılamayacağını döner.
+    """
+    ext = os.path.splitext(file_name)[1].lower()
+    allowed_exts, excluded_exts, _ = _filters
+    return ext in allowed_exts and ext not in excluded_exts
+
+def scan_directory(base_dir, rel_dir):
+    """
+    Tek bir klasörün doğrudan içeriğini os.scandir ile filtreleyerek döner.
+    Hariç tutulan ve sembolik bağlantı olan klasörler atlanır (os.walk gibi).
+    rel_dir '/' ile ayrılmış göreli yoldur, kök için boş string verilir.
+
+    Returns:
+        tuple: (sıralı dosya adları, sıralı alt klasör adları)
+    """
+    full_path = os.path.join(base_dir, rel_dir) if rel_dir else base_dir
+    files, subdirs = _list_entries(base_dir, full_path)
+    return files, [entry.name for entry in subdirs]
+
+def _list_entries(base_dir, path):
+    """
+    Tek bir klasörü filtreleyerek listeler.
+    Klasör/dosya ayrımı DirEntry'nin tür bilgisinden alınır (çoğu platformda ek stat çağrısı yapılmaz);
+    realpath kontrolü yalnızca sembolik bağlantı olan dosyalar için yapılır.
+
+    Returns:
+        tuple: (sıralı dosya adları, ada göre sıralı alt klasör DirEntry'leri)
+    """
+    allowed_exts, excluded_exts, excluded_dirs = _filters
+    real_base = None
+    files = []
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            try:
+                if entry.is_dir():
+                    if name not in excluded_dirs and not entry.is_symlink():
+                        subdirs.append(entry)
+                    continue
+                ext = os.path.splitext(name)[1].lower()
+                if ext not in allowed_exts or ext in excluded_exts:
+                    continue
+                if entry.is_symlink():
+                    # Yalnızca paylaşım içinde kalan dosya bağlantıları gösterilir
+                    if real_base is None:
+                        real_base = os.path.realpath(base_dir)
+                    if not os.path.realpath(entry.path).startswith(real_base + os.sep):
+                        continue
+                files.append(name)
+            except OSError:
+                continue
+    files.sort()
+    subdirs.sort(key=lambda entry: entry.name)
+    return files, subdirs
+
+def list_directory(base_dir, rel_dir, depth=1):
+    """
+    Klasörün içeriğini verilen derinliğe kadar ağaç formatında döner.
+    Derinlik sınırındaki alt klasörlerin değeri None'dır (içerikleri henüz listelenmedi).
+
+    Args:
+        base_dir (str): Paylaşılan klasör
+        rel_dir (str): '/' ile ayrılmış göreli klasör yolu, kök için boş string
+        depth (int): Listelenecek seviye sayısı (1: yalnızca doğrudan içerik)
+
+    Returns:
+        tuple: (düğüm, None) veya (None, hata mesajı)
+    """
+    if any(part in _filters[2] for part in rel_dir.split("/")):
+        logger.warning(f"Hariç tutulan klasöre erişim girişimi: {rel_dir}")
+        return None, "Bu klasöre erişim izni yok"
+    full_path = os.path.join(base_dir, rel_dir) if rel_dir else base_dir
+    if not os.path.isdir(full_path):
+        return None, "Klasör bulunamadı"
+    try:
+        return _list_node(base_dir, rel_dir, depth), None
+    except OSError as e:
+        logger.error(f"Klasör listeleme hatası: {rel_dir} - {str(e)}")
+        return None, f"Klasör okunamadı: {str(e)}"
+
+def _list_node(base_dir, rel_dir, depth):
+    files, dirs = scan_directory(base_dir, rel_dir)
+    children = {}
+    for name in dirs:
+        if depth <= 1:
+            children[name] = None
+            continue
+        child_rel = f"{rel_dir}/{name}" if rel_dir else name
+        try:
+            children[name] = _list_node(base_dir, child_rel, depth - 1)
+        except OSError:
+            children[name] = {"files": [], "children": {}}
+    return {"files": files, "children": children}
+
+def get_file_version(base_dir, rel_path):
+    """
+    Dosyanın sürüm etiketini mtime ve boyut bilgisinden üretir (tek bir stat çağrısı).
+    Dosya yoksa veya paylaşıma dahil değilse None döner.
+    """
+    excluded_dirs = _filters[2]
+    if any(part in excluded_dirs for part in rel_path.replace("\\", "/").split("/")):
+        return None
+    if not is_allowed_file(rel_path):
+        return None
+    try:
+        st = os.stat(os.path.join(base_dir, rel_path))
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return _format_version(st)
+
+def _format_version(st):
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
 def is_safe_path(base_dir, rel_path):
     """
     Güvenlik kontrolü: Verilen yolun base_dir dışına çıkıp çıkmadığını kontrol eder.
@@ -70,7 +215,7 @@ def build_tree(base_dir):
     """
     Belirtilen klasörden başlayarak dosya ve klasör ağacını döner.
     Sadece isim ve alt klasör bilgisi içerir.
-    Güvenlik kontrolü yaparak base_dir dışına çıkmayı engeller.
+    Sembolik bağlantı olan klasörlere girilmez; base_dir dışını gösteren dosya bağlantıları atlanır.
     Sadece izin verilen uzantılara sahip dosyaları içerir.
     Hariç tutulan klasörleri ve dosya uzantılarını atlar.
     """
@@ -79,107 +224,88 @@ def build_tree(base_dir):
     # Base_dir'i normalize et
     base_dir = os.path.normpath(os.path.realpath(os.path.abspath(base_dir)))
     
-    tree = {}
-    total_files = 0
-    allowed_files = 0
-    excluded_dirs = 0
-    excluded_files = 0
-    
-    for root, dirs, files in os.walk(base_dir):
-        # Hariç tutulan klasörleri dirs listesinden çıkar
-        # Bu, os.walk'ın bu klasörlere girmesini engeller
-        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRECTORIES]
-        
-        # Güvenlik kontrolü: Bu klasör base_dir içinde mi?
-        rel_path_to_root = os.path.relpath(root, base_dir)
-        if not is_safe_path(base_dir, rel_path_to_root):
-            logger.warning(f"Güvenlik kontrolü başarısız: {rel_path_to_root}")
-            continue
-            
-        # Göreli path
-        rel_path = os.path.relpath(root, base_dir)
-        
-        # Klasör hariç tutulanlar listesinde mi kontrol et
-        if any(excluded_dir in rel_path.split(os.sep) for excluded_dir in EXCLUDED_DIRECTORIES):
-            logger.debug(f"Hariç tutulan klasör atlandı: {rel_path}")
-            excluded_dirs += 1
-            continue
-        
-        # Kök dizin için özel işlem
-        if rel_path == ".":
-            # Sadece izin verilen uzantılara sahip dosyaları filtrele
-            filtered_files = []
-            for file in files:
-                total_files += 1
-                _, ext = os.path.splitext(file)
-                
-                # Hariç tutulan uzantıları kontrol et
-                if ext.lower() in EXCLUDED_EXTENSIONS:
-                    logger.debug(f"Hariç tutulan uzantı: {file} (uzantı: {ext})")
-                    excluded_files += 1
-                    continue
-                
-                if ext.lower() in ALLOWED_EXTENSIONS:
-                    filtered_files.append(file)
-                    allowed_files += 1
-                    logger.debug(f"İzin verilen dosya: {file}")
-                else:
-                    logger.debug(f"Filtrelenen dosya: {file} (uzantı: {ext})")
-            
-            # Kök dizin için dosyaları ve alt klasörleri ayarla
-            tree["files"] = filtered_files
-            tree["children"] = {}
-            continue
-        
-        # Alt dizinler için
-        path_parts = rel_path.split(os.sep)
-        current = tree
-        
-        # Dizin yolunu oluştur
-        for i, part in enumerate(path_parts):
-            if i < len(path_parts) - 1:
-                current = current.setdefault("children", {}).setdefault(part, {})
-            else:
-                # Son dizin
-                if "children" not in current:
-                    current["children"] = {}
-                if part not in current["children"]:
-                    current["children"][part] = {"files": [], "children": {}}
-                
-                # Sadece izin verilen uzantılara sahip dosyaları filtrele
-                filtered_files = []
-                for file in files:
-                    total_files += 1
-                    _, ext = os.path.splitext(file)
-                    
-                    # Hariç tutulan uzantıları kontrol et
-                    if ext.lower() in EXCLUDED_EXTENSIONS:
-                        logger.debug(f"Hariç tutulan uzantı: {os.path.join(rel_path, file)} (uzantı: {ext})")
-                        excluded_files += 1
-                        continue
-                    
-                    if ext.lower() in ALLOWED_EXTENSIONS:
-                        filtered_files.append(file)
-                        allowed_files += 1
-                        #logger.debug(f"İzin verilen dosya: {os.path.join(rel_path, file)}")
-                    else:
-                        pass
-                        #logger.debug(f"Filtrelenen dosya: {os.path.join(rel_path, file)} (uzantı: {ext})")
-                
-                current["children"][part]["files"] = filtered_files
-
-    logger.info(f"Dosya ağacı oluşturuldu. Toplam dosya: {total_files}, İzin verilen: {allowed_files}, Hariç tutulan klasör: {excluded_dirs}, Hariç tutulan dosya: {excluded_files}")
+    tree = scan_tree(base_dir)
+    logger.info(f"Dosya ağacı oluşturuldu: {base_dir}")
     logger.debug(f"Ağaç yapısı: {str(tree)[:500]}...")
     return tree
 
 
-def read_file(base_dir, rel_path):
+def scan_tree(base_dir, rel_dir="", dir_mtimes=None, workers=1):
     """
-    Belirli bir dosyanın içeriğini readonly okur.
-    base_dir dışına çıkmaya çalışırsa hata verir.
+    Klasörü ve tüm alt klasörlerini tek geçişte os.scandir ile tarayıp ağaç düğümü döner.
+
+    Filtreler önceden derlenmiş kümelerle kontrol edilir ve her klasör, kökten yol
+    aranmadan doğrudan kendi düğümüne yazılır. Dosyalar ve alt klasörler ada göre sıralıdır.
+
+    workers 1'den büyükse her klasör ayrı bir iş olarak thread havuzunda listelenir;
+    ağ sürücüsü ve yavaş USB belleklerde bekleme süreleri üst üste biner. Her düğüme
+    yalnızca kendi işi yazdığından sonuç sıralı taramayla birebir aynıdır.
+
+    Args:
+        base_dir (str): Normalize edilmiş paylaşım klasörü
+        rel_dir (str): Taramanın başlayacağı '/' ile ayrılmış göreli klasör, kök için boş string
+        dir_mtimes (dict): Verilirse taranan her klasörün listelemeden önceki mtime'ı (ns) yazılır
+        workers (int): Aynı anda listelenecek en fazla klasör sayısı
+
+    Returns:
+        dict: {"files": [...], "children": {ad: düğüm}}
+    """
+    root = {"files": [], "children": {}}
+    root_path = os.path.join(base_dir, rel_dir) if rel_dir else base_dir
+    if dir_mtimes is not None:
+        dir_mtimes[rel_dir] = os.stat(root_path).st_mtime_ns
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FileServerScan") as executor:
+            futures = {executor.submit(_scan_node, base_dir, root_path, rel_dir, root, dir_mtimes)}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for job in future.result():
+                        futures.add(executor.submit(_scan_node, base_dir, *job, dir_mtimes))
+    else:
+        stack = [(root_path, rel_dir, root)]
+        while stack:
+            stack.extend(_scan_node(base_dir, *stack.pop(), dir_mtimes))
+    return root
+
+
+def _scan_node(base_dir, path, rel, node, dir_mtimes):
+    """
+    Tek bir klasörü listeleyip düğümüne yazar.
+
+    Returns:
+        list: Taranacak alt klasörler için (tam yol, göreli yol, boş düğüm) listesi
+    """
+    try:
+        node["files"], subdirs = _list_entries(base_dir, path)
+    except OSError as e:
+        logger.warning(f"Klasör taranamadı: {rel or '.'} - {e}")
+        return []
+
+    jobs = []
+    children = node["children"]
+    for entry in subdirs:
+        child_rel = f"{rel}/{entry.name}" if rel else entry.name
+        if dir_mtimes is not None:
+            try:
+                # mtime listelemeden önce alınır; tarama sırasındaki değişiklik bir sonraki kontrolde yakalanır
+                dir_mtimes[child_rel] = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+        child = {"files": [], "children": {}}
+        children[entry.name] = child
+        jobs.append((entry.path, child_rel, child))
+    return jobs
+
+
+def check_readable_file(base_dir, rel_path):
+    """
+    Dosyanın istemciye gönderilebilir olduğunu kontrol eder.
+
+    Returns:
+        tuple: (tam yol, None) veya (None, hata mesajı)
     """
-    logger.info(f"Dosya okunuyor: {rel_path}")
-    
     # Güvenlik kontrolü
     if not is_safe_path(base_dir, rel_path):
         logger.warning(f"Güvenlik ihlali: {rel_path} yolu base_dir dışına çıkmaya çalışıyor")
@@ -198,19 +324,33 @@ def read_file(base_dir, rel_path):
         logger.error(f"Dosya bulunamadı: {full_path}")
         return None, "Dosya bulunamadı"
     
+    # Dosya uzantısını kontrol et
+    _, ext = os.path.splitext(full_path)
+    
+    # Hariç tutulan uzantıları kontrol et
+    if ext.lower() in EXCLUDED_EXTENSIONS:
+        logger.warning(f"Hariç tutulan dosya uzantısına erişim girişimi: {ext}")
+        return None, f"Bu dosya uzantısına ({ext}) erişim izni yok"
+    
+    if ext.lower() not in ALLOWED_EXTENSIONS:
+        logger.warning(f"İzin verilmeyen dosya uzantısı: {ext}")
+        return None, f"Bu dosya uzantısına ({ext}) erişim izni yok"
+
+    return full_path, None
+
+
+def read_file(base_dir, rel_path):
+    """
+    Belirli bir dosyanın içeriğini readonly okur.
+    base_dir dışına çıkmaya çalışırsa hata verir.
+    """
+    logger.info(f"Dosya okunuyor: {rel_path}")
+    
+    full_path, error = check_readable_file(base_dir, rel_path)
+    if error:
+        return None, error
+    
     try:
-        # Dosya uzantısını kontrol et
-        _, ext = os.path.splitext(full_path)
-        
-        # Hariç tutulan uzantıları kontrol et
-        if ext.lower() in EXCLUDED_EXTENSIONS:
-            logger.warning(f"Hariç tutulan dosya uzantısına erişim girişimi: {ext}")
-            return None, f"Bu dosya uzantısına ({ext}) erişim izni yok"
-        
-        if ext.lower() not in ALLOWED_EXTENSIONS:
-            logger.warning(f"İzin verilmeyen dosya uzantısı: {ext}")
-            return None, f"Bu dosya uzantısına ({ext}) erişim izni yok"
-        
         # Dosyayı oku
         with open(full_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -218,4 +358,244 @@ def read_file(base_dir, rel_path):
         return content, None
     except Exception as e:
         logger.error(f"Dosya okuma hatası: {str(e)}")
-        return None, f"Dosya okuma hatası: {str(e)}"
\ No newline at end of file
+        return None, f"Dosya okuma hatası: {str(e)}"
+
+
+# UTF-8 devam baytları (10xxxxxx)
+_UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+
+
+def _utf8_complete_length(data):
+    """Verinin sonunda yarım kalmış UTF-8 karakteri varsa, onu dışarıda bırakan uzunluğu döner."""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            # Devam baytı, karakterin başını aramaya devam et
+            continue
+        if byte >= 0xC0:
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            if needed > back:
+                return len(data) - back
+        break
+    return len(data)
+
+
+def iter_file_chunks(full_path, offset=0, length=None, chunk_size=64 * 1024):
+    """
+    Dosyayı tamamını belleğe almadan parça parça okur.
+    Parça sınırları UTF-8 karakterlerini bölmez; bu yüzden parçalar chunk_size'dan birkaç bayt kısa olabilir.
+    Bir karakterin ortasına denk gelen offset sonraki karakterin başına kaydırılır.
+
+    Args:
+        full_path (str): check_readable_file ile doğrulanmış tam yol
+        offset (int): Okumaya başlanacak bayt konumu
+        length (int): Okunacak en fazla bayt sayısı (None ise dosya sonuna kadar)
+        chunk_size (int): Parça başına okunacak bayt sayısı
+
+    Yields:
+        tuple: (parçanın bayt konumu, parçanın bayt uzunluğu, metin)
+    """
+    with open(full_path, 'rb') as f:
+        yield from _iter_chunks(f, offset, length, chunk_size)
+
+
+def iter_text_chunks(content, chunk_size=64 * 1024):
+    """Bellekteki metni iter_file_chunks ile aynı sınırlara sahip parçalara böler."""
+    yield from _iter_chunks(io.BytesIO(content.encode('utf-8')), 0, None, chunk_size)
+
+
+def _iter_chunks(f, offset, length, chunk_size):
+    if offset > 0:
+        f.seek(offset)
+        head = f.read(3)
+        shift = len(head) - len(head.lstrip(_UTF8_CONTINUATION))
+        offset += shift
+        if length is not None:
+            # Kaydırılan baytlar aralıktan düşülür; aralığın sonu yerinde kalır
+            length = max(0, length - shift)
+    f.seek(offset)
+
+    remaining = length
+    position = offset
+    pending = b""
+    while True:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        data = f.read(size) if size > 0 else b""
+        at_eof = len(data) < size
+        if remaining is not None:
+            remaining -= len(data)
+        done = at_eof or remaining == 0
+        data = pending + data
+        if done:
+            if not at_eof:
+                # İstenen aralık bir karakterin ortasında bitiyorsa o karakter tamamlanır
+                tail = f.read(3)
+                data += tail[:len(tail) - len(tail.lstrip(_UTF8_CONTINUATION))]
+            cut = len(data)
+        else:
+            cut = _utf8_complete_length(data)
+        if cut:
+            yield position, cut, data[:cut].decode('utf-8')
+        if done:
+            return
+        position += cut
+        pending = data[cut:]
+
+
+class _ContentEntry:
+    """Önbellekteki tek bir dosya: içerik, sürüm ve bu içerikten üretilmiş kodlanmış yanıtlar."""
+
+    def __init__(self, signature, content, version):
+        self.signature = signature
+        self.content = content
+        self.version = version
+        self.encoded = {}
+        self.nbytes = signature[1]
+        self.cached = False
+        # Aynı yanıtın eşzamanlı isteklerde birden fazla kez kodlanmasını önler
+        self.encode_lock = threading.Lock()
+
+
+class ContentCache:
+    """
+    Sık açılan dosyaların içeriğini ve kodlanmış yanıtlarını bellekte tutan LRU önbellek.
+
+    Her istekte dosya yalnızca stat ile kontrol edilir; mtime veya boyut değiştiyse içerik
+    yeniden okunur. Aynı dosyayı aynı anda isteyen bağlantılar tek bir disk okumasını bekler.
+    Toplam boyut bütçeyi aştığında en uzun süredir kullanılmayan dosyalar çıkarılır.
+    """
+
+    def __init__(self, max_bytes=CONTENT_CACHE_BYTES):
+        """
+        Args:
+            max_bytes (int): Önbelleğin bellek bütçesi (bayt); 0 ise önbellek kapalıdır
+        """
+        self.max_bytes = max_bytes
+        # Bütçenin tamamını tek bir dosyanın doldurmaması için dosya başına sınır
+        self.max_entry_bytes = max_bytes // 4
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries = OrderedDict()  # (base_dir, rel_path) -> _ContentEntry
+        self._loading = {}  # (base_dir, rel_path) -> threading.Event
+        self._lock = threading.Lock()
+
+    def get(self, base_dir, rel_path):
+        """
+        Dosya içeriğini önbellekten veya diskten döner.
+
+        Returns:
+            tuple: (içerik, sürüm, None) veya (None, None, hata mesajı)
+        """
+        entry, error = self._lookup(base_dir, rel_path)
+        if error:
+            return None, None, error
+        return entry.content, entry.version, None
+
+    def get_encoded(self, base_dir, rel_path, variant, encoder):
+        """
+        Dosya içeriğinden üretilmiş gönderime hazır yanıtı döner.
+        İçerik değişmediği sürece encoder her variant için bir kez çağrılır.
+
+        Args:
+            base_dir (str): Paylaşılan klasör
+            rel_path (str): Dosyanın göreli yolu
+            variant (hashable): Kodlama türünü ayırt eden anahtar
+            encoder (callable): encoder(content, version) -> bytes veya bytes listesi
+
+        Returns:
+            tuple: (sürüm, kodlanmış yanıt, None) veya (None, None, hata mesajı)
+        """
+        entry, error = self._lookup(base_dir, rel_path)
+        if error:
+            return None, None, error
+        with entry.encode_lock:
+            encoded = entry.encoded.get(variant)
+            if encoded is None:
+                encoded = encoder(entry.content, entry.version)
+                with self._lock:
+                    if entry.cached:
+                        entry.encoded[variant] = encoded
+                        size = len(encoded) if isinstance(encoded, bytes) else sum(len(part) for part in encoded)
+                        entry.nbytes += size
+                        self._size += size
+                        self._evict()
+        return entry.version, encoded, None
+
+    def invalidate(self, rel_paths=None):
+        """Verilen göreli yollara ait kayıtları, rel_paths None ise tüm önbelleği temizler."""
+        with self._lock:
+            if rel_paths is None:
+                keys = list(self._entries)
+            else:
+                rel_paths = set(rel_paths)
+                keys = [key for key in self._entries if key[1] in rel_paths]
+            for key in keys:
+                self._remove(key)
+
+    def stats(self):
+        """İsabet/ıska sayaçlarını ve doluluk bilgisini döner."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._size}
+
+    def _lookup(self, base_dir, rel_path):
+        full_path, error = check_readable_file(base_dir, rel_path)
+        if error:
+            return None, error
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return None, "Dosya bulunamadı"
+        signature = (st.st_mtime_ns, st.st_size)
+        key = (base_dir, rel_path)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.signature == signature:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry, None
+                loading = self._loading.get(key)
+                if loading is None:
+                    if entry is not None:
+                        self._remove(key)
+                    self.misses += 1
+                    loading = self._loading[key] = threading.Event()
+                    break
+            # Aynı dosyayı başka bir thread okuyor, sonucunu bekle
+            loading.wait()
+
+        try:
+            # İçerik stat'tan sonra okunur; arada değişen dosya bir sonraki istekte yeniden okunur.
+            # Satır sonları çevrilmez; parça konumları ve boyut diskteki baytlarla aynı kalmalı
+            with open(full_path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+            logger.info(f"Dosya okundu (önbelleğe alınıyor): {rel_path} ({st.st_size} byte)")
+            entry = _ContentEntry(signature, content, _format_version(st))
+            with self._lock:
+                if entry.nbytes <= self.max_entry_bytes:
+                    entry.cached = True
+                    self._entries[key] = entry
+                    self._size += entry.nbytes
+                    self._evict()
+            return entry, None
+        except Exception as e:
+            logger.error(f"Dosya okuma hatası: {str(e)}")
+            return None, f"Dosya okuma hatası: {str(e)}"
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        entry.cached = False
+        self._size -= entry.nbytes
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
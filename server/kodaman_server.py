@@ -34,6 +34,23 @@ class ServerControlWindow(QMainWindow):
         # Sunucu host ve port bilgilerini ayarlardan yükle
         server.HOST = self.settings_manager.get_setting("host", "0.0.0.0")
         server.PORT = self.settings_manager.get_setting("port", 9009)
+        server.WATCH_CHANGES = self.settings_manager.get_setting("watch_changes", True)
+        server.WATCH_POLL_INTERVAL = self.settings_manager.get_setting("watch_poll_interval", 1.0)
+        server.ENGINE = self.settings_manager.get_setting("engine", "threaded")
+        server.ASYNC_WORKERS = self.settings_manager.get_setting("async_workers", 8)
+        server.IO_WORKERS = self.settings_manager.get_setting("io_workers", 4)
+        server.MAX_PENDING_REQUESTS = self.settings_manager.get_setting("max_pending_requests", 64)
+        server.MAX_REQUESTS_PER_CLIENT = self.settings_manager.get_setting("max_requests_per_client", 4)
+        server.SCAN_WORKERS = self.settings_manager.get_setting("scan_workers", 1)
+        if self.settings_manager.get_setting("tree_index", True):
+            # Ağaç indeksi ayar dosyasının yanında tutulur
+            settings_dir = os.path.dirname(os.path.abspath(self.settings_manager.settings_file))
+            server.TREE_INDEX_FILE = os.path.join(settings_dir, "tree_index.json")
+        else:
+            server.TREE_INDEX_FILE = None
+        server.SEARCH_INDEX = self.settings_manager.get_setting("search_index", True)
+        server.CONTENT_CACHE_MB = self.settings_manager.get_setting("content_cache_mb", 64)
+        server.COMPRESSION = self.settings_manager.get_setting("compression", True)
 
         self.server_thread = None
         self.server_running = False
@@ -436,8 +453,8 @@ class ServerControlWindow(QMainWindow):
             server.stop_server()
             self.server_running = False
 
-        # Tüm ayarları son kez kaydet
-        self.settings_manager.save_settings({
+        # Tüm ayarları son kez kaydet (GUI'de düzenlenmeyen ayarlar korunur)
+        self.settings_manager.update_settings({
             "base_dir": self.base_dir,
             "host": server.HOST,
             "port": server.PORT,
@@ -0,0 +1,98 @@
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Logger oluştur
+logger = logging.getLogger('FileServer.Scheduler')
+
+# Disk okumalarını yapan thread sayısı
+IO_WORKERS = 4
+# Tüm istemciler için bekleyen + çalışan en fazla iş sayısı
+MAX_PENDING = 64
+# Tek bir istemcinin aynı anda bekleyen + çalışan en fazla iş sayısı
+MAX_PER_CLIENT = 4
+
+
+class RequestScheduler:
+    """
+    Disk okuması gerektiren istekleri sınırlı boyutlu bir thread havuzunda çalıştırır.
+
+    Kuyruk derinliği hem toplamda hem istemci başına sınırlıdır; sınır aşıldığında
+    iş kabul edilmez ve çağıran taraf istemciye 'busy' yanıtı gönderir. Böylece ani
+    yüklerde bellek kullanımı sınırlı kalır ve tek bir istemci diğerlerini bekletemez.
+    """
+
+    def __init__(self, max_workers=IO_WORKERS, max_pending=MAX_PENDING, max_per_client=MAX_PER_CLIENT):
+        """
+        Args:
+            max_workers (int): Havuzdaki thread sayısı
+            max_pending (int): Toplam kuyruk sınırı
+            max_per_client (int): İstemci başına kuyruk sınırı
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_per_client = max_per_client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FileServerIO")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._per_client = {}
+        self.rejected = 0
+
+    def submit(self, client_key, func, *args):
+        """
+        İşi kuyruğa ekler.
+
+        Args:
+            client_key (hashable): İsteği yapan istemci (ör. adres)
+            func (callable): Havuzda çalıştırılacak fonksiyon
+            *args: Fonksiyon argümanları
+
+        Returns:
+            bool: İş kabul edildiyse True, kuyruk doluysa False
+        """
+        with self._lock:
+            client_pending = self._per_client.get(client_key, 0)
+            if self._pending >= self.max_pending or client_pending >= self.max_per_client:
+                self.rejected += 1
+                logger.warning(f"İstek reddedildi (yoğunluk): {client_key} - "
+                               f"toplam {self._pending}/{self.max_pending}, "
+                               f"istemci {client_pending}/{self.max_per_client}")
+                return False
+            self._pending += 1
+            self._per_client[client_key] = client_pending + 1
+
+        try:
+            self._executor.submit(self._run, client_key, func, args)
+        except RuntimeError:
+            # Havuz kapatıldı
+            self._release(client_key)
+            return False
+        return True
+
+    def pending(self, client_key=None):
+        """Bekleyen + çalışan iş sayısını döner; client_key verilirse yalnızca o istemcinin."""
+        with self._lock:
+            if client_key is None:
+                return self._pending
+            return self._per_client.get(client_key, 0)
+
+    def shutdown(self):
+        """Yeni iş kabul etmeyi bırakır; kuyruktaki işler beklenmez."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, client_key, func, args):
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"İş hatası: {client_key} - {str(e)}")
+        finally:
+            self._release(client_key)
+
+    def _release(self, client_key):
+        with self._lock:
+            self._pending -= 1
+            remaining = self._per_client.get(client_key, 0) - 1
+            if remaining > 0:
+                self._per_client[client_key] = remaining
+            else:
+                self._per_client.pop(client_key, None)
@@ -0,0 +1,397 @@
+import os
+import re
+import time
+import heapq
+import threading
+import logging
+
+# Logger oluştur
+logger = logging.getLogger('FileServer.Search')
+
+# Bu boyuttan büyük dosyalar indekslenmez (bayt)
+MAX_FILE_BYTES = 1024 * 1024
+# İkili dosya kontrolü için okunan baş kısım (bayt)
+BINARY_CHECK_BYTES = 8192
+# İzleyici yokken dosya değişikliklerinin kontrol edilmesi arasındaki en kısa süre (saniye)
+REFRESH_INTERVAL = 2.0
+# Sonuçlarda gösterilen satır parçasının en fazla uzunluğu (karakter)
+SNIPPET_LENGTH = 160
+
+# find_path eşleştirme türleri
+PATH_MATCH_PREFIX = "prefix"
+PATH_MATCH_SUBSTRING = "substring"
+PATH_MATCH_FUZZY = "fuzzy"
+PATH_MATCH_MODES = (PATH_MATCH_PREFIX, PATH_MATCH_SUBSTRING, PATH_MATCH_FUZZY)
+
+
+# Trigram'lar yalnızca kelimelerin (harf, rakam ve alt çizgi dizileri) içinden alınır
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+def _trigrams(text):
+    """
+    Küçük harfe çevrilmiş metindeki kelimelerin içindeki üçlü karakter dizilerini döner.
+    Sorgudaki her kelime, eşleşen satırda dosyanın tek bir kelimesinin parçası olduğundan
+    kelime içi trigram'lar aday dosyaları bulmaya yeter; tüm metnin trigram'larına göre
+    çok daha az bellek kullanır ve daha hızlı çıkarılır.
+    """
+    words = set(_WORD_RE.findall(text))
+    return {word[i:i + 3] for word in words for i in range(len(word) - 2)}
+
+
+def is_searchable(query):
+    """Sorgu indeksle aranabiliyorsa (en az üç harflik bir kelime içeriyorsa) True."""
+    return bool(_trigrams(query.lower()))
+
+
+def _find_lower(line, needle):
+    """
+    Küçük harfli needle'ın satırdaki ilk eşleşmesini büyük/küçük harf duyarsız bulur.
+    Bazı harfler küçültülünce uzadığından (ör. 'İ' -> 'i̇') konum orijinal satıra çevrilir.
+
+    Returns:
+        tuple: Orijinal satırdaki (sütun, uzunluk); eşleşme yoksa None
+    """
+    lowered = line.lower()
+    index = lowered.find(needle)
+    if index < 0:
+        return None
+    if len(lowered) == len(line):
+        return index, len(needle)
+    start = None
+    position = 0
+    for column, char in enumerate(line):
+        position += len(char.lower())
+        if start is None and index < position:
+            start = column
+        if position >= index + len(needle):
+            return start, column + 1 - start
+    return start, len(line) - start
+
+
+def _iter_tree_files(node, prefix=""):
+    """Ağaç formatındaki düğümdeki tüm dosyaların '/' ile ayrılmış göreli yollarını üretir."""
+    for name in node["files"]:
+        yield prefix + name
+    for name, child in node["children"].items():
+        yield from _iter_tree_files(child, f"{prefix}{name}/")
+
+
+def _signature(full_path):
+    st = os.stat(full_path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_text(full_path):
+    """
+    Dosyayı metin olarak okur.
+
+    Returns:
+        str: İçerik; dosya çok büyük, ikili veya UTF-8 değilse None
+    """
+    with open(full_path, 'rb') as f:
+        data = f.read(MAX_FILE_BYTES + 1)
+    if len(data) > MAX_FILE_BYTES or b"\0" in data[:BINARY_CHECK_BYTES]:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _snippet(line, column, length):
+    """Eşleşmeyi içeren satırı kısaltır; eşleşme parçanın ortasına yakın kalır."""
+    line = line.rstrip("\r\n")
+    if len(line) <= SNIPPET_LENGTH:
+        return line.strip()
+    start = max(0, min(column - (SNIPPET_LENGTH - length) // 2, len(line) - SNIPPET_LENGTH))
+    text = line[start:start + SNIPPET_LENGTH].strip()
+    if start > 0:
+        text = "…" + text
+    if start + SNIPPET_LENGTH < len(line):
+        text = text + "…"
+    return text
+
+
+class _IndexedFile:
+    """İndekslenmiş tek bir dosya."""
+
+    __slots__ = ("file_id", "signature", "trigrams")
+
+    def __init__(self, file_id, signature, trigrams):
+        self.file_id = file_id
+        self.signature = signature
+        # Dosya indekslenemediyse (ikili, çok büyük, okunamadı) boş küme
+        self.trigrams = trigrams
+
+
+class SearchIndex:
+    """
+    Paylaşılan klasördeki metin dosyaları için üçlü karakter (trigram) tabanlı ters indeks.
+
+    Her dosyanın küçük harfli içeriğindeki kelime trigram'ları indekste tutulur. Arama, sorgunun
+    trigram'larını içeren dosyaları kesişimle bulur ve yalnızca bu aday dosyaları satır
+    satır okuyarak satır numarası ve parçayı döner. Arama büyük/küçük harf duyarsızdır.
+
+    İndekslenen dosya listesi ağaç önbelleğinden alınır (sync); ağaç sürümü değiştikçe
+    yalnızca eklenen ve silinen dosyalar işlenir. İçeriği değişen dosyalar mark_stale
+    ile bildirilir ya da izleyici yoksa refresh ile mtime/boyut karşılaştırılarak bulunur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # sync ve refresh aynı anda tek bir thread'de çalışır; aramalar beklemez
+        self._update_lock = threading.Lock()
+        self._base_dir = None
+        self._tree_version = None
+        self._files = {}      # göreli yol -> _IndexedFile
+        self._paths = {}      # dosya numarası -> göreli yol
+        self._postings = {}   # trigram -> dosya numaraları kümesi
+        self._next_id = 0
+        self._stale = set()
+        self._refreshed_at = 0.0
+
+    def sync(self, base_dir, tree, version):
+        """
+        İndeksi ağaçtaki dosya listesiyle eşitler.
+
+        Args:
+            base_dir (str): Normalize edilmiş paylaşım klasörü
+            tree (dict): Ağaç önbelleğindeki ağaç
+            version (str): Ağacın sürüm etiketi; son eşitlemeyle aynıysa hiçbir şey yapılmaz
+        """
+        with self._update_lock:
+            with self._lock:
+                if base_dir != self._base_dir:
+                    self._clear()
+                    self._base_dir = base_dir
+                elif version == self._tree_version and not self._stale:
+                    return
+                stale, self._stale = self._stale, set()
+
+            started = time.monotonic()
+            current = set(_iter_tree_files(tree))
+            removed = self._files.keys() - current
+            added = current - self._files.keys()
+            with self._lock:
+                for rel_path in removed:
+                    self._remove(rel_path)
+            for rel_path in sorted(added | (stale & current)):
+                self._index_file(base_dir, rel_path)
+            self._tree_version = version
+
+            if added or removed or stale:
+                logger.info(f"Arama indeksi güncellendi: {len(added)} eklendi, {len(removed)} silindi, "
+                            f"{len(stale & current)} yeniden okundu - {len(self._files)} dosya, "
+                            f"{len(self._postings)} trigram, {time.monotonic() - started:.3f} sn")
+
+    def mark_stale(self, rel_paths):
+        """İçeriği değişen dosyaları işaretler; bir sonraki sync'te yeniden okunurlar."""
+        with self._lock:
+            self._stale.update(rel_paths)
+
+    def refresh(self, base_dir):
+        """
+        İndekslenmiş dosyaların mtime/boyutunu diskle karşılaştırıp değişenleri işaretler.
+        Değişiklik izleyici yokken kullanılır; REFRESH_INTERVAL'den sık çalışmaz.
+        """
+        with self._update_lock:
+            now = time.monotonic()
+            if base_dir != self._base_dir or now - self._refreshed_at < REFRESH_INTERVAL:
+                return
+            self._refreshed_at = now
+            changed = []
+            for rel_path, indexed in list(self._files.items()):
+                try:
+                    signature = _signature(os.path.join(base_dir, rel_path))
+                except OSError:
+                    signature = None
+                if signature != indexed.signature:
+                    changed.append(rel_path)
+        if changed:
+            self.mark_stale(changed)
+
+    def invalidate(self):
+        """İndeksi temizler; bir sonraki sync tüm dosyaları yeniden okur."""
+        with self._lock:
+            self._clear()
+        logger.info("Arama indeksi temizlendi")
+
+    def search(self, base_dir, query, limit):
+        """
+        Sorguyu içeren satırları bulur.
+
+        Args:
+            base_dir (str): Normalize edilmiş paylaşım klasörü
+            query (str): Aranacak metin (büyük/küçük harf duyarsız)
+            limit (int): En fazla sonuç sayısı
+
+        Returns:
+            tuple: ([{"path", "line", "column", "snippet"}, ...], sonuçlar sınırda kesildiyse True)
+                   Sorgu aranabilir değilse (bkz. is_searchable) sonuç dönmez.
+        """
+        needle = query.lower()
+        grams = _trigrams(needle)
+        if not grams:
+            # Aday dosya bulunamaz; tüm dosyaları diskten okumak yerine sorgu reddedilir
+            return [], False
+        with self._lock:
+            postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            paths = sorted(self._paths[file_id] for file_id in candidates)
+
+        results = []
+        for rel_path in paths:
+            try:
+                content = _read_text(os.path.join(base_dir, rel_path))
+            except OSError:
+                continue
+            if content is None:
+                continue
+            for line_no, line in enumerate(content.splitlines(), 1):
+                match = _find_lower(line, needle)
+                if match is None:
+                    continue
+                if len(results) >= limit:
+                    return results, True
+                column, length = match
+                results.append({"path": rel_path, "line": line_no, "column": column,
+                                "snippet": _snippet(line, column, length)})
+        return results, False
+
+    def stats(self):
+        """İndeks istatistiklerini döner."""
+        with self._lock:
+            indexed = sum(1 for entry in self._files.values() if entry.trigrams)
+            return {"files": len(self._files), "indexed": indexed, "trigrams": len(self._postings)}
+
+    def _index_file(self, base_dir, rel_path):
+        """Dosyayı okuyup trigram'larını indekse ekler; eski kaydı varsa yerine geçer."""
+        full_path = os.path.join(base_dir, rel_path)
+        trigrams = frozenset()
+        signature = None
+        try:
+            signature = _signature(full_path)
+            content = _read_text(full_path)
+            if content is not None:
+                trigrams = frozenset(_trigrams(content.lower()))
+        except OSError as e:
+            logger.debug(f"Dosya indekslenemedi: {rel_path} - {e}")
+
+        with self._lock:
+            self._remove(rel_path)
+            file_id = self._next_id
+            self._next_id += 1
+            self._files[rel_path] = _IndexedFile(file_id, signature, trigrams)
+            self._paths[file_id] = rel_path
+            for gram in trigrams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    self._postings[gram] = {file_id}
+                else:
+                    posting.add(file_id)
+
+    def _remove(self, rel_path):
+        """Dosyayı indeksten çıkarır. Kilit altında çağrılmalıdır."""
+        indexed = self._files.pop(rel_path, None)
+        if indexed is None:
+            return
+        del self._paths[indexed.file_id]
+        for gram in indexed.trigrams:
+            posting = self._postings[gram]
+            posting.discard(indexed.file_id)
+            if not posting:
+                del self._postings[gram]
+
+    def _clear(self):
+        self._base_dir = None
+        self._tree_version = None
+        self._files = {}
+        self._paths = {}
+        self._postings = {}
+        self._stale = set()
+
+
+class PathIndex:
+    """
+    Dosya yolları için bellek içi indeks (find_path komutu).
+
+    Yollar ağaç önbelleğinden alınır ve ağaç sürümü değiştiğinde yeniden oluşturulur.
+    Eşleşmeler dosya adına göre öne çıkarılır: tam ad, ad başlangıcı, yol başlangıcı,
+    adda geçen, yolda geçen ve son olarak sırası korunmuş harflerle (fuzzy) eşleşen yollar.
+    Aynı gruptaki yollar eşleşmenin sıkılığına ve yol uzunluğuna göre sıralanır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._base_dir = None
+        self._tree_version = None
+        # (küçük harfli yol, küçük harfli dosya adı, yol)
+        self._entries = []
+
+    def sync(self, base_dir, tree, version):
+        """İndeksi ağaçtaki dosya listesiyle eşitler; ağaç sürümü değişmediyse hiçbir şey yapmaz."""
+        with self._lock:
+            if base_dir == self._base_dir and version == self._tree_version:
+                return
+            entries = []
+            for path in _iter_tree_files(tree):
+                lower = path.lower()
+                entries.append((lower, lower.rpartition("/")[2], path))
+            self._entries = entries
+            self._base_dir = base_dir
+            self._tree_version = version
+            logger.debug(f"Yol indeksi güncellendi: {len(entries)} dosya")
+
+    def invalidate(self):
+        """İndeksi temizler; bir sonraki sync yeniden oluşturur."""
+        with self._lock:
+            self._base_dir = None
+            self._tree_version = None
+            self._entries = []
+
+    def find(self, query, limit, mode=PATH_MATCH_FUZZY):
+        """
+        Sorguyla eşleşen dosya yollarını en iyi eşleşme önce olacak şekilde döner.
+
+        Args:
+            query (str): Dosya adı veya yolunun bir kısmı (büyük/küçük harf duyarsız)
+            limit (int): En fazla sonuç sayısı
+            mode (str): "prefix", "substring" veya "fuzzy" (hepsini kapsar)
+
+        Returns:
+            list: Göreli yollar
+        """
+        needle = query.lower()
+        fuzzy = None
+        if mode == PATH_MATCH_FUZZY:
+            # "abc" -> a[^b]*b[^c]*c: geri izleme yapmadan harfleri sırayla, en yakın konumda eşleştirir
+            fuzzy = re.compile("".join(f"{re.escape(char)}[^{re.escape(following)}]*"
+                                       for char, following in zip(needle, needle[1:])) + re.escape(needle[-1]))
+        with self._lock:
+            entries = self._entries
+
+        def ranked():
+            for lower, name, path in entries:
+                if name.startswith(needle):
+                    rank = (0 if name == needle else 1, len(name))
+                elif lower.startswith(needle):
+                    rank = (2, 0)
+                elif mode == PATH_MATCH_PREFIX:
+                    continue
+                elif needle in name:
+                    rank = (3, name.index(needle))
+                elif needle in lower:
+                    rank = (4, 0)
+                elif fuzzy is None:
+                    continue
+                else:
+                    match = fuzzy.search(lower)
+                    if match is None:
+                        continue
+                    # Harfler birbirine ne kadar yakınsa eşleşme o kadar iyi
+                    rank = (5, match.end() - match.start())
+                yield rank[0], rank[1], len(path), path
+
+        return [item[3] for item in heapq.nsmallest(limit, ranked())]
+
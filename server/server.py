@@ -3,10 +3,15 @@ import threading
 import logging
 import os
 import sys
+import time
 
 # Modül yolunu ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from .file_browser import build_tree, read_file, is_safe_path, set_excluded_directories, set_excluded_extensions, set_allowed_extensions
+from .file_browser import ContentCache, list_directory, check_readable_file, iter_file_chunks, iter_text_chunks, get_file_version, is_safe_path, is_allowed_file, set_excluded_directories, set_excluded_extensions, set_allowed_extensions
+from .tree_cache import TreeCache
+from .watcher import ChangeWatcher
+from .scheduler import RequestScheduler
+from .search_index import SearchIndex, PathIndex, PATH_MATCH_MODES, is_searchable
 from shared import protocol
 
 # Logging ayarları
@@ -28,143 +33,663 @@ BASE_DIR = '/Users/emin/PycharmProjects/Kodaman2/'  # Bu yol GUI ile secilebilir
 # Başlangıçta base_dir'i normalize et
 BASE_DIR = os.path.normpath(os.path.realpath(os.path.abspath(BASE_DIR)))
 
+# Değişiklik izleyici ayarları (GUI server_settings.json'dan günceller)
+WATCH_CHANGES = True
+WATCH_POLL_INTERVAL = 1.0
+
+# Sunucu motoru: "threaded" (bağlantı başına thread) veya "asyncio" (tek olay döngüsü + iş parçacığı havuzu)
+ENGINE = "threaded"
+# asyncio motorunda mesajları işleyen en fazla thread sayısı
+ASYNC_WORKERS = 8
+
+# Dosya okuma kuyruğu: thread sayısı, toplam ve istemci başına bekleyen istek sınırı
+IO_WORKERS = 4
+MAX_PENDING_REQUESTS = 64
+MAX_REQUESTS_PER_CLIENT = 4
+# Paylaşılan klasör taranırken aynı anda listelenecek klasör sayısı; 1 sıralı tarama,
+# ağ sürücüsü veya yavaş USB bellekler için 4-8 önerilir
+SCAN_WORKERS = 1
+# Ağacın sunucu yeniden başlatıldığında taranmadan yüklenmesi için kaydedildiği dosya (None: kaydedilmez)
+TREE_INDEX_FILE = None
+# Metin dosyalarında arama için ters indeks tutulsun mu
+SEARCH_INDEX = True
+# search isteklerinde izin verilen en büyük sonuç sayısı ve sorgu uzunluğu sınırları
+MAX_SEARCH_RESULTS = 500
+MIN_SEARCH_LENGTH = 3
+MAX_SEARCH_LENGTH = 200
+# find_path isteklerinde izin verilen en büyük sonuç sayısı
+MAX_PATH_MATCHES = 200
+# Çerçeveli bağlantılarda istemciyle sıkıştırma anlaşması yapılsın mı
+COMPRESSION = True
+# list_dir isteklerinde izin verilen en büyük derinlik
+MAX_LIST_DEPTH = 8
+# Dosya içerik önbelleğinin bellek bütçesi (MB)
+CONTENT_CACHE_MB = 64
+# Yoğunluk yanıtında istemciye önerilen bekleme süresi (saniye)
+BUSY_RETRY_AFTER = 0.5
+
 running = None
 # Aktif giriş yapan kullanıcıları tutar: addr -> name
 active_users = {}
+# Açık bağlantıları tutar: addr -> ClientSession
+active_sessions = {}
+# Tüm bağlantılar arasında paylaşılan dosya ağacı önbelleği
+tree_cache = TreeCache()
+# Metin dosyalarındaki trigram'ların ters indeksi (search komutu)
+search_index = SearchIndex()
+# Dosya yolları indeksi (find_path komutu)
+path_index = PathIndex()
+# Sık açılan dosyaların içerik ve yanıt önbelleği
+content_cache = ContentCache(CONTENT_CACHE_MB * 1024 * 1024)
+# Çalışan değişiklik izleyici (yoksa None)
+watcher = None
+# Çalışan asyncio sunucu motoru (yoksa None)
+_async_engine = None
+# Dosya okumalarını sıraya koyan zamanlayıcı (sunucu çalışmıyorsa None)
+scheduler = None
+
+
+class ClientSession:
+    """
+    Tek bir istemci bağlantısı.
+    Bağlantı thread'i ve değişiklik bildirimleri aynı sokete yazdığı için gönderimler kilitle sıralanır.
+    """
+
+    def __init__(self, conn, addr):
+        self.conn = conn
+        self.addr = addr
+        # İstemcinin ilk mesajından algılanan çerçeveleme modu (henüz mesaj gelmediyse None)
+        self.framing = None
+        # login sırasında anlaşılan sıkıştırma yöntemi (yoksa None)
+        self.compression = None
+        # Havuzda bekleyen veya süren kimlikli istekler (iptal edilebilsin diye): kimlik -> RequestReply
+        self.active = {}
+        self._send_lock = threading.Lock()
+
+    def send(self, message, request_id=None):
+        """make_* ile oluşturulmuş mesajı bağlantının çerçeveleme moduna çevirip gönderir."""
+        self.send_raw(protocol.to_wire(message, self.framing, self.compression, request_id))
+
+    def send_raw(self, data):
+        """Gönderime hazır baytları tek parça halinde gönderir."""
+        with self._send_lock:
+            self.conn.sendall(data)
+
+
+class RequestReply:
+    """
+    Tek bir isteğin yanıtlarını bağlantıya gönderir; istek kimlik taşıyorsa her yanıta eklenir.
+    İstekler havuzda birbirinden bağımsız tamamlandığı için yanıtların sırası isteklerin sırası
+    değildir; istemci yanıtları kimlikle eşleştirir. İstemci cancel gönderirse cancelled olur.
+    """
+
+    def __init__(self, session, request_id=None):
+        self.session = session
+        self.addr = session.addr
+        self.request_id = request_id
+        self.cancelled = False
+
+    @property
+    def framing(self):
+        return self.session.framing
+
+    @property
+    def compression(self):
+        return self.session.compression
+
+    def send(self, message):
+        self.session.send(message, self.request_id)
+
+    def send_raw(self, data):
+        """Önceden kodlanmış (paylaşılan) yanıtı kimliği ekleyerek gönderir."""
+        self.session.send_raw(protocol.with_request_id(data, self.session.framing, self.request_id))
+
+
+def broadcast(message):
+    """Mesajı tüm açık bağlantılara gönderir; her çerçeveleme/sıkıştırma türü için bir kez kodlanır."""
+    encoded = {}
+    for session in list(active_sessions.values()):
+        if session.framing is None:
+            # Henüz istek göndermemiş istemcinin modu bilinmiyor
+            continue
+        key = (session.framing, session.compression)
+        data = encoded.get(key)
+        if data is None:
+            data = encoded[key] = protocol.to_wire(message, session.framing, session.compression)
+        try:
+            session.send_raw(data)
+        except OSError as e:
+            logger.debug(f"Bildirim gönderilemedi: {session.addr} - {e}")
+
+
+def _broadcast_tree_changes(changes):
+    """Ağaçta yapılan değişiklikleri istemcilere iletir."""
+    # Silinen dosyalar önbellekte yer tutmasın
+    content_cache.invalidate(change["path"] for change in changes if change["op"] == "remove")
+    if changes:
+        logger.info(f"Ağaç değişiklikleri gönderiliyor: {len(changes)} değişiklik")
+        version = tree_cache.get_version(BASE_DIR)
+        broadcast(protocol.make_tree_delta_message(changes, version=version))
+
+
+def _on_fs_changes(changed_dirs, modified_files, overflow):
+    """Değişiklik izleyiciden gelen bildirimleri ağaca uygular ve istemcilere iletir."""
+    if overflow:
+        tree_cache.invalidate()
+        content_cache.invalidate()
+        search_index.invalidate()
+        # Sonraki değişikliklerin fark olarak gönderilebilmesi için ağaç hemen yeniden taranır
+        tree_cache.get_version(BASE_DIR)
+        broadcast(protocol.make_tree_delta_message([], reset=True))
+    elif changed_dirs:
+        changes = tree_cache.apply_changes(BASE_DIR, changed_dirs)
+        if changes is None:
+            # Ağaç yeni oluşturuldu; istemciler açık klasörleri yeniden listeler
+            broadcast(protocol.make_tree_delta_message([], reset=True))
+        else:
+            _broadcast_tree_changes(changes)
+
+    paths = sorted(path for path in modified_files if is_allowed_file(path))
+    if paths:
+        content_cache.invalidate(paths)
+        search_index.mark_stale(paths)
+        logger.info(f"Dosya değişiklikleri gönderiliyor: {paths[:10]}")
+        broadcast(protocol.make_file_changed_message(paths))
+
+
+def _start_watcher():
+    global watcher
+    if not WATCH_CHANGES:
+        return
+    watcher = ChangeWatcher(BASE_DIR, _on_fs_changes, poll_interval=WATCH_POLL_INTERVAL)
+    watcher.start()
+    tree_cache.watched = True
+
+
+def _stop_watcher():
+    global watcher
+    if watcher:
+        watcher.stop()
+        watcher = None
+    tree_cache.watched = False
+
+
+def _start_warmup():
+    """
+    Kayıtlı ağacı yükler ve arka planda diskle karşılaştırır; indeks yoksa ağaç arka planda taranır.
+    Arama indeksi de aynı thread'de oluşturulur. İlk get_tree isteği böylece soğuk tarama beklemeden yanıtlanır.
+    İzleyici çalışıyorsa ağaç her durumda oluşturulur; tree_delta farkları ancak ağaç varken üretilebilir.
+    """
+    tree_cache.index_file = TREE_INDEX_FILE
+    loaded = bool(TREE_INDEX_FILE) and tree_cache.load_index(BASE_DIR)
+    if TREE_INDEX_FILE or SEARCH_INDEX or watcher is not None:
+        threading.Thread(target=_warm_caches, args=(loaded,), name="FileServerIndex", daemon=True).start()
+
+
+def _warm_caches(loaded):
+    try:
+        if loaded:
+            # Sunucu kapalıyken yapılan değişiklikler izleyici tarafından görülmedi
+            _broadcast_tree_changes(tree_cache.revalidate(BASE_DIR))
+        else:
+            tree_cache.get_version(BASE_DIR)
+        _save_tree_index()
+        if SEARCH_INDEX:
+            _sync_search_index()
+    except Exception as e:
+        logger.error(f"Ağaç indeksi hazırlanamadı: {e}")
+
+
+def _live_updates():
+    """İstemcilere değişikliklerin bildirileceği (yoklama gerekmediği) söylenebiliyorsa True."""
+    return watcher is not None and tree_cache.has_entry(BASE_DIR)
+
+
+def _save_tree_index():
+    if TREE_INDEX_FILE:
+        tree_cache.save_index(BASE_DIR)
+
+
+def _sync_search_index():
+    """Arama indeksini ağaçtaki dosya listesi ve değişen dosyalarla eşitler."""
+    if watcher is None:
+        # İçerik değişikliklerini bildiren izleyici yok
+        search_index.refresh(BASE_DIR)
+    # Sürüm ağaçtan önce alınır; arada ağaç değişirse bir sonraki eşitleme farkı yakalar
+    version = tree_cache.get_version(BASE_DIR)
+    search_index.sync(BASE_DIR, tree_cache.get_tree(BASE_DIR), version)
+
+
+def _start_scheduler():
+    global scheduler
+    scheduler = RequestScheduler(IO_WORKERS, MAX_PENDING_REQUESTS, MAX_REQUESTS_PER_CLIENT)
+
+
+def _stop_scheduler():
+    global scheduler
+    if scheduler:
+        scheduler.shutdown()
+        scheduler = None
+        logger.info(f"İçerik önbelleği: {content_cache.stats()}")
+
+
+def _send_file(reply, rel_path):
+    """
+    Dosyayı istemciye gönderir. Zamanlayıcının thread havuzunda çalışır.
+    Aynı dosyayı isteyen bağlantılar önbellekteki aynı kodlanmış yanıtı paylaşır.
+    """
+    addr = reply.addr
+    framing, compression = reply.framing, reply.compression
+    try:
+        version, response, error = content_cache.get_encoded(
+            BASE_DIR, rel_path, ("file", framing, compression),
+            lambda content, version: protocol.to_wire(
+                protocol.make_file_response(rel_path, content, version), framing, compression))
+        if error:
+            logger.warning(f"Dosya okuma hatası: {error} - {addr}")
+            reply.send(protocol.make_error_response(error))
+        else:
+            logger.info(f"Dosya gönderildi: {rel_path} - {addr}")
+            reply.send_raw(response)
+    except OSError as e:
+        # Bağlantı okuma sırasında kapandıysa gönderim de başarısız olur
+        logger.debug(f"Dosya gönderilemedi: {rel_path} - {addr} - {e}")
+    except Exception as e:
+        error_msg = f"Dosya okuma hatası: {str(e)}"
+        logger.error(f"{error_msg} - {addr}")
+        reply.send(protocol.make_error_response(error_msg))
+
+
+def _chunk_messages(rel_path, chunks, offset, total_size, version):
+    """Parçalardan file_chunk mesajları üretir; son parçayı işaretleyebilmek için bir parça geriden gelir."""
+    previous = None
+    for chunk in chunks:
+        if previous:
+            chunk_offset, chunk_length, content = previous
+            yield protocol.make_file_chunk_response(rel_path, chunk_offset, chunk_length, total_size, content, False, version)
+        previous = chunk
+    if previous:
+        chunk_offset, chunk_length, content = previous
+        yield protocol.make_file_chunk_response(rel_path, chunk_offset, chunk_length, total_size, content, True, version)
+    else:
+        # Boş dosya veya dosya sonunun ötesinde bir aralık
+        yield protocol.make_file_chunk_response(rel_path, min(offset, total_size), 0, total_size, "", True, version)
+
+
+def _send_file_range(reply, rel_path, offset, length, version):
+    """
+    Dosyanın istenen aralığını file_chunk mesajları halinde gönderir. Zamanlayıcının thread havuzunda çalışır.
+    Önbelleğe sığan dosyaların tamamı istendiğinde önceden kodlanmış parçalar gönderilir,
+    diğer durumlarda dosya belleğe tamamen alınmadan okunur.
+    """
+    addr = reply.addr
+    framing, compression = reply.framing, reply.compression
+    full_path, error = check_readable_file(BASE_DIR, rel_path)
+    if error:
+        reply.send(protocol.make_error_response(error))
+        return
+    try:
+        total_size = os.path.getsize(full_path)
+        # İstemci tamamını veya dosyadan uzun bir aralığı istediyse dosyanın tamamı gönderilir
+        if offset == 0 and (length is None or length >= total_size) and total_size <= content_cache.max_entry_bytes:
+            version, frames, error = content_cache.get_encoded(
+                BASE_DIR, rel_path, ("chunks", framing, compression),
+                lambda content, version: [
+                    protocol.to_wire(message, framing, compression) for message in _chunk_messages(
+                        rel_path, iter_text_chunks(content, protocol.FILE_CHUNK_SIZE), 0,
+                        len(content.encode("utf-8")), version)])
+            if error:
+                reply.send(protocol.make_error_response(error))
+                return
+            sent = 0
+            for frame in frames:
+                if reply.cancelled:
+                    break
+                reply.send_raw(frame)
+                sent += 1
+        else:
+            sent = 0
+            chunks = iter_file_chunks(full_path, offset, length, protocol.FILE_CHUNK_SIZE)
+            for message in _chunk_messages(rel_path, chunks, offset, total_size, version):
+                if reply.cancelled:
+                    break
+                reply.send(message)
+                sent += 1
+        if reply.cancelled:
+            logger.info(f"Dosya akışı iptal edildi: {rel_path} [{offset}+{length}] {sent} parça - {addr}")
+            return
+        logger.info(f"Dosya akışı gönderildi: {rel_path} [{offset}+{length}] {sent} parça - {addr}")
+    except UnicodeDecodeError as e:
+        error_msg = f"Dosya okuma hatası: {str(e)}"
+        logger.error(f"{error_msg} - {addr}")
+        reply.send(protocol.make_error_response(error_msg))
+    except OSError as e:
+        # Bağlantı kapandıysa akış yarıda bırakılır
+        logger.debug(f"Dosya akışı kesildi: {rel_path} - {addr} - {e}")
+
+
+def _send_search(reply, query, limit):
+    """Arama yapıp sonuçları gönderir. Zamanlayıcının thread havuzunda çalışır."""
+    addr = reply.addr
+    try:
+        _sync_search_index()
+        started = time.monotonic()
+        results, truncated = search_index.search(BASE_DIR, query, limit)
+        reply.send(protocol.make_search_response(query, results, truncated))
+        logger.info(f"Arama sonuçları gönderildi: '{query}' {len(results)} sonuç, "
+                    f"{(time.monotonic() - started) * 1000:.1f} ms - {addr}")
+    except OSError as e:
+        logger.debug(f"Arama sonuçları gönderilemedi: '{query}' - {addr} - {e}")
+
+
+def _schedule(reply, command, func, *args, path=None):
+    """
+    Disk okuması gerektiren isteği zamanlayıcının thread havuzuna verir; kuyruk doluysa
+    busy yanıtı gönderilir. Kimlikli istekler bitene kadar bağlantıda kayıtlı tutulur
+    ki istemci cancel ile iptal edebilsin.
+    """
+    if scheduler is None:
+        func(reply, *args)
+        return
+    if reply.request_id is not None:
+        reply.session.active[reply.request_id] = reply
+    if not scheduler.submit(reply.addr, _run_request, reply, func, args):
+        _release_request(reply)
+        reply.send(protocol.make_busy_response(command, BUSY_RETRY_AFTER, path))
+
+
+def _run_request(reply, func, args):
+    try:
+        if reply.cancelled:
+            # İstemci sırası gelmeden vazgeçti
+            logger.debug(f"İptal edilen istek atlandı: {reply.request_id} - {reply.addr}")
+            return
+        func(reply, *args)
+    finally:
+        _release_request(reply)
+
+
+def _release_request(reply):
+    if reply.request_id is not None and reply.session.active.get(reply.request_id) is reply:
+        del reply.session.active[reply.request_id]
+
+
+def process_message(session, message, request_id=None):
+    """
+    İstemciden gelen tek bir mesajı işler ve yanıtını session üzerinden gönderir.
+    Thread'li ve asyncio sunucu motorları bu fonksiyonu ortak kullanır.
+    request_id: Çerçeve başlığındaki istek kimliği; satır sonlu modda mesajın "id" alanından okunur.
+    """
+    addr = session.addr
+    reply = RequestReply(session, request_id)
+    
+    # Mesajı parse et
+    try:
+        msg = protocol.parse_message(message)
+        if not msg:
+            logger.warning(f"Geçersiz mesaj formatı: {message[:50]}...")
+            return
+        if request_id is None and isinstance(msg, dict):
+            reply.request_id = protocol.valid_request_id(msg.get("id"))
+
+        logger.info(f"Mesaj alındı: {addr} - {msg.get('command', 'bilinmeyen komut')}")
+        logger.debug(f"Mesaj detayları: {msg}")
+
+        # Komutları işle
+        # Kullanıcı listesini döndür
+        if msg.get("command") == "get_users":
+            """
+            İstemciden aktif kullanıcı listesini isteyen komutu işler.
+            """
+            # Sadece aktif kullanıcı adlarını döndür
+            users = list(active_users.values())
+            response = protocol.make_users_response(users)
+            reply.send(response)
+            logger.info(f"Kullanıcı listesi gönderildi: {addr}")
+        elif msg.get("command") == "login":
+            name = msg.get("name", "")
+            if name:
+                active_users[addr] = name
+                logger.info(f"Kullanıcı giriş yaptı: {name} - {addr}")
+            offered = msg.get("compression")
+            features = msg.get("features")
+            if offered is not None or features is not None:
+                # Sıkıştırma yalnızca çerçeveli modda kullanılabilir (bayrak çerçeve başlığındadır)
+                chosen = None
+                if offered is not None and COMPRESSION and session.framing == protocol.FRAMING_FRAMED:
+                    chosen = protocol.choose_compression(offered)
+                if features is not None:
+                    features = [feature for feature in protocol.FEATURES
+                                if isinstance(features, list) and feature in features]
+                reply.send(protocol.make_login_response(chosen, features))
+                session.compression = chosen
+                logger.info(f"Sıkıştırma: {chosen or 'yok'}, özellikler: {features} - {addr}")
+            # Sıkıştırma veya özellik sunmayan eski istemcilere yanıt gönderilmez
+        elif msg.get("command") == "get_tree":
+            # Dosya ağacını gönder
+            # İstemcideki sürüm güncelse yalnızca kısa bir yanıt gönderilir
+            # Sürüm alınırken ağaç gerekirse oluşturulur; live_updates list_dir ile aynı koşula bakar
+            if_version = msg.get("if_version")
+            if tree_cache.get_version(BASE_DIR) == if_version:
+                reply.send(protocol.make_not_modified_response("tree", if_version))
+                logger.info(f"Dosya ağacı değişmedi: {addr}")
+                return
+
+            # Ağaç değişmediği sürece tüm bağlantılara aynı kodlanmış baytlar gönderilir
+            live_updates = _live_updates()
+            framing, compression = session.framing, session.compression
+            version, response = tree_cache.get_encoded(
+                BASE_DIR, ("tree", live_updates, framing, compression),
+                lambda version, data_json: protocol.to_wire(
+                    protocol.make_encoded_tree_response(data_json, version, live_updates), framing, compression))
+            reply.send_raw(response)
+            logger.info(f"Dosya ağacı gönderildi: {addr}")
+
+        elif msg.get("command") == "list_dir":
+            # Tek bir klasörün içeriğini gönder (istemci ağacı klasör açıldıkça ister)
+            rel_path = msg.get("path", "")
+            depth = msg.get("depth", 1)
+            if not isinstance(depth, int) or depth < 1:
+                reply.send(protocol.make_error_response("Geçersiz listeleme derinliği"))
+                return
+            depth = min(depth, MAX_LIST_DEPTH)
+
+            if not is_safe_path(BASE_DIR, rel_path):
+                error_msg = f"Güvenlik ihlali: '{rel_path}' yoluna erişim engellendi"
+                logger.warning(f"{error_msg} - {addr}")
+                reply.send(protocol.make_error_response(error_msg))
+                return
+
+            node, error = list_directory(BASE_DIR, rel_path, depth)
+            if error:
+                reply.send(protocol.make_error_response(error))
+                return
+            reply.send(protocol.make_dir_listing_response(rel_path, node, depth, _live_updates()))
+            logger.info(f"Klasör listesi gönderildi: {rel_path or '.'} (derinlik {depth}) - {addr}")
+
+        elif msg.get("command") == "get_file":
+            # Dosya içeriğini gönder
+            rel_path = msg.get("path", "")
+
+            # Path güvenlik kontrolü
+            if not is_safe_path(BASE_DIR, rel_path):
+                error_msg = f"Güvenlik ihlali: '{rel_path}' yoluna erişim engellendi"
+                logger.warning(f"{error_msg} - {addr}")
+                reply.send(protocol.make_error_response(error_msg))
+                return
+
+            # Sürüm okumadan önce alınır; okuma sırasında değişen dosya bir sonraki istekte yeniden gönderilir
+            version = get_file_version(BASE_DIR, rel_path)
+            if_version = msg.get("if_version")
+            if if_version and version == if_version:
+                reply.send(protocol.make_not_modified_response("file", version, rel_path))
+                logger.info(f"Dosya değişmedi: {rel_path} - {addr}")
+                return
+
+            # Dosya okuma sınırlı thread havuzunda yapılır; kuyruk doluysa istemci daha sonra tekrar dener
+            _schedule(reply, "get_file", _send_file, rel_path, path=rel_path)
+
+        elif msg.get("command") == "get_file_range":
+            # Dosyanın bir aralığını parça parça gönder
+            rel_path = msg.get("path", "")
+            offset = msg.get("offset", 0)
+            length = msg.get("length")
+            if not isinstance(offset, int) or offset < 0 or (length is not None and (not isinstance(length, int) or length < 0)):
+                reply.send(protocol.make_error_response("Geçersiz dosya aralığı"))
+                return
+
+            if not is_safe_path(BASE_DIR, rel_path):
+                error_msg = f"Güvenlik ihlali: '{rel_path}' yoluna erişim engellendi"
+                logger.warning(f"{error_msg} - {addr}")
+                reply.send(protocol.make_error_response(error_msg))
+                return
+
+            version = get_file_version(BASE_DIR, rel_path)
+            if_version = msg.get("if_version")
+            if if_version and version == if_version:
+                reply.send(protocol.make_not_modified_response("file", version, rel_path))
+                logger.info(f"Dosya değişmedi: {rel_path} - {addr}")
+                return
+
+            _schedule(reply, "get_file_range", _send_file_range, rel_path, offset, length, version, path=rel_path)
+
+        elif msg.get("command") == "search":
+            # Metin dosyalarında ara
+            query = msg.get("query")
+            limit = msg.get("limit", 100)
+            if not SEARCH_INDEX:
+                reply.send(protocol.make_error_response("Arama bu sunucuda kapalı"))
+                return
+            if not isinstance(query, str) or not MIN_SEARCH_LENGTH <= len(query) <= MAX_SEARCH_LENGTH \
+                    or "\n" in query or "\r" in query:
+                reply.send(protocol.make_error_response(
+                    f"Geçersiz arama: sorgu {MIN_SEARCH_LENGTH}-{MAX_SEARCH_LENGTH} karakter ve tek satır olmalı"))
+                return
+            if not is_searchable(query):
+                # Üç harfli kelime içermeyen sorgu indekste aday bulamaz, tüm dosyaların okunmasını gerektirirdi
+                reply.send(protocol.make_error_response(
+                    "Geçersiz arama: sorgu en az 3 harflik bir kelime içermeli"))
+                return
+            if not isinstance(limit, int) or limit < 1:
+                reply.send(protocol.make_error_response("Geçersiz sonuç sınırı"))
+                return
+            limit = min(limit, MAX_SEARCH_RESULTS)
+
+            _schedule(reply, "search", _send_search, query, limit)
+
+        elif msg.get("command") == "find_path":
+            # Dosya adı/yolu ile hızlı arama
+            query = msg.get("query")
+            limit = msg.get("limit", 50)
+            mode = msg.get("mode", "fuzzy")
+            if not isinstance(query, str) or not 1 <= len(query) <= MAX_SEARCH_LENGTH or mode not in PATH_MATCH_MODES:
+                reply.send(protocol.make_error_response("Geçersiz yol araması"))
+                return
+            if not isinstance(limit, int) or limit < 1:
+                reply.send(protocol.make_error_response("Geçersiz sonuç sınırı"))
+                return
+            limit = min(limit, MAX_PATH_MATCHES)
+
+            # Sürüm ağaçtan önce alınır; arada ağaç değişirse bir sonraki istek farkı yakalar
+            version = tree_cache.get_version(BASE_DIR)
+            path_index.sync(BASE_DIR, tree_cache.get_tree(BASE_DIR), version)
+            paths = path_index.find(query, limit, mode)
+            reply.send(protocol.make_path_matches_response(query, paths))
+            logger.info(f"Yol araması: '{query}' ({mode}) {len(paths)} sonuç - {addr}")
+
+        elif msg.get("command") == "cancel":
+            # İstemci yanıtı artık beklemiyor: kuyruktaki istek atlanır, süren akış durdurulur.
+            # Bu arada tamamlanmış istekler için bir şey yapılmaz; cancel'a yanıt gönderilmez
+            target = session.active.get(protocol.valid_request_id(msg.get("request_id")))
+            if target is not None:
+                target.cancelled = True
+                logger.info(f"İstek iptal edildi: {target.request_id} - {addr}")
+
+        elif msg.get("command") == "update_settings":
+            # Ayarları güncelle
+            try:
+                excluded_dirs = msg.get("excluded_dirs", [])
+                excluded_exts = msg.get("excluded_exts", [])
+                allowed_exts = msg.get("allowed_exts", [])
+
+                logger.info(f"Ayarlar güncelleniyor: {len(excluded_dirs)} klasör, {len(excluded_exts)} uzantı hariç tutuluyor, {len(allowed_exts)} uzantı izin veriliyor")
+                logger.debug(f"Hariç tutulan klasörler: {excluded_dirs}")
+                logger.debug(f"Hariç tutulan uzantılar: {excluded_exts}")
+                logger.debug(f"İzin verilen uzantılar: {allowed_exts}")
+
+                # file_browser.py'deki ayarları güncelle
+                set_excluded_directories(excluded_dirs)
+                set_excluded_extensions(excluded_exts)
+                set_allowed_extensions(allowed_exts)
+                if watcher:
+                    watcher.request_resync()
+
+                # Başarılı yanıt gönder
+                response = protocol.make_settings_response(True, "Ayarlar başarıyla güncellendi")
+                reply.send(response)
+                logger.info(f"Ayarlar güncellendi: {addr}")
+            except Exception as e:
+                error_msg = f"Ayarları güncelleme hatası: {str(e)}"
+                logger.error(f"{error_msg} - {addr}")
+                reply.send(protocol.make_error_response(error_msg))
+
+        else:
+            # Bilinmeyen komut
+            error_msg = f"{protocol.UNKNOWN_COMMAND_ERROR}{msg.get('command', 'komut yok')}"
+            logger.warning(f"{error_msg} - {addr}")
+            reply.send(protocol.make_error_response(error_msg))
+
+    except Exception as e:
+        # Genel hata durumu
+        error_msg = f"Sunucu hatası: {str(e)}"
+        logger.error(f"{error_msg} - {addr}")
+        try:
+            reply.send(protocol.make_error_response(error_msg))
+        except:
+            pass
+
+
+def _unregister_session(addr):
+    """Kapanan bağlantıyı aktif bağlantı ve kullanıcı listelerinden çıkarır."""
+    active_sessions.pop(addr, None)
+    # Bağlantı kapanınca kullanıcıyı aktif kullanıcı listesinden sil
+    if addr in active_users:
+        logger.info(f"Kullanıcı listeden silindi: {active_users[addr]} - {addr}")
+        del active_users[addr]
+
 
 def handle_client(conn, addr):
     """Client bağlantısını işle"""
     logger.info(f"[+] Yeni bağlantı: {addr}")
+    session = ClientSession(conn, addr)
+    active_sessions[addr] = session
     
     try:
-        buffer = ""
+        # Çerçeveleme modu istemcinin ilk baytından algılanır ve yanıtlarda da kullanılır
+        reader = protocol.MessageReader(conn, max_size=protocol.MAX_REQUEST_SIZE)
         while True:
-            # Veri al
-            data = conn.recv(1024).decode("utf-8")
-            if not data:
+            # Sıradaki tam mesajı al
+            message = reader.read_payload()
+            if message is None:
                 logger.info(f"[-] Bağlantı kapandı: {addr}")
                 break
-                
-            buffer += data
-            
-            # Mesajları işle
-            while protocol.MESSAGE_DELIMITER in buffer:
-                message, buffer = buffer.split(protocol.MESSAGE_DELIMITER, 1)
-                
-                # Mesajı parse et
-                try:
-                    msg = protocol.parse_message(message)
-                    if not msg:
-                        logger.warning(f"Geçersiz mesaj formatı: {message[:50]}...")
-                        continue
-                        
-                    logger.info(f"Mesaj alındı: {addr} - {msg.get('command', 'bilinmeyen komut')}")
-                    logger.debug(f"Mesaj detayları: {msg}")
-                    
-                    # Komutları işle
-                    # Kullanıcı listesini döndür
-                    if msg.get("command") == "get_users":
-                        """
-                        İstemciden aktif kullanıcı listesini isteyen komutu işler.
-                        """
-                        # Sadece aktif kullanıcı adlarını döndür
-                        users = list(active_users.values())
-                        response = protocol.make_users_response(users)
-                        conn.sendall(response.encode("utf-8"))
-                        logger.info(f"Kullanıcı listesi gönderildi: {addr}")
-                    elif msg.get("command") == "login":
-                        name = msg.get("name", "")
-                        active_users[addr] = name
-                        logger.info(f"Kullanıcı giriş yaptı: {name} - {addr}")
-                        # No response needed for login
-                    elif msg.get("command") == "get_tree":
-                        # Dosya ağacını gönder
-                        tree_data = build_tree(BASE_DIR)
-                        response = protocol.make_tree_response(tree_data)
-                        conn.sendall(response.encode("utf-8"))
-                        logger.info(f"Dosya ağacı gönderildi: {addr}")
-                        
-                    elif msg.get("command") == "get_file":
-                        # Dosya içeriğini gönder
-                        rel_path = msg.get("path", "")
-                        
-                        # Path güvenlik kontrolü
-                        if not is_safe_path(BASE_DIR, rel_path):
-                            error_msg = f"Güvenlik ihlali: '{rel_path}' yoluna erişim engellendi"
-                            logger.warning(f"{error_msg} - {addr}")
-                            conn.sendall(protocol.make_error_response(error_msg).encode("utf-8"))
-                            continue
-                        
-                        # Dosyayı oku
-                        try:
-                            content, error = read_file(BASE_DIR, rel_path)
-                            if error:
-                                logger.warning(f"Dosya okuma hatası: {error} - {addr}")
-                                conn.sendall(protocol.make_error_response(error).encode("utf-8"))
-                            else:
-                                logger.info(f"Dosya gönderildi: {rel_path} - {addr}")
-                                conn.sendall(protocol.make_file_response(rel_path, content).encode("utf-8"))
-                        except Exception as e:
-                            error_msg = f"Dosya okuma hatası: {str(e)}"
-                            logger.error(f"{error_msg} - {addr}")
-                            conn.sendall(protocol.make_error_response(error_msg).encode("utf-8"))
-                    
-                    elif msg.get("command") == "update_settings":
-                        # Ayarları güncelle
-                        try:
-                            excluded_dirs = msg.get("excluded_dirs", [])
-                            excluded_exts = msg.get("excluded_exts", [])
-                            allowed_exts = msg.get("allowed_exts", [])
-                            
-                            logger.info(f"Ayarlar güncelleniyor: {len(excluded_dirs)} klasör, {len(excluded_exts)} uzantı hariç tutuluyor, {len(allowed_exts)} uzantı izin veriliyor")
-                            logger.debug(f"Hariç tutulan klasörler: {excluded_dirs}")
-                            logger.debug(f"Hariç tutulan uzantılar: {excluded_exts}")
-                            logger.debug(f"İzin verilen uzantılar: {allowed_exts}")
-                            
-                            # file_browser.py'deki ayarları güncelle
-                            set_excluded_directories(excluded_dirs)
-                            set_excluded_extensions(excluded_exts)
-                            set_allowed_extensions(allowed_exts)
-                            
-                            # Başarılı yanıt gönder
-                            response = protocol.make_settings_response(True, "Ayarlar başarıyla güncellendi")
-                            conn.sendall(response.encode("utf-8"))
-                            logger.info(f"Ayarlar güncellendi: {addr}")
-                        except Exception as e:
-                            error_msg = f"Ayarları güncelleme hatası: {str(e)}"
-                            logger.error(f"{error_msg} - {addr}")
-                            conn.sendall(protocol.make_error_response(error_msg).encode("utf-8"))
-                    
-                    else:
-                        # Bilinmeyen komut
-                        error_msg = f"Bilinmeyen komut: {msg.get('command', 'komut yok')}"
-                        logger.warning(f"{error_msg} - {addr}")
-                        conn.sendall(protocol.make_error_response(error_msg).encode("utf-8"))
-                        
-                except Exception as e:
-                    # Genel hata durumu
-                    error_msg = f"Sunucu hatası: {str(e)}"
-                    logger.error(f"{error_msg} - {addr}")
-                    try:
-                        conn.sendall(protocol.make_error_response(error_msg).encode("utf-8"))
-                    except:
-                        pass
-    
+            session.framing = reader.framing
+            process_message(session, message, reader.request_id)
+
     except ConnectionError:
         logger.info(f"[-] Bağlantı kesildi: {addr}")
+    except protocol.ProtocolError as e:
+        logger.warning(f"Protokol hatası: {str(e)} - {addr}")
     except Exception as e:
         logger.error(f"Beklenmeyen hata: {str(e)} - {addr}")
     finally:
-        # Bağlantı kapanınca kullanıcıyı aktif kullanıcı listesinden sil
-        if addr in active_users:
-            logger.info(f"Kullanıcı listeden silindi: {active_users[addr]} - {addr}")
-            del active_users[addr]
+        _unregister_session(addr)
         conn.close()
         logger.info(f"[-] Bağlantı kapatıldı: {addr}")
 
 
 def start_server(base_dir=None):
-    global BASE_DIR, running
+    global BASE_DIR, running, _async_engine, content_cache
     
     # Eğer base_dir belirtilmişse, güvenlik kontrollerini uygula
     if base_dir:
@@ -183,8 +708,33 @@ def start_server(base_dir=None):
             
         BASE_DIR = base_dir
         logger.info(f"[SERVER] Paylaşılan dizin: {BASE_DIR}")
+    else:
+        # GUI BASE_DIR'i doğrudan atayabilir; önbellek anahtarı için normalize et
+        BASE_DIR = os.path.normpath(os.path.realpath(os.path.abspath(BASE_DIR)))
     
-    logger.info(f"[SERVER] Başlatılıyor: {HOST}:{PORT}")
+    # Önbellek bütçesi ayarlardan gelir
+    if content_cache.max_bytes != CONTENT_CACHE_MB * 1024 * 1024:
+        content_cache = ContentCache(CONTENT_CACHE_MB * 1024 * 1024)
+    tree_cache.scan_workers = SCAN_WORKERS
+
+    logger.info(f"[SERVER] Başlatılıyor: {HOST}:{PORT} ({ENGINE})")
+    if ENGINE == "asyncio":
+        # async_server bu modülü içe aktardığı için burada yüklenir
+        from .async_server import AsyncServerEngine
+        _async_engine = AsyncServerEngine(HOST, PORT, ASYNC_WORKERS)
+        running = True
+        _start_scheduler()
+        _start_watcher()
+        _start_warmup()
+        try:
+            return _async_engine.run()
+        finally:
+            _stop_watcher()
+            _stop_scheduler()
+            _save_tree_index()
+            running = False
+            _async_engine = None
+
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.bind((HOST, PORT))
@@ -192,6 +742,9 @@ def start_server(base_dir=None):
             s.settimeout(1)  # 1 saniye timeout ile soket dinleme
             logger.info("[SERVER] Dinleniyor...")
             running = True
+            _start_scheduler()
+            _start_watcher()
+            _start_warmup()
 
             while running:
                 try:
@@ -205,9 +758,14 @@ def start_server(base_dir=None):
                 except Exception as e:
                     logger.error(f"[SERVER] Bağlantı kabul hatası: {e}")
             
+            _stop_watcher()
+            _stop_scheduler()
+            _save_tree_index()
             logger.info("[SERVER] Durduruldu")
             return True
     except Exception as e:
+        _stop_watcher()
+        _stop_scheduler()
         logger.error(f"[SERVER] Başlatma hatası: {e}")
         return False
 
@@ -215,6 +773,8 @@ def stop_server():
     global running
     logger.info("[SERVER] Durdurma isteği alındı")
     running = False
+    if _async_engine is not None:
+        _async_engine.stop()
 
 if __name__ == '__main__':
     start_server()
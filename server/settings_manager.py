@@ -32,7 +32,28 @@ class SettingsManager:
             ],
             "excluded_extensions": [
                 '.pyc', '.pyo', '.so', '.dll', '.exe', '.bin', '.dat', '.db', '.sqlite', '.sqlite3'
-            ]
+            ],
+            # Dosya değişikliklerini izleyip istemcilere anında bildir
+            "watch_changes": True,
+            # inotify yoksa kullanılan mtime taramasının aralığı (saniye)
+            "watch_poll_interval": 1.0,
+            # "threaded" veya "asyncio"
+            "engine": "threaded",
+            "async_workers": 8,
+            # Dosya okuma kuyruğu sınırları; aşıldığında istemciye "busy" yanıtı gönderilir
+            "io_workers": 4,
+            "max_pending_requests": 64,
+            "max_requests_per_client": 4,
+            # Klasör taramasında paralel listeleme yapan thread sayısı (1: sıralı tarama)
+            "scan_workers": 1,
+            # Ağacı server_settings.json yanındaki tree_index.json'a kaydedip yeniden başlatmada hızlı yükle
+            "tree_index": True,
+            # Metin dosyalarında arama için bellek içi ters indeks
+            "search_index": True,
+            # Sık açılan dosyalar için bellek içi önbellek (MB)
+            "content_cache_mb": 64,
+            # Çerçeveli istemcilerle zlib/zstd sıkıştırma anlaşması yap
+            "compression": True
         }
         self.settings = self.load_settings()
         
@@ -0,0 +1,422 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+
+from . import file_browser
+
+# Logger oluştur
+logger = logging.getLogger('FileServer.TreeCache')
+
+# Önbellekteki ağacın diskle karşılaştırılması arasında geçen en kısa süre (saniye)
+REVALIDATE_INTERVAL = 2.0
+# Disk indeksi dosya biçimi; değiştiğinde eski indeksler yok sayılır
+INDEX_FORMAT = 1
+
+
+def _join_rel(rel_dir, name):
+    """'/' ile ayrılmış göreli yola yeni bir parça ekler."""
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def _full_path(base_dir, rel_dir):
+    return os.path.join(base_dir, rel_dir) if rel_dir else base_dir
+
+
+def _new_node(files=None):
+    return {"files": files if files is not None else [], "children": {}}
+
+
+def _get_node(tree, rel_dir):
+    """Göreli yolu verilen klasörün ağaçtaki düğümünü döner, yoksa None."""
+    node = tree
+    if not rel_dir:
+        return node
+    for part in rel_dir.split("/"):
+        node = node["children"].get(part)
+        if node is None:
+            return None
+    return node
+
+
+def _replace_node(node, parts, new_node):
+    """
+    Ağacı yerinde değiştirmeden, kökten hedef düğüme kadar olan yolu kopyalayarak
+    yeni bir kök döner. Eski kökü kullanmakta olan bağlantılar tutarlı bir ağaç görmeye devam eder.
+    new_node None ise hedef düğüm ağaçtan çıkarılır.
+    """
+    if not parts:
+        return new_node
+    head = parts[0]
+    child = node["children"].get(head)
+    if child is None:
+        return node
+    copied = {"files": node["files"], "children": dict(node["children"])}
+    if len(parts) == 1 and new_node is None:
+        del copied["children"][head]
+    else:
+        copied["children"][head] = _replace_node(child, parts[1:], new_node)
+    return copied
+
+
+class _TreeEntry:
+    """Tek bir paylaşım klasörü ve ayar kombinasyonu için önbellek kaydı."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.tree = _new_node()
+        # Göreli klasör yolu -> son taramadaki mtime (ns)
+        self.dir_mtimes = {}
+        self.checked_at = 0.0
+        # Ağaç değişene kadar geçerli JSON metni, sürüm etiketi ve kodlanmış yanıtlar
+        self.data_json = None
+        self.version = None
+        self.encoded = {}
+
+    def tree_changed(self):
+        """Ağaçtan türetilen serileştirilmiş verileri geçersiz kılar."""
+        self.data_json = None
+        self.version = None
+        self.encoded = {}
+
+
+class TreeCache:
+    """
+    Dosya ağacını tüm bağlantılar arasında paylaşılan bir önbellekte tutar.
+
+    Ağaç ilk istekte bir kez taranır; sonraki isteklerde yalnızca klasörlerin mtime
+    değerleri kontrol edilir ve sadece değişen klasörler yeniden taranarak ağaç
+    parça parça güncellenir. Kayıtlar geçerli izin/hariç tutma ayarlarına göre anahtarlanır.
+
+    Bir değişiklik izleyicisi çalışırken (watched=True) mtime kontrolü yapılmaz;
+    değişen klasörler apply_changes ile bildirilir.
+
+    Tarama ve mtime kontrolü kilit dışında, aynı anda tek bir thread tarafından yapılır
+    (_update_lock); sonuç kayda kilit altında yazılır. Bu sırada gelen istekler ağaç henüz
+    yoksa taramanın bitmesini bekler, varsa önceki ağacı kullanır.
+
+    index_file verilirse ağaç ve klasör mtime'ları diske kaydedilir; sunucu yeniden
+    başlatıldığında load_index ile ağaç taranmadan yüklenir ve revalidate ile güncellenir.
+    """
+
+    def __init__(self, revalidate_interval=REVALIDATE_INTERVAL, scan_workers=1):
+        """
+        Args:
+            revalidate_interval (float): Disk kontrolleri arasındaki en kısa süre (saniye)
+            scan_workers (int): Tarama sırasında aynı anda listelenecek en fazla klasör sayısı
+        """
+        self.revalidate_interval = revalidate_interval
+        self.scan_workers = scan_workers
+        # Ağacın kaydedileceği dosya (None ise kaydedilmez)
+        self.index_file = None
+        # Değişiklik izleyicisi aktifse ağaç yalnızca apply_changes ile güncellenir
+        self.watched = False
+        # _entries ve kayıtların alanları için; tarama sırasında tutulmaz
+        self._lock = threading.Lock()
+        # Kayıtları oluşturan/güncelleyen tek thread'i seçer
+        self._update_lock = threading.Lock()
+        self._entries = {}
+        # invalidate/load_index'te artar; bu sırada biten tarama önbelleğe yazılmaz
+        self._generation = 0
+
+    def get_tree(self, base_dir):
+        """
+        Paylaşılan klasörün ağacını döner.
+        Dönen sözlük değiştirilmemelidir; güncellemeler her zaman yeni bir kök üretir.
+        """
+        entry = self._get_entry(base_dir)
+        with self._lock:
+            return entry.tree
+
+    def get_encoded(self, base_dir, variant, encoder):
+        """
+        Ağacın kodlanmış (gönderime hazır) halini döner.
+        Aynı ağaç için encoder yalnızca bir kez çağrılır ve dönen bytes tüm bağlantılarca paylaşılır.
+
+        Args:
+            base_dir (str): Paylaşılan klasör
+            variant (hashable): Kodlama türünü ayırt eden anahtar
+            encoder (callable): encoder(version, data_json) -> bytes
+
+        Returns:
+            tuple: (sürüm etiketi, bytes)
+        """
+        entry = self._get_entry(base_dir)
+        with self._lock:
+            self._serialize(entry)
+            encoded = entry.encoded.get(variant)
+            if encoded is None:
+                encoded = encoder(entry.version, entry.data_json)
+                entry.encoded[variant] = encoded
+                logger.debug(f"Ağaç yanıtı kodlandı: {variant} - {len(encoded)} byte, sürüm {entry.version}")
+            return entry.version, encoded
+
+    def apply_changes(self, base_dir, rel_dirs):
+        """
+        İçeriği değiştiği bildirilen klasörleri yeniden tarar.
+
+        Args:
+            base_dir (str): Paylaşılan klasör
+            rel_dirs (iterable): '/' ile ayrılmış göreli klasör yolları
+
+        Returns:
+            list: Ağaçta yapılan değişiklikler (bkz. protocol.make_tree_delta_message).
+                  Ağaç henüz oluşturulmamışsa (veya ayarlar değiştiyse) baştan taranır ve
+                  değişiklikler bilinmediği için None döner.
+        """
+        key = (base_dir, file_browser.get_filter_key())
+        with self._update_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return self._update_dirs(entry, rel_dirs)
+        self._get_entry(base_dir)
+        return None
+
+    def has_entry(self, base_dir):
+        """Geçerli ayarlara ait ağaç önbellekte varsa True; değişiklikler ancak o zaman apply_changes ile üretilebilir."""
+        with self._lock:
+            return (base_dir, file_browser.get_filter_key()) in self._entries
+
+    def revalidate(self, base_dir):
+        """
+        Ağacı izleyici çalışıyor olsa bile diskle karşılaştırır; diskten yüklenen ağaç için kullanılır.
+
+        Returns:
+            list: Ağaçta yapılan değişiklikler. Henüz ağaç oluşturulmamışsa boş liste.
+        """
+        key = (base_dir, file_browser.get_filter_key())
+        with self._update_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                return []
+            return self._revalidate(entry)
+
+    def load_index(self, base_dir):
+        """
+        index_file'daki ağacı önbelleğe yükler; ilk istek klasör taranmadan yanıtlanır.
+        İndeks farklı bir klasöre veya filtre ayarlarına aitse yüklenmez.
+
+        Returns:
+            bool: Ağaç yüklendiyse True
+        """
+        if not self.index_file or not os.path.exists(self.index_file):
+            return False
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if (index.get("format") != INDEX_FORMAT or index.get("base_dir") != base_dir
+                    or index.get("filter_key") != [list(part) for part in file_browser.get_filter_key()]):
+                logger.info(f"Ağaç indeksi geçerli ayarlara ait değil, yok sayılıyor: {self.index_file}")
+                return False
+            entry = _TreeEntry(base_dir)
+            entry.tree = index["tree"]
+            entry.dir_mtimes = {rel_dir: int(mtime) for rel_dir, mtime in index["dir_mtimes"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ağaç indeksi okunamadı: {self.index_file} - {e}")
+            return False
+
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._entries[(base_dir, file_browser.get_filter_key())] = entry
+        logger.info(f"Ağaç indeksi yüklendi: {len(entry.dir_mtimes)} klasör")
+        return True
+
+    def save_index(self, base_dir):
+        """Önbellekteki ağacı index_file'a kaydeder; yarım kalmış yazma eski indeksi bozmaz."""
+        if not self.index_file:
+            return
+        key = (base_dir, file_browser.get_filter_key())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._serialize(entry)
+            data_json = entry.data_json
+            dir_mtimes = json.dumps(entry.dir_mtimes, separators=(",", ":"), ensure_ascii=False)
+        header = json.dumps({"format": INDEX_FORMAT, "base_dir": base_dir,
+                             "filter_key": key[1]}, ensure_ascii=False)
+        temp_file = self.index_file + ".tmp"
+        try:
+            # Ağaç JSON'u önbellekte hazır olduğundan yeniden serileştirilmez
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(f'{header[:-1]},"dir_mtimes":{dir_mtimes},"tree":{data_json}}}')
+            os.replace(temp_file, self.index_file)
+            logger.info(f"Ağaç indeksi kaydedildi: {self.index_file}")
+        except OSError as e:
+            logger.warning(f"Ağaç indeksi kaydedilemedi: {self.index_file} - {e}")
+
+    def get_version(self, base_dir):
+        """Ağacın sürüm etiketini (JSON içeriğinin özeti) döner."""
+        entry = self._get_entry(base_dir)
+        with self._lock:
+            self._serialize(entry)
+            return entry.version
+
+    def _serialize(self, entry):
+        """Ağacın JSON metnini ve sürüm etiketini ağaç değiştiyse yeniden hesaplar."""
+        if entry.data_json is None:
+            entry.data_json = json.dumps(entry.tree, separators=(",", ":"), ensure_ascii=False)
+            entry.version = hashlib.sha1(entry.data_json.encode("utf-8")).hexdigest()[:16]
+
+    def _needs_revalidate(self, entry):
+        return not self.watched and time.monotonic() - entry.checked_at >= self.revalidate_interval
+
+    def _get_entry(self, base_dir):
+        """
+        Geçerli ayarlara ait kaydı döner; gerekirse oluşturur veya diskle karşılaştırır.
+        Kayıt yoksa tarama bitene kadar bekler; başka bir thread kaydı diskle
+        karşılaştırıyorsa beklemeden mevcut kaydı döner. Kilitler tutulurken çağrılmamalıdır.
+        """
+        key = (base_dir, file_browser.get_filter_key())
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            if not self._needs_revalidate(entry) or not self._update_lock.acquire(blocking=False):
+                return entry
+        else:
+            self._update_lock.acquire()
+        try:
+            with self._lock:
+                entry = self._entries.get(key)
+                generation = self._generation
+            if entry is None:
+                entry = self._build(base_dir)
+                with self._lock:
+                    if generation == self._generation:
+                        # Ayarlar veya klasör değişti, eski kayıtlar artık kullanılmaz
+                        self._entries.clear()
+                        self._entries[key] = entry
+            elif self._needs_revalidate(entry):
+                self._revalidate(entry)
+            return entry
+        finally:
+            self._update_lock.release()
+
+    def invalidate(self):
+        """Tüm önbelleği temizler, bir sonraki istek ağacı baştan tarar."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+        logger.info("Ağaç önbelleği temizlendi")
+
+    def _build(self, base_dir):
+        logger.info(f"Ağaç önbelleği oluşturuluyor: {base_dir}")
+        started = time.monotonic()
+        entry = _TreeEntry(base_dir)
+        entry.tree = self._scan_subtree(base_dir, "", entry.dir_mtimes)
+        entry.checked_at = time.monotonic()
+        logger.info(f"Ağaç önbelleği oluşturuldu: {len(entry.dir_mtimes)} klasör, "
+                    f"{entry.checked_at - started:.3f} sn")
+        return entry
+
+    def _scan_subtree(self, base_dir, rel_dir, dir_mtimes):
+        """Verilen klasörü ve alt klasörlerini tarayıp yeni bir düğüm döner."""
+        try:
+            return file_browser.scan_tree(base_dir, rel_dir, dir_mtimes, self.scan_workers)
+        except OSError as e:
+            logger.warning(f"Klasör taranamadı: {rel_dir or '.'} - {e}")
+            return _new_node()
+
+    def _revalidate(self, entry):
+        """
+        mtime'ı değişen klasörleri bulur, yalnızca onları yeniden tarar ve değişiklikleri döner.
+        _update_lock altında çağrılmalıdır; kayıt yalnızca bu thread tarafından değiştirilir.
+        """
+        changed = []
+        for rel_dir, mtime in entry.dir_mtimes.items():
+            try:
+                current = os.stat(_full_path(entry.base_dir, rel_dir)).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                changed.append(rel_dir)
+
+        changes = self._update_dirs(entry, changed) if changed else []
+        entry.checked_at = time.monotonic()
+        return changes
+
+    def _update_dirs(self, entry, rel_dirs):
+        """
+        Klasörleri kaydın bir kopyası üzerinde kilit dışında yeniden tarar ve sonucu kayda
+        kilit altında yazar; okuyucular bu sırada önceki ağacı görür. _update_lock altında çağrılmalıdır.
+        """
+        work = _TreeEntry(entry.base_dir)
+        work.tree = entry.tree
+        work.dir_mtimes = dict(entry.dir_mtimes)
+        changes = self._rescan_dirs(work, rel_dirs)
+        with self._lock:
+            entry.tree = work.tree
+            entry.dir_mtimes = work.dir_mtimes
+            if changes:
+                entry.tree_changed()
+        return changes
+
+    def _rescan_dirs(self, entry, rel_dirs):
+        # Üst klasörler önce işlenir; silinen alt klasörler böylece tek seferde düşer
+        ordered = sorted(set(rel_dirs), key=lambda rel: (rel.count("/") if rel else -1, rel))
+        changes = []
+        for rel_dir in ordered:
+            if rel_dir in entry.dir_mtimes:
+                changes.extend(self._rescan_dir(entry, rel_dir))
+        if changes:
+            entry.tree_changed()
+        if ordered:
+            logger.info(f"Ağaç önbelleği güncellendi: {len(ordered)} klasör yeniden tarandı, {len(changes)} değişiklik")
+        return changes
+
+    def _drop_subtree_mtimes(self, entry, rel_dir):
+        prefix = rel_dir + "/"
+        for key in [k for k in entry.dir_mtimes if k == rel_dir or k.startswith(prefix)]:
+            del entry.dir_mtimes[key]
+
+    def _rescan_dir(self, entry, rel_dir):
+        """
+        Tek bir klasörü yeniden tarar; değişmeyen alt ağaçlar olduğu gibi korunur.
+        Eklenen ve silinen dosya/klasörleri değişiklik listesi olarak döner.
+        """
+        old_node = _get_node(entry.tree, rel_dir)
+        parts = rel_dir.split("/") if rel_dir else []
+        try:
+            mtime = os.stat(_full_path(entry.base_dir, rel_dir)).st_mtime_ns
+            files, dirs = file_browser.scan_directory(entry.base_dir, rel_dir)
+        except OSError:
+            # Klasör artık yok veya okunamıyor
+            self._drop_subtree_mtimes(entry, rel_dir)
+            if parts:
+                entry.tree = _replace_node(entry.tree, parts, None)
+                return [{"op": "remove", "type": "dir", "path": rel_dir}]
+            entry.tree = _new_node()
+            return []
+
+        entry.dir_mtimes[rel_dir] = mtime
+        changes = []
+        new_node = _new_node(files)
+        old_files = set(old_node["files"]) if old_node else set()
+        old_children = old_node["children"] if old_node else {}
+
+        for name in old_files.difference(files):
+            changes.append({"op": "remove", "type": "file", "path": _join_rel(rel_dir, name)})
+        for name in old_children:
+            if name not in dirs:
+                self._drop_subtree_mtimes(entry, _join_rel(rel_dir, name))
+                changes.append({"op": "remove", "type": "dir", "path": _join_rel(rel_dir, name)})
+        for name in files:
+            if name not in old_files:
+                changes.append({"op": "add", "type": "file", "path": _join_rel(rel_dir, name)})
+        for name in dirs:
+            child_rel = _join_rel(rel_dir, name)
+            if name in old_children:
+                new_node["children"][name] = old_children[name]
+            else:
+                child = self._scan_subtree(entry.base_dir, child_rel, entry.dir_mtimes)
+                new_node["children"][name] = child
+                changes.append({"op": "add", "type": "dir", "path": child_rel, "tree": child})
+
+        if changes:
+            entry.tree = _replace_node(entry.tree, parts, new_node)
+        return changes
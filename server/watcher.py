@@ -0,0 +1,283 @@
+import os
+import threading
+import logging
+
+from . import file_browser
+
+try:
+    # Linux'ta inotify ile anlık bildirim; paket yoksa mtime taramasına düşülür
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+    inotify_flags = None
+
+# Logger oluştur
+logger = logging.getLogger('FileServer.Watcher')
+
+# mtime taraması yapan izleyicinin tarama aralığı (saniye)
+POLL_INTERVAL = 1.0
+
+# Birbirine yakın olayların tek bildirimde toplanması için beklenen süre (milisaniye)
+DEBOUNCE_MS = 200
+
+
+def _join_rel(rel_dir, name):
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def _parent_rel(rel_path):
+    return rel_path.rsplit("/", 1)[0] if "/" in rel_path else ""
+
+
+class ChangeWatcher(threading.Thread):
+    """
+    Paylaşılan klasördeki değişiklikleri izleyen arka plan thread'i.
+
+    inotify_simple kuruluysa ve platform destekliyorsa inotify kullanılır, aksi halde
+    klasör ve dosyaların mtime/boyut bilgileri periyodik olarak karşılaştırılır.
+    Her bildirimde callback şu argümanlarla çağrılır:
+        changed_dirs (set): İçeriğine dosya/klasör eklenen, silinen veya taşınan klasörler
+        modified_files (set): İçeriği değişen dosyalar
+        overflow (bool): Olaylar kaçırıldıysa True; bu durumda ağaç baştan kurulmalıdır
+    Tüm yollar '/' ile ayrılmış, base_dir'e göreli yollardır.
+    """
+
+    def __init__(self, base_dir, on_changes, poll_interval=POLL_INTERVAL):
+        """
+        Args:
+            base_dir (str): İzlenecek (normalize edilmiş) klasör
+            on_changes (callable): Değişiklik bildirim fonksiyonu
+            poll_interval (float): mtime taraması aralığı (saniye)
+        """
+        super().__init__(name="ChangeWatcher", daemon=True)
+        self.base_dir = base_dir
+        self.on_changes = on_changes
+        self.poll_interval = poll_interval
+        self.backend = "inotify" if INotify is not None else "polling"
+        self._stop_event = threading.Event()
+        self._resync = threading.Event()
+
+    def stop(self):
+        """İzlemeyi durdurur."""
+        self._stop_event.set()
+
+    def request_resync(self):
+        """Filtre ayarları değiştiğinde izlenen klasör listesinin yeniden kurulmasını ister."""
+        self._resync.set()
+
+    def run(self):
+        logger.info(f"Değişiklik izleyici başlatıldı ({self.backend}): {self.base_dir}")
+        try:
+            if self.backend == "inotify":
+                try:
+                    self._run_inotify()
+                except OSError as e:
+                    # inotify sınırına takıldıysa (max_user_watches vb.) taramaya düş
+                    logger.warning(f"inotify kullanılamadı, mtime taramasına geçiliyor: {e}")
+                    self.backend = "polling"
+                    self._run_polling()
+            else:
+                self._run_polling()
+        except Exception as e:
+            logger.error(f"Değişiklik izleyici hatası: {str(e)}")
+        logger.info("Değişiklik izleyici durduruldu")
+
+    def _emit(self, changed_dirs, modified_files, overflow=False):
+        if not (changed_dirs or modified_files or overflow):
+            return
+        logger.debug(f"Değişiklikler: klasörler={sorted(changed_dirs)}, dosyalar={sorted(modified_files)}, taşma={overflow}")
+        try:
+            self.on_changes(changed_dirs, modified_files, overflow)
+        except Exception as e:
+            logger.error(f"Değişiklik bildirimi işlenemedi: {str(e)}")
+
+    def _full_path(self, rel_path):
+        return os.path.join(self.base_dir, rel_path) if rel_path else self.base_dir
+
+    # === inotify ===
+
+    def _run_inotify(self):
+        f = inotify_flags
+        mask = (f.CREATE | f.DELETE | f.MOVED_FROM | f.MOVED_TO | f.CLOSE_WRITE | f.MODIFY
+                | f.DELETE_SELF | f.ONLYDIR | f.DONT_FOLLOW)
+        inotify = INotify()
+        watches = {}  # wd -> göreli klasör yolu
+
+        def add_tree(rel_dir):
+            stack = [rel_dir]
+            while stack:
+                current = stack.pop()
+                try:
+                    wd = inotify.add_watch(self._full_path(current), mask)
+                    watches[wd] = current
+                    _, dirs = file_browser.scan_directory(self.base_dir, current)
+                except (FileNotFoundError, NotADirectoryError, PermissionError):
+                    continue
+                stack.extend(_join_rel(current, name) for name in dirs)
+
+        def drop_tree(rel_dir):
+            prefix = rel_dir + "/"
+            for wd, path in list(watches.items()):
+                if path == rel_dir or path.startswith(prefix):
+                    del watches[wd]
+                    try:
+                        inotify.rm_watch(wd)
+                    except OSError:
+                        pass
+
+        try:
+            add_tree("")
+            logger.info(f"inotify ile {len(watches)} klasör izleniyor")
+            while not self._stop_event.is_set():
+                if self._resync.is_set():
+                    self._resync.clear()
+                    drop_tree("")
+                    watches.clear()
+                    add_tree("")
+                    self._emit(set(), set(), overflow=True)
+
+                changed_dirs = set()
+                modified_files = set()
+                overflow = False
+                for event in inotify.read(timeout=500, read_delay=DEBOUNCE_MS):
+                    if event.mask & f.Q_OVERFLOW:
+                        overflow = True
+                        continue
+                    rel_dir = watches.get(event.wd)
+                    if rel_dir is None:
+                        continue
+                    if event.mask & f.IGNORED:
+                        watches.pop(event.wd, None)
+                        continue
+                    if event.mask & f.DELETE_SELF:
+                        changed_dirs.add(_parent_rel(rel_dir))
+                        continue
+
+                    rel_path = _join_rel(rel_dir, event.name)
+                    is_dir = bool(event.mask & f.ISDIR)
+                    if event.mask & (f.CREATE | f.DELETE | f.MOVED_FROM | f.MOVED_TO):
+                        changed_dirs.add(rel_dir)
+                    if is_dir:
+                        if event.mask & f.MOVED_FROM:
+                            drop_tree(rel_path)
+                        elif event.mask & (f.CREATE | f.MOVED_TO) and event.name not in file_browser.EXCLUDED_DIRECTORIES:
+                            add_tree(rel_path)
+                    elif event.mask & (f.CLOSE_WRITE | f.MODIFY | f.CREATE | f.MOVED_TO):
+                        # Editörler çoğunlukla geçici dosyayı üzerine taşıyarak kaydeder
+                        modified_files.add(rel_path)
+
+                if overflow:
+                    logger.warning("inotify olay kuyruğu taştı, izlenen klasörler yeniden kuruluyor")
+                    drop_tree("")
+                    watches.clear()
+                    add_tree("")
+                self._emit(changed_dirs, modified_files, overflow)
+        finally:
+            inotify.close()
+
+    # === mtime taraması ===
+
+    def _run_polling(self):
+        self._dirs = {}   # göreli klasör -> mtime (ns)
+        self._files = {}  # göreli dosya -> (mtime (ns), boyut)
+        self._scan_into("")
+        logger.info(f"mtime taraması ile {len(self._dirs)} klasör, {len(self._files)} dosya izleniyor")
+        while not self._stop_event.wait(self.poll_interval):
+            if self._resync.is_set():
+                self._resync.clear()
+                self._dirs.clear()
+                self._files.clear()
+                self._scan_into("")
+                self._emit(set(), set(), overflow=True)
+                continue
+            self._poll()
+
+    def _scan_into(self, rel_dir):
+        """Klasörü ve alt klasörlerini tarayıp anlık görüntüye ekler."""
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            try:
+                self._dirs[current] = os.stat(self._full_path(current)).st_mtime_ns
+                with os.scandir(self._full_path(current)) as it:
+                    entries = list(it)
+            except OSError:
+                self._dirs.pop(current, None)
+                continue
+            for entry in entries:
+                child = _join_rel(current, entry.name)
+                try:
+                    if entry.is_dir():
+                        if entry.name not in file_browser.EXCLUDED_DIRECTORIES and not entry.is_symlink():
+                            stack.append(child)
+                    elif file_browser.is_allowed_file(entry.name):
+                        st = entry.stat()
+                        self._files[child] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+
+    def _drop(self, rel_dir):
+        prefix = rel_dir + "/"
+        for key in [k for k in self._dirs if k == rel_dir or k.startswith(prefix)]:
+            del self._dirs[key]
+        for key in [k for k in self._files if k.startswith(prefix)]:
+            del self._files[key]
+
+    def _poll(self):
+        changed_dirs = set()
+        modified_files = set()
+
+        for rel_dir, mtime in list(self._dirs.items()):
+            try:
+                current = os.stat(self._full_path(rel_dir)).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                changed_dirs.add(rel_dir)
+
+        for rel_path, signature in list(self._files.items()):
+            try:
+                st = os.stat(self._full_path(rel_path))
+            except OSError:
+                # Silinen dosyayı üst klasörün mtime değişikliği yakalar
+                continue
+            current = (st.st_mtime_ns, st.st_size)
+            if current != signature:
+                self._files[rel_path] = current
+                modified_files.add(rel_path)
+
+        # Değişen klasörlerin yalnızca doğrudan içeriği yeniden listelenir
+        for rel_dir in sorted(changed_dirs, key=lambda rel: (rel.count("/") if rel else -1, rel)):
+            if rel_dir not in self._dirs:
+                continue
+            try:
+                self._dirs[rel_dir] = os.stat(self._full_path(rel_dir)).st_mtime_ns
+                with os.scandir(self._full_path(rel_dir)) as it:
+                    entries = list(it)
+            except OSError:
+                self._drop(rel_dir)
+                changed_dirs.add(_parent_rel(rel_dir))
+                continue
+            present = set()
+            for entry in entries:
+                child = _join_rel(rel_dir, entry.name)
+                try:
+                    if entry.is_dir():
+                        if entry.name in file_browser.EXCLUDED_DIRECTORIES or entry.is_symlink():
+                            continue
+                        present.add(child)
+                        if child not in self._dirs:
+                            self._scan_into(child)
+                    elif file_browser.is_allowed_file(entry.name):
+                        present.add(child)
+                        if child not in self._files:
+                            st = entry.stat()
+                            self._files[child] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+            for key in [k for k in self._files if _parent_rel(k) == rel_dir and k not in present]:
+                del self._files[key]
+            for key in [k for k in self._dirs if k and _parent_rel(k) == rel_dir and k not in present]:
+                self._drop(key)
+
+        self._emit(changed_dirs, modified_files)
@@ -1,8 +1,306 @@
 import json
+import zlib
+import struct
+import asyncio
+
+try:
+    # zstd isteğe bağlıdır; kurulu değilse yalnızca zlib sunulur
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Her mesaj satır sonu ile bitmeli (TCP stream ayrımı icin)
 MESSAGE_DELIMITER = '\n'
 
+# === Çerçeveli (length-prefixed) protokol ===
+# Satır sonlu mod uyumluluk için korunur; sunucu bağlantının ilk baytına bakarak modu seçer.
+FRAMING_NEWLINE = 'newline'
+FRAMING_FRAMED = 'framed'
+
+FRAME_MAGIC = b'KD'
+FRAME_VERSION = 1
+# magic (2) | sürüm (1) | tür (1) | bayraklar (1) | ayrılmış (1) | uzunluk (4, big-endian)
+FRAME_HEADER = struct.Struct('!2sBBBxI')
+
+# Çerçeve türleri
+FRAME_TYPE_JSON = 1
+
+# Çerçeve bayrakları: yükün sıkıştırma yöntemi
+FRAME_FLAG_ZLIB = 0x01
+FRAME_FLAG_ZSTD = 0x02
+# Başlığın arkasında (yükten önce, sıkıştırılmadan) 4 baytlık istek kimliği var
+FRAME_FLAG_REQUEST_ID = 0x04
+REQUEST_ID = struct.Struct('!I')
+
+# === İstek kimlikleri ===
+# İstemci isteklere artan bir kimlik verebilir; sunucu o isteğin tüm yanıtlarına (akıştaki her
+# parça, busy, error, not_modified) aynı kimliği ekler ve istekleri sırası karışık tamamlayabilir.
+# Çerçeveli modda kimlik çerçeve başlığında taşınır, satır sonlu modda JSON'daki "id" alanıdır.
+# Kimliksiz istekler (eski istemciler) ve sunucunun kendiliğinden gönderdiği bildirimler kimlik taşımaz.
+MAX_REQUEST_ID = 0xFFFFFFFF
+
+# İsteğe bağlı özellikler login sırasında anlaşılır; eski sunucular login'e yanıt vermediğinden
+# istemci anlaşılmamış bir özelliği (ör. cancel komutu) kullanmaz
+FEATURE_CANCEL = 'cancel'
+FEATURES = (FEATURE_CANCEL,)
+# Sunucunun tanımadığı komutlara verdiği hata metninin başı; ardından komut adı gelir
+UNKNOWN_COMMAND_ERROR = 'Bilinmeyen komut: '
+
+# Sıkıştırma yöntemleri (login sırasında anlaşılır, yalnızca çerçeveli modda kullanılır)
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_ZSTD = 'zstd'
+# Bu boyutun altındaki mesajlar sıkıştırılmaz
+COMPRESSION_THRESHOLD = 1024
+
+# Sunucunun istemciden kabul ettiği en büyük mesaj (istekler küçüktür)
+MAX_REQUEST_SIZE = 1024 * 1024
+# İstemcinin sunucudan kabul ettiği en büyük mesaj
+MAX_RESPONSE_SIZE = 512 * 1024 * 1024
+# Akış halinde gönderilen dosyaların parça boyutu (bayt)
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ProtocolError(Exception):
+    """Geçersiz çerçeve veya sınırı aşan mesaj."""
+    pass
+
+
+def encode_frame(payload, frame_type=FRAME_TYPE_JSON, flags=0, request_id=None):
+    """Yükün önüne sabit uzunluklu çerçeve başlığını (ve verildiyse istek kimliğini) ekler."""
+    if request_id is not None:
+        return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, frame_type, flags | FRAME_FLAG_REQUEST_ID,
+                                 REQUEST_ID.size + len(payload)) + REQUEST_ID.pack(request_id) + payload
+    return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, frame_type, flags, len(payload)) + payload
+
+def parse_frame_header(header, max_size):
+    """Çerçeve başlığını doğrular; (yük uzunluğu, bayraklar) döner."""
+    magic, version, frame_type, flags, length = FRAME_HEADER.unpack(header)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ProtocolError(f"Geçersiz çerçeve başlığı: {bytes(header)!r}")
+    if length > max_size:
+        raise ProtocolError(f"Mesaj boyutu sınırı aştı: {length} byte")
+    if flags & FRAME_FLAG_REQUEST_ID and length < REQUEST_ID.size:
+        raise ProtocolError(f"İstek kimliği için çerçeve çok kısa: {length} byte")
+    return length, flags
+
+def valid_request_id(value):
+    """JSON'dan okunan istek kimliğini doğrular; geçersizse None döner."""
+    if isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= MAX_REQUEST_ID:
+        return value
+    return None
+
+def with_request_id(data, framing, request_id):
+    """
+    to_wire ile kodlanmış mesaja istek kimliğini ekler. Çerçeveli modda yalnızca başlık
+    değişir, yük (sıkıştırılmış olsa da) aynen kullanılır; böylece bağlantılar arasında
+    paylaşılan önceden kodlanmış yanıtlar her istekte yeniden kodlanmaz.
+    """
+    if request_id is None:
+        return data
+    if framing == FRAMING_FRAMED:
+        magic, version, frame_type, flags, length = FRAME_HEADER.unpack_from(data)
+        header = FRAME_HEADER.pack(magic, version, frame_type, flags | FRAME_FLAG_REQUEST_ID, REQUEST_ID.size + length)
+        return header + REQUEST_ID.pack(request_id) + data[FRAME_HEADER.size:]
+    # Satır sonlu mesaj bir JSON nesnesidir: kimlik ilk alan olarak eklenir
+    return b'{"id": %d, ' % request_id + data[1:]
+
+def available_compressions():
+    """Bu ortamda kullanılabilen sıkıştırma yöntemleri, tercih sırasına göre."""
+    if zstandard is not None:
+        return [COMPRESSION_ZSTD, COMPRESSION_ZLIB]
+    return [COMPRESSION_ZLIB]
+
+def choose_compression(offered):
+    """İstemcinin sunduğu yöntemlerden bu ortamda desteklenen ilkini seçer; yoksa None."""
+    for method in available_compressions():
+        if method in (offered or []):
+            return method
+    return None
+
+def compress_payload(payload, compression):
+    """
+    Yükü sıkıştırır ve çerçeve bayrağıyla birlikte döner.
+    Sıkıştırma kazanç sağlamıyorsa yük olduğu gibi (bayrak 0) döner.
+    """
+    if compression == COMPRESSION_ZSTD and zstandard is not None:
+        compressed, flags = zstandard.ZstdCompressor(level=3).compress(payload), FRAME_FLAG_ZSTD
+    elif compression == COMPRESSION_ZLIB:
+        compressed, flags = zlib.compress(payload, 6), FRAME_FLAG_ZLIB
+    else:
+        return payload, 0
+    if len(compressed) >= len(payload):
+        return payload, 0
+    return compressed, flags
+
+def decompress_payload(payload, flags, max_size):
+    """Çerçeve bayraklarına göre yükü açar; açılmış boyut max_size'ı aşarsa ProtocolError."""
+    if flags & FRAME_FLAG_ZLIB:
+        decompressor = zlib.decompressobj()
+        try:
+            data = decompressor.decompress(payload, max_size + 1)
+        except zlib.error as e:
+            raise ProtocolError(f"Sıkıştırılmış mesaj açılamadı: {e}")
+        if len(data) > max_size or decompressor.unconsumed_tail:
+            raise ProtocolError(f"Mesaj boyutu sınırı aştı: {len(data)} byte")
+        return data
+    if flags & FRAME_FLAG_ZSTD:
+        if zstandard is None:
+            raise ProtocolError("zstd ile sıkıştırılmış mesaj alındı ancak zstandard kurulu değil")
+        try:
+            return zstandard.ZstdDecompressor().decompress(payload, max_output_size=max_size)
+        except zstandard.ZstdError as e:
+            raise ProtocolError(f"Sıkıştırılmış mesaj açılamadı: {e}")
+    return payload
+
+def to_wire(message, framing=FRAMING_NEWLINE, compression=None, request_id=None):
+    """
+    make_* fonksiyonlarının ürettiği satır sonlu mesajı (str veya bytes)
+    seçilen çerçeveleme moduna göre gönderime hazır baytlara çevirir.
+    Çerçeveli modda, compression verilmişse eşik üstündeki mesajlar sıkıştırılır.
+    request_id verilirse mesaja istek kimliği eklenir (bkz. with_request_id).
+    """
+    data = message.encode("utf-8") if isinstance(message, str) else message
+    if framing == FRAMING_FRAMED:
+        payload = data[:-1] if data.endswith(b'\n') else data
+        flags = 0
+        if compression and len(payload) >= COMPRESSION_THRESHOLD:
+            payload, flags = compress_payload(payload, compression)
+        return encode_frame(payload, flags=flags, request_id=request_id)
+    return with_request_id(data, framing, request_id)
+
+
+class MessageReader:
+    """
+    Soketten tam mesajlar okur.
+
+    Çerçeveli modda önce başlık, ardından tam olarak başlıktaki uzunluk kadar bayt
+    önceden ayrılmış bir bytearray'e recv_into ile okunur; büyük mesajlar doğrusal sürede alınır.
+    Satır sonlu modda tampon yalnızca son aramadan sonraki kısımda taranır.
+    framing None verilirse mod, gelen ilk bayta göre belirlenir.
+    Son okunan çerçevenin istek kimliği request_id'dedir (satır sonlu modda kimlik JSON'dadır).
+    """
+
+    def __init__(self, sock, framing=None, max_size=MAX_RESPONSE_SIZE, recv_size=65536):
+        self.sock = sock
+        self.framing = framing
+        self.max_size = max_size
+        self.recv_size = recv_size
+        self.request_id = None
+        self._buffer = bytearray()
+        self._scan_from = 0
+
+    def _fill(self):
+        """Tampona yeni veri okur; bağlantı kapandıysa False döner."""
+        data = self.sock.recv(self.recv_size)
+        if not data:
+            return False
+        self._buffer += data
+        return True
+
+    def _read_exact(self, size):
+        """Tam olarak size bayt okur; bağlantı mesaj ortasında kapanırsa ProtocolError."""
+        result = bytearray(size)
+        view = memoryview(result)
+        pos = min(len(self._buffer), size)
+        if pos:
+            view[:pos] = self._buffer[:pos]
+            del self._buffer[:pos]
+        while pos < size:
+            received = self.sock.recv_into(view[pos:], size - pos)
+            if not received:
+                raise ProtocolError("Bağlantı mesajın ortasında kapandı")
+            pos += received
+        return result
+
+    def read_payload(self):
+        """
+        Sıradaki mesajın yükünü (JSON baytları) döner.
+        Bağlantı mesaj sınırında kapandıysa None döner.
+        """
+        self.request_id = None
+        if self.framing is None:
+            if not self._buffer and not self._fill():
+                return None
+            self.framing = FRAMING_FRAMED if self._buffer[:1] == FRAME_MAGIC[:1] else FRAMING_NEWLINE
+
+        if self.framing == FRAMING_FRAMED:
+            return self._read_frame()
+        return self._read_line()
+
+    def _read_frame(self):
+        if not self._buffer:
+            if not self._fill():
+                return None
+        length, flags = parse_frame_header(self._read_exact(FRAME_HEADER.size), self.max_size)
+        if flags & FRAME_FLAG_REQUEST_ID:
+            self.request_id = REQUEST_ID.unpack(self._read_exact(REQUEST_ID.size))[0]
+            length -= REQUEST_ID.size
+        payload = self._read_exact(length)
+        if flags & (FRAME_FLAG_ZLIB | FRAME_FLAG_ZSTD):
+            return decompress_payload(payload, flags, self.max_size)
+        return bytes(payload)
+
+    def _read_line(self):
+        while True:
+            index = self._buffer.find(b'\n', self._scan_from)
+            if index >= 0:
+                payload = bytes(self._buffer[:index])
+                del self._buffer[:index + 1]
+                self._scan_from = 0
+                return payload
+            self._scan_from = len(self._buffer)
+            if self._scan_from > self.max_size:
+                raise ProtocolError(f"Mesaj boyutu sınırı aştı: {self._scan_from} byte")
+            if not self._fill():
+                return None
+
+
+class AsyncMessageReader:
+    """
+    MessageReader'ın asyncio.StreamReader üzerinde çalışan karşılığı.
+    Satır sonlu modda StreamReader'ın limit değeri en büyük mesaj boyutunu belirler.
+    """
+
+    def __init__(self, stream, framing=None, max_size=MAX_RESPONSE_SIZE):
+        self.stream = stream
+        self.framing = framing
+        self.max_size = max_size
+        self.request_id = None
+        # Mod algılamak için okunmuş ilk bayt
+        self._prefix = b''
+
+    async def read_payload(self):
+        """Sıradaki mesajın yükünü döner; bağlantı mesaj sınırında kapandıysa None."""
+        self.request_id = None
+        try:
+            if self.framing is None:
+                self._prefix = await self.stream.readexactly(1)
+                self.framing = FRAMING_FRAMED if self._prefix == FRAME_MAGIC[:1] else FRAMING_NEWLINE
+
+            if self.framing == FRAMING_FRAMED:
+                header = self._prefix + await self.stream.readexactly(FRAME_HEADER.size - len(self._prefix))
+                self._prefix = b''
+                length, flags = parse_frame_header(header, self.max_size)
+                if flags & FRAME_FLAG_REQUEST_ID:
+                    self.request_id = REQUEST_ID.unpack(await self.stream.readexactly(REQUEST_ID.size))[0]
+                    length -= REQUEST_ID.size
+                payload = await self.stream.readexactly(length)
+                if flags & (FRAME_FLAG_ZLIB | FRAME_FLAG_ZSTD):
+                    return decompress_payload(payload, flags, self.max_size)
+                return payload
+
+            line = await self.stream.readuntil(b'\n')
+            payload = self._prefix + line[:-1]
+            self._prefix = b''
+            return payload
+        except asyncio.IncompleteReadError as e:
+            if self.framing == FRAMING_FRAMED and (e.partial or self._prefix):
+                raise ProtocolError("Bağlantı mesajın ortasında kapandı")
+            return None
+        except asyncio.LimitOverrunError as e:
+            raise ProtocolError(f"Mesaj boyutu sınırı aştı: {e.consumed} byte")
+
+
 # === Mesaj Olusturucular ===
 
 def make_get_users_message():
@@ -18,11 +316,66 @@ def make_users_response(users):
     """
     return json.dumps({"response": "users", "users": users}) + MESSAGE_DELIMITER
 
-def make_get_tree_message():
-    return json.dumps({"command": "get_tree"}) + MESSAGE_DELIMITER
+def make_get_tree_message(version=None):
+    """
+    Dosya ağacını ister.
+    version: İstemcideki ağacın sürümü; sunucudaki ile aynıysa not_modified yanıtı gelir.
+    """
+    message = {"command": "get_tree"}
+    if version:
+        message["if_version"] = version
+    return json.dumps(message) + MESSAGE_DELIMITER
 
-def make_get_file_message(path):
-    return json.dumps({"command": "get_file", "path": path}) + MESSAGE_DELIMITER
+def make_get_file_message(path, version=None):
+    """
+    Dosya içeriğini ister.
+    version: İstemcideki içeriğin sürümü; dosya değişmediyse not_modified yanıtı gelir.
+    """
+    message = {"command": "get_file", "path": path}
+    if version:
+        message["if_version"] = version
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_get_file_range_message(path, offset=0, length=None, version=None):
+    """
+    Dosyanın bir bölümünü file_chunk mesajları halinde ister.
+    offset/length bayt cinsindendir; length verilmezse dosya sonuna kadar gönderilir.
+    version: İstemcideki içeriğin sürümü; dosya değişmediyse not_modified yanıtı gelir.
+    """
+    message = {"command": "get_file_range", "path": path, "offset": offset}
+    if length is not None:
+        message["length"] = length
+    if version:
+        message["if_version"] = version
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_list_dir_message(path="", depth=1):
+    """
+    Bir klasörün içeriğini ister (tüm ağaç yerine).
+    depth: Listelenecek seviye sayısı; 1 yalnızca doğrudan içeriktir.
+    """
+    return json.dumps({"command": "list_dir", "path": path, "depth": depth}) + MESSAGE_DELIMITER
+
+def make_search_message(query, limit=100):
+    """
+    Paylaşılan klasördeki metin dosyalarında arama ister (büyük/küçük harf duyarsız).
+    limit: En fazla sonuç (eşleşen satır) sayısı
+    """
+    return json.dumps({"command": "search", "query": query, "limit": limit}) + MESSAGE_DELIMITER
+
+def make_find_path_message(query, limit=50, mode="fuzzy"):
+    """
+    Adı veya yolu sorguyla eşleşen dosyaları ister (hızlı açma).
+    mode: "prefix", "substring" veya "fuzzy" (harfler sırayla geçiyorsa eşleşir)
+    """
+    return json.dumps({"command": "find_path", "query": query, "limit": limit, "mode": mode}) + MESSAGE_DELIMITER
+
+def make_cancel_message(request_id):
+    """
+    Yanıtı artık beklenmeyen isteği iptal eder (ör. kullanıcı başka bir dosyaya geçti).
+    Sunucu kuyruktaki isteği atlar, süren akışı durdurur; bu mesaja yanıt gönderilmez.
+    """
+    return json.dumps({"command": "cancel", "request_id": request_id}) + MESSAGE_DELIMITER
 
 def make_update_settings_message(excluded_dirs, excluded_exts):
     """
@@ -34,17 +387,140 @@ def make_update_settings_message(excluded_dirs, excluded_exts):
         "excluded_exts": excluded_exts
     }) + MESSAGE_DELIMITER
 
-def make_login_message(name):
+def make_login_message(name, compression=None, features=None):
     """
     Kullanıcı adı ile giriş komutu oluşturur.
+    compression: İstemcinin açabildiği sıkıştırma yöntemleri; verilirse sunucu login yanıtında birini seçer.
+    features: İstemcinin kullanabildiği isteğe bağlı özellikler; sunucu desteklediklerini login yanıtında bildirir.
+    """
+    message = {"command": "login", "name": name}
+    if compression is not None:
+        message["compression"] = compression
+    if features is not None:
+        message["features"] = features
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_login_response(compression, features=None):
     """
-    return json.dumps({"command": "login", "name": name}) + MESSAGE_DELIMITER
+    Sıkıştırma veya özellik sunan login isteğine yanıt. compression: Seçilen yöntem veya None.
+    features: Sunulanlardan sunucunun da desteklediği özellikler.
+    Bu yanıttan sonraki mesajlar seçilen yöntemle sıkıştırılabilir.
+    """
+    message = {"response": "login", "compression": compression}
+    if features is not None:
+        message["features"] = features
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_tree_response(data, live_updates=False, version=None):
+    """
+    Dosya ağacı yanıtı oluşturur.
+    live_updates: Sunucu değişiklikleri tree_delta/file_changed ile bildiriyorsa True;
+    istemci bu durumda periyodik yenilemeyi bırakabilir.
+    version: Ağacın sürüm etiketi (içerik özeti)
+    """
+    message = {"response": "tree", "data": data}
+    if version is not None:
+        message["version"] = version
+    if live_updates:
+        message["live_updates"] = True
+    return json.dumps(message) + MESSAGE_DELIMITER
 
-def make_tree_response(data):
-    return json.dumps({"response": "tree", "data": data}) + MESSAGE_DELIMITER
+def make_encoded_tree_response(data_json, version=None, live_updates=False):
+    """
+    Önceden JSON'a çevrilmiş ağaçtan gönderime hazır yanıt baytlarını oluşturur.
+    Sunucu bu baytları ağaç değişene kadar saklayıp tüm bağlantılara aynen gönderir.
+    make_tree_response ile aynı mesajı üretir.
+    """
+    extra = ""
+    if version is not None:
+        extra += ', "version": ' + json.dumps(version)
+    if live_updates:
+        extra += ', "live_updates": true'
+    return ('{"response": "tree", "data": ' + data_json + extra + '}' + MESSAGE_DELIMITER).encode("utf-8")
 
-def make_file_response(path, content):
-    return json.dumps({"response": "file", "path": path, "content": content}) + MESSAGE_DELIMITER
+def make_dir_listing_response(path, data, depth, live_updates=False):
+    """
+    list_dir yanıtı. data ağaç formatındadır ({"files": [...], "children": {...}});
+    derinlik sınırındaki alt klasörlerin değeri None'dır.
+    """
+    return json.dumps({"response": "dir_listing", "path": path, "depth": depth,
+                       "data": data, "live_updates": live_updates}) + MESSAGE_DELIMITER
+
+def make_search_response(query, results, truncated=False):
+    """
+    search yanıtı.
+    results: Liste[dict] -> {"path": str, "line": int (1'den başlar), "column": int, "snippet": str}
+    truncated: Sonuçlar limit nedeniyle kesildiyse True
+    """
+    return json.dumps({"response": "search_results", "query": query,
+                       "results": results, "truncated": truncated}) + MESSAGE_DELIMITER
+
+def make_path_matches_response(query, paths):
+    """
+    find_path yanıtı. paths: En iyi eşleşme önce olacak şekilde göreli dosya yolları
+    """
+    return json.dumps({"response": "path_matches", "query": query, "paths": paths}) + MESSAGE_DELIMITER
+
+def make_tree_delta_message(changes, reset=False, version=None):
+    """
+    Dosya ağacındaki değişiklikleri bildiren mesaj oluşturur.
+    changes: Liste[dict] -> {"op": "add"|"remove", "type": "file"|"dir", "path": str}
+             Eklenen klasörler için "tree" alanı alt ağacı içerir.
+             Yeniden adlandırma, aynı mesajda bir remove ve bir add olarak gelir.
+    reset: True ise değişiklikler kaçırılmıştır, istemci ağacı baştan istemelidir.
+    version: Değişiklikler uygulandıktan sonraki ağaç sürümü
+    """
+    message = {"response": "tree_delta", "changes": changes}
+    if version is not None:
+        message["version"] = version
+    if reset:
+        message["reset"] = True
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_file_changed_message(paths):
+    """
+    İçeriği değişen dosyaları bildiren mesaj oluşturur.
+    paths: Liste[str] (göreli dosya yolları)
+    """
+    return json.dumps({"response": "file_changed", "paths": paths}) + MESSAGE_DELIMITER
+
+def make_file_response(path, content, version=None):
+    message = {"response": "file", "path": path, "content": content}
+    if version is not None:
+        message["version"] = version
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_file_chunk_response(path, offset, length, total_size, content, eof, version=None):
+    """
+    get_file_range isteğine gönderilen parçalardan biri.
+    offset/length parçanın dosyadaki bayt aralığı, total_size dosyanın toplam boyutudur.
+    eof: İstenen aralığın son parçasıysa True.
+    """
+    message = {"response": "file_chunk", "path": path, "offset": offset, "length": length,
+               "total_size": total_size, "eof": eof, "content": content}
+    if version is not None:
+        message["version"] = version
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_not_modified_response(target, version, path=None):
+    """
+    Koşullu isteğe verilen "değişmedi" yanıtı oluşturur.
+    target: "tree" veya "file"
+    """
+    message = {"response": "not_modified", "target": target, "version": version}
+    if path is not None:
+        message["path"] = path
+    return json.dumps(message) + MESSAGE_DELIMITER
+
+def make_busy_response(command, retry_after, path=None):
+    """
+    Sunucu yoğunken kabul edilmeyen istek için yanıt oluşturur.
+    İstemci isteği retry_after saniye sonra tekrarlayabilir.
+    """
+    message = {"response": "busy", "command": command, "retry_after": retry_after}
+    if path is not None:
+        message["path"] = path
+    return json.dumps(message) + MESSAGE_DELIMITER
 
 def make_error_response(error_message):
     """
@@ -64,7 +540,9 @@ def make_settings_response(success, message=""):
 
 # === Mesaj Ayrıştırıcı ===
 def parse_message(message_str):
+    """Mesajı (str veya UTF-8 bytes) ayrıştırır; geçersizse None döner."""
     try:
         return json.loads(message_str)
-    except json.JSONDecodeError:
+    except ValueError:
+        # json.JSONDecodeError ve geçersiz UTF-8 (UnicodeDecodeError)
         return None
@@ -0,0 +1,57 @@
+"""
+Dosya parçalarının bayt konumlarını sınar: önbellekten ve diskten gönderilen parçalar
+aynı konum uzayını kullanmalı, parça sınırları UTF-8 karakterlerini bölmemelidir.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server.file_browser import ContentCache, iter_file_chunks, iter_text_chunks
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FileChunkOffsetsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.share = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.share, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.share, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_cached_crlf_content_matches_disk_offsets(self):
+        data = b"0123456789abcdefghi\r\n" * 20000
+        path = self._write("crlf.txt", data)
+
+        content, _, error = ContentCache(16 * 1024 * 1024).get(self.share, "crlf.txt")
+        self.assertIsNone(error)
+        self.assertEqual(len(content.encode('utf-8')), len(data))
+        cached = [(offset, length) for offset, length, _ in iter_text_chunks(content, CHUNK_SIZE)]
+        disk = [(offset, length) for offset, length, _ in iter_file_chunks(path, 0, None, CHUNK_SIZE)]
+        self.assertEqual(cached, disk)
+
+    def test_range_starting_inside_character_keeps_its_end(self):
+        # "ş" PAGE_SIZE - 1. bayttan başlar; sayfa sınırı karakterin ortasına denk gelir
+        data = b"a" * (CHUNK_SIZE - 1) + "ş".encode('utf-8') + b"b" * (CHUNK_SIZE - 1)
+        path = self._write("tr.txt", data)
+
+        first = list(iter_file_chunks(path, 0, CHUNK_SIZE, CHUNK_SIZE))
+        self.assertEqual([(offset, length) for offset, length, _ in first], [(0, CHUNK_SIZE + 1)])
+        second = list(iter_file_chunks(path, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE))
+        self.assertEqual([(offset, length) for offset, length, _ in second], [(CHUNK_SIZE + 1, CHUNK_SIZE - 1)])
+        # Yalnızca karakterin devam baytını kapsayan aralık boş döner, sonraki sayfayla çakışmaz
+        self.assertEqual(list(iter_file_chunks(path, CHUNK_SIZE, 1, CHUNK_SIZE)), [])
+        self.assertEqual(first[0][2] + second[0][2], data.decode('utf-8'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Arayüzün dosya akışlarını istemci önbelleğine yazmasını sınar. Sunucu yerine istekleri kaydeden
+bir bağlantı kullanılır; yanıtlar handle_file_chunk'a doğrudan verilir.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication
+from client.kodaman_client import FileBrowserGUI, LARGE_FILE_THRESHOLD
+from client.content_cache import ContentCache
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class RecordingClient:
+    """İstekleri yalnızca kaydeden bağlantı; her isteğe yeni bir kimlik verir."""
+
+    def __init__(self):
+        self.requests = []
+
+    def request_file_range(self, path, offset=0, length=None, version=None):
+        self.requests.append((path, offset, length))
+        return len(self.requests)
+
+    def cancel(self, request_id):
+        return True
+
+    def expire_requests(self):
+        return []
+
+
+class StreamCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        # Tercihler ve disk önbelleği depodaki dosyalara yazılmasın
+        self.config_dir = tempfile.mkdtemp()
+        self.gui = FileBrowserGUI(self.config_dir)
+        self.gui.content_cache = ContentCache()
+        self.gui.content_cache.set_server("test:9009")
+        self.gui.client = RecordingClient()
+        self.gui.navbar.connection_status = "connected"
+
+    def tearDown(self):
+        self.gui.close()
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def _chunk(self, path, content, total_size, eof, version):
+        return {"response": "file_chunk", "path": path, "offset": 0, "length": len(content.encode("utf-8")),
+                "total_size": total_size, "content": content, "eof": eof, "version": version,
+                "id": len(self.gui.client.requests)}
+
+    def test_cancelled_stream_parts_are_not_cached_for_large_file(self):
+        self.gui.open_file("a.py")
+        self.gui.handle_file_chunk(self._chunk("a.py", "AAAAA", 10, False, "va"))
+        # a.py bitmeden büyük dosyaya geçilir; büyük dosyalar önbelleğe alınmaz
+        self.gui.open_file("big.csv")
+        self.gui.handle_file_chunk(self._chunk("big.csv", "x,y\n" * 1000, LARGE_FILE_THRESHOLD * 25, True, "v1"))
+
+        self.assertEqual(self.gui.content_cache.get("big.csv"), (None, None))
+        self.assertEqual(self.gui.content_cache.get("a.py"), (None, None))
+
+    def test_completed_stream_is_cached(self):
+        self.gui.open_file("a.py")
+        self.gui.handle_file_chunk(self._chunk("a.py", "AAAAA", 5, True, "va"))
+        self.assertEqual(self.gui.content_cache.get("a.py"), ("AAAAA", "va"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Büyük dosya görüntüleyicinin sayfa isteklerini sınar. Sunucu yanıtları iter_file_chunks ile
+üretilir; karakterin ortasına denk gelen sayfa sınırları sunucuda ileri kaydırılır.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from PyQt5.QtWidgets import QApplication
+from client.large_file_viewer import LargeFileViewer, PAGE_SIZE
+from client.lang_manager import LangManager
+from server.file_browser import iter_file_chunks
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class LargeFileViewerPagingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.share = tempfile.mkdtemp()
+        self.path = os.path.join(self.share, "tr.txt")
+        self.viewer = LargeFileViewer(LangManager(os.path.join(ROOT, "client", "lang")))
+        self.requests = []
+        self.viewer.range_requested.connect(lambda path, offset, length: self.requests.append((offset, length)))
+
+    def tearDown(self):
+        self.viewer.close_file()
+        shutil.rmtree(self.share, ignore_errors=True)
+
+    def _open(self, data):
+        self.data = data
+        with open(self.path, "wb") as f:
+            f.write(data)
+        self.viewer.open("tr.txt", len(data), "1")
+
+    def _serve(self):
+        """
+        Bekleyen istekleri sunucu gibi yanıtlar; eof'tan sonra istemci aralığı bırakır.
+        Mesajlar ReceiverThread'in hazırladığı gibidir: content'te satır sonları çevrilmiş, raw_content ham metindir.
+        """
+        served = 0
+        while self.requests:
+            offset, length = self.requests.pop(0)
+            served += 1
+            self.assertLess(served, 100, "görüntüleyici aynı aralıkları istemeye devam ediyor")
+            chunks = list(iter_file_chunks(self.path, offset, length, PAGE_SIZE)) or [(offset, 0, "")]
+            for i, (chunk_offset, chunk_length, content) in enumerate(chunks):
+                self.viewer.add_chunk({"path": "tr.txt", "offset": chunk_offset, "length": chunk_length,
+                                       "total_size": len(self.data), "content": content.replace("\r\n", "\n"),
+                                       "raw_content": content,
+                                       "eof": i == len(chunks) - 1, "version": "1"})
+            self.viewer.release_range(offset, length)
+
+    def test_scrolling_up_across_character_split_by_page_boundary(self):
+        # Satırlar çift uzunlukta ve tek konumdan başlar; sayfa sınırları çoğunlukla "ğ"nin ortasına düşer
+        self._open(b"a" + ("ğ" * 40 + "a\n").encode("utf-8") * 8000)
+        middle = len(self.data) // 2
+        self.assertEqual(self.data[middle - middle % PAGE_SIZE] & 0xC0, 0x80)
+        self.viewer.position_bar.setValue(middle // self.viewer._scale)
+        self._serve()
+        self.assertGreater(self.viewer._window_start, 0)
+
+        for _ in range(len(self.data) // PAGE_SIZE + 1):
+            if self.viewer._window_start == 0:
+                break
+            self.viewer._on_window_scrolled(0)
+            self._serve()
+        self.assertEqual(self.viewer._window_start, 0)
+        text = self.viewer.text_edit.toPlainText()
+        self.assertTrue(text)
+        self.assertTrue(self.data.decode("utf-8").startswith(text))
+
+    def test_crlf_positions_match_file_offsets(self):
+        line_length = len(b"satir-000000 \xc3\xa7\r\n")
+        self._open(b"".join(f"satir-{i:06d} ç\r\n".encode("utf-8") for i in range(1, 40001)))
+
+        self.viewer.go_to_line(30000)
+        self._serve()
+        self.assertEqual(self.viewer._top_byte(), 29999 * line_length)
+        self.assertEqual(self.viewer.text_edit.firstVisibleBlock().text(), "satir-030000 ç")
+
+        # Aynı konumdaki yeniden çizim pencereyi kaydırmaz
+        self.viewer._window = []
+        self.viewer._render()
+        self._serve()
+        self.assertEqual(self.viewer._top_byte(), 29999 * line_length)
+        self.assertEqual(self.viewer.text_edit.firstVisibleBlock().text(), "satir-030000 ç")
+        self.assertNotIn("\r", self.viewer.text_edit.toPlainText())
+
+
+if __name__ == "__main__":
+    unittest.main()
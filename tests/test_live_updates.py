@@ -0,0 +1,111 @@
+"""
+Değişiklik izleyicinin ağaç farklarını (tree_delta) arama indeksi ve ağaç indeksi kapalıyken de
+gönderdiğini sınar. İstemci ağacı yalnızca list_dir ile ister; get_tree hiç çağrılmaz.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import server
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LiveUpdatesWithoutIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.share = tempfile.mkdtemp()
+        with open(os.path.join(self.share, "a.txt"), "w", encoding="utf-8") as f:
+            f.write("a")
+        self.saved = {name: getattr(server, name) for name in
+                      ("HOST", "PORT", "ENGINE", "SEARCH_INDEX", "TREE_INDEX_FILE", "WATCH_CHANGES", "WATCH_POLL_INTERVAL")}
+        server.HOST = "127.0.0.1"
+        server.PORT = _free_port()
+        server.ENGINE = "threaded"
+        server.SEARCH_INDEX = False
+        server.TREE_INDEX_FILE = None
+        server.WATCH_CHANGES = True
+        server.WATCH_POLL_INTERVAL = 0.2
+        server.tree_cache.invalidate()
+        self.thread = threading.Thread(target=server.start_server, args=(self.share,), daemon=True)
+        self.thread.start()
+        self.sock = self._connect()
+        self.buffer = b""
+
+    def tearDown(self):
+        self.sock.close()
+        server.stop_server()
+        self.thread.join(5)
+        for name, value in self.saved.items():
+            setattr(server, name, value)
+        server.tree_cache.invalidate()
+        shutil.rmtree(self.share, ignore_errors=True)
+
+    def _connect(self):
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                sock = socket.create_connection((server.HOST, server.PORT), timeout=5)
+                return sock
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def _send(self, message):
+        self.sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+    def _receive(self):
+        while b"\n" not in self.buffer:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError
+            self.buffer += data
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def _wait_for(self, message_type, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            message = self._receive()
+            if message.get("response") == message_type:
+                return message
+        self.fail(f"{message_type} mesajı gelmedi")
+
+    def _list_root(self):
+        self._send({"command": "list_dir", "path": ""})
+        return self._wait_for("dir_listing")
+
+    def test_created_file_is_sent_as_tree_delta(self):
+        # Ağaç arka planda oluşturulana kadar istemciye yoklama yapması söylenir
+        deadline = time.monotonic() + 5
+        while not self._list_root().get("live_updates"):
+            self.assertLess(time.monotonic(), deadline, "live_updates hiç bildirilmedi")
+            time.sleep(0.1)
+
+        with open(os.path.join(self.share, "b.txt"), "w", encoding="utf-8") as f:
+            f.write("b")
+        delta = self._wait_for("tree_delta")
+        self.assertFalse(delta.get("reset"))
+        self.assertIn({"op": "add", "type": "file", "path": "b.txt"}, delta["changes"])
+
+    def test_get_tree_and_list_dir_agree_on_live_updates(self):
+        self._send({"command": "get_tree"})
+        tree = self._wait_for("tree")
+        self.assertTrue(tree.get("live_updates"))
+        self.assertEqual(self._list_root().get("live_updates"), tree.get("live_updates"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,296 @@
+"""
+Protokolün gidiş-dönüşünü sınar: to_wire ile kodlanan mesajlar MessageReader ve
+AsyncMessageReader ile parça parça okunduğunda aynı yükü ve istek kimliğini vermeli,
+bozuk ve sınırı aşan çerçeveler ProtocolError ile reddedilmelidir. Sıkıştırma anlaşması
+sunucunun process_message'ına baytları biriktiren bir bağlantıyla login gönderilerek sınanır.
+"""
+import os
+import sys
+import json
+import zlib
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared import protocol
+from server import server
+
+
+class FakeSocket:
+    """Verilen baytları her recv çağrısında en fazla step bayt olacak şekilde döner."""
+
+    def __init__(self, data, step=1):
+        self.data = bytes(data)
+        self.step = step
+
+    def recv(self, size):
+        size = min(size, self.step)
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+    def recv_into(self, view, size):
+        chunk = self.recv(size)
+        view[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def _read_all(data, framing=None, step=1, max_size=protocol.MAX_RESPONSE_SIZE):
+    """Tüm mesajları (yük, istek kimliği) olarak okur."""
+    reader = protocol.MessageReader(FakeSocket(data, step), framing, max_size)
+    messages = []
+    while True:
+        payload = reader.read_payload()
+        if payload is None:
+            return messages
+        messages.append((bytes(payload), reader.request_id))
+
+
+def _read_all_async(data, framing=None, step=1, max_size=protocol.MAX_RESPONSE_SIZE):
+    """Veriyi StreamReader'a step baytlık parçalar halinde verip tüm mesajları okur."""
+    async def run():
+        stream = asyncio.StreamReader()
+
+        async def feed():
+            for i in range(0, len(data), step):
+                stream.feed_data(data[i:i + step])
+                await asyncio.sleep(0)
+            stream.feed_eof()
+
+        feeder = asyncio.ensure_future(feed())
+        reader = protocol.AsyncMessageReader(stream, framing, max_size)
+        messages = []
+        try:
+            while True:
+                payload = await reader.read_payload()
+                if payload is None:
+                    return messages
+                messages.append((bytes(payload), reader.request_id))
+        finally:
+            feeder.cancel()
+
+    return asyncio.run(run())
+
+
+def _payload(message):
+    return message.encode("utf-8").rstrip(b"\n")
+
+
+class MessageReaderTest(unittest.TestCase):
+
+    messages = [
+        protocol.make_get_tree_message(),
+        protocol.make_search_message("ağaç önbelleği"),
+        protocol.make_file_response("büyük.txt", "satır\n" * 2000, "v1"),
+    ]
+
+    def _check_round_trip(self, read):
+        for framing in (protocol.FRAMING_NEWLINE, protocol.FRAMING_FRAMED):
+            data = b"".join(protocol.to_wire(message, framing, request_id=i or None)
+                            for i, message in enumerate(self.messages))
+            # Okuyucu modu ilk bayttan algılar veya açıkça verilen modu kullanır
+            for reader_framing in (None, framing):
+                with self.subTest(framing=framing, reader_framing=reader_framing):
+                    received = read(data, reader_framing)
+                    self.assertEqual(len(received), len(self.messages))
+                    for i, (message, (payload, request_id)) in enumerate(zip(self.messages, received)):
+                        if framing == protocol.FRAMING_FRAMED:
+                            self.assertEqual(payload, _payload(message))
+                            self.assertEqual(request_id, i or None)
+                        else:
+                            # Satır sonlu modda kimlik JSON'daki "id" alanındadır
+                            decoded = json.loads(payload)
+                            self.assertEqual(decoded.pop("id", None), i or None)
+                            self.assertEqual(decoded, json.loads(message))
+                            self.assertIsNone(request_id)
+
+    def test_round_trip_with_partial_reads(self):
+        self._check_round_trip(lambda data, framing: _read_all(data, framing, step=1))
+        self._check_round_trip(lambda data, framing: _read_all(data, framing, step=7))
+
+    def test_async_round_trip_with_partial_reads(self):
+        self._check_round_trip(lambda data, framing: _read_all_async(data, framing, step=5))
+
+    def test_bad_magic_is_rejected(self):
+        frame = protocol.encode_frame(b'{"command": "get_tree"}')
+        for bad in (b"XY" + frame[2:], frame[:2] + bytes([protocol.FRAME_VERSION + 1]) + frame[3:]):
+            with self.assertRaises(protocol.ProtocolError):
+                _read_all(bad, protocol.FRAMING_FRAMED)
+            with self.assertRaises(protocol.ProtocolError):
+                _read_all_async(bad, protocol.FRAMING_FRAMED)
+
+    def test_oversize_frame_is_rejected(self):
+        frame = protocol.encode_frame(b"x" * 2048)
+        self.assertEqual(_read_all(frame, max_size=2048, step=4096), [(b"x" * 2048, None)])
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all(frame, max_size=1024, step=4096)
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all_async(frame, max_size=1024, step=4096)
+        # Başlık yeterince büyük bir uzunluk bildirir ama yük hiç gelmez; okunmadan reddedilmeli
+        header = protocol.FRAME_HEADER.pack(protocol.FRAME_MAGIC, protocol.FRAME_VERSION,
+                                            protocol.FRAME_TYPE_JSON, 0, 1024 * 1024)
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all(header, max_size=1024)
+
+    def test_oversize_line_is_rejected(self):
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all(b"x" * 4096 + b"\n", protocol.FRAMING_NEWLINE, step=512, max_size=1024)
+
+    def test_connection_closed_mid_frame(self):
+        frame = protocol.encode_frame(b'{"command": "get_tree"}', request_id=3)
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all(frame[:-3])
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all_async(frame[:-3])
+        # Mesaj sınırında kapanan bağlantı hata değildir
+        self.assertEqual(_read_all(frame), [(b'{"command": "get_tree"}', 3)])
+
+
+class RequestIdTest(unittest.TestCase):
+
+    def test_with_request_id_matches_to_wire(self):
+        message = protocol.make_file_response("a.txt", "içerik " * 500, "v1")
+        for framing in (protocol.FRAMING_NEWLINE, protocol.FRAMING_FRAMED):
+            for compression in (None, protocol.COMPRESSION_ZLIB):
+                with self.subTest(framing=framing, compression=compression):
+                    shared = protocol.to_wire(message, framing, compression)
+                    self.assertEqual(protocol.with_request_id(shared, framing, None), shared)
+                    self.assertEqual(protocol.with_request_id(shared, framing, 42),
+                                     protocol.to_wire(message, framing, compression, request_id=42))
+
+    def test_request_id_survives_compression(self):
+        message = protocol.make_file_response("a.txt", "içerik " * 500, "v1")
+        data = protocol.with_request_id(
+            protocol.to_wire(message, protocol.FRAMING_FRAMED, protocol.COMPRESSION_ZLIB),
+            protocol.FRAMING_FRAMED, protocol.MAX_REQUEST_ID)
+        self.assertEqual(_read_all(data, step=100), [(_payload(message), protocol.MAX_REQUEST_ID)])
+
+    def test_valid_request_id(self):
+        self.assertEqual(protocol.valid_request_id(0), 0)
+        self.assertEqual(protocol.valid_request_id(protocol.MAX_REQUEST_ID), protocol.MAX_REQUEST_ID)
+        for value in (-1, protocol.MAX_REQUEST_ID + 1, True, "1", 1.0, None):
+            self.assertIsNone(protocol.valid_request_id(value))
+
+
+class CompressionTest(unittest.TestCase):
+
+    message = protocol.make_file_response("a.txt", "sıkıştırılabilir satır\n" * 1000, "v1")
+
+    def test_choose_compression(self):
+        preferred = protocol.available_compressions()[0]
+        self.assertEqual(protocol.choose_compression([protocol.COMPRESSION_ZLIB, protocol.COMPRESSION_ZSTD]),
+                         preferred)
+        self.assertEqual(protocol.choose_compression([protocol.COMPRESSION_ZLIB]), protocol.COMPRESSION_ZLIB)
+        self.assertIsNone(protocol.choose_compression(["lz4"]))
+        self.assertIsNone(protocol.choose_compression([]))
+        self.assertIsNone(protocol.choose_compression(None))
+
+    def test_choose_compression_without_zstandard(self):
+        saved, protocol.zstandard = protocol.zstandard, None
+        try:
+            self.assertEqual(protocol.available_compressions(), [protocol.COMPRESSION_ZLIB])
+            self.assertEqual(protocol.choose_compression([protocol.COMPRESSION_ZSTD, protocol.COMPRESSION_ZLIB]),
+                             protocol.COMPRESSION_ZLIB)
+            self.assertIsNone(protocol.choose_compression([protocol.COMPRESSION_ZSTD]))
+        finally:
+            protocol.zstandard = saved
+
+    def _check_compressed_round_trip(self, compression, flag):
+        data = protocol.to_wire(self.message, protocol.FRAMING_FRAMED, compression)
+        _, _, _, flags, length = protocol.FRAME_HEADER.unpack_from(data)
+        self.assertEqual(flags, flag)
+        self.assertLess(length, len(self.message))
+        self.assertEqual(_read_all(data, step=333), [(_payload(self.message), None)])
+        self.assertEqual(_read_all_async(data, step=333), [(_payload(self.message), None)])
+
+    def test_zlib_round_trip(self):
+        self._check_compressed_round_trip(protocol.COMPRESSION_ZLIB, protocol.FRAME_FLAG_ZLIB)
+
+    @unittest.skipIf(protocol.zstandard is None, "zstandard kurulu değil")
+    def test_zstd_round_trip(self):
+        self._check_compressed_round_trip(protocol.COMPRESSION_ZSTD, protocol.FRAME_FLAG_ZSTD)
+
+    def test_small_and_incompressible_payloads_are_sent_as_is(self):
+        small = protocol.make_get_tree_message()
+        self.assertEqual(protocol.to_wire(small, protocol.FRAMING_FRAMED, protocol.COMPRESSION_ZLIB),
+                         protocol.to_wire(small, protocol.FRAMING_FRAMED))
+        random_bytes = os.urandom(4096)
+        self.assertEqual(protocol.compress_payload(random_bytes, protocol.COMPRESSION_ZLIB), (random_bytes, 0))
+
+    def test_decompressed_size_is_limited(self):
+        frame = protocol.encode_frame(zlib.compress(b"x" * 1024 * 1024), flags=protocol.FRAME_FLAG_ZLIB)
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all(frame, step=4096, max_size=64 * 1024)
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all_async(frame, step=4096, max_size=64 * 1024)
+
+    def test_corrupt_compressed_payload_is_rejected(self):
+        frame = protocol.encode_frame(b"not zlib data", flags=protocol.FRAME_FLAG_ZLIB)
+        with self.assertRaises(protocol.ProtocolError):
+            _read_all(frame, step=4096)
+
+
+class RecordingConnection:
+    """Sunucunun gönderdiği baytları biriktiren bağlantı."""
+
+    def __init__(self):
+        self.data = b""
+
+    def sendall(self, data):
+        self.data += data
+
+
+class LoginNegotiationTest(unittest.TestCase):
+    """Sunucu sıkıştırmayı login sırasında, yalnızca çerçeveli bağlantılar için seçer."""
+
+    def setUp(self):
+        self.saved = server.COMPRESSION
+
+    def tearDown(self):
+        server.COMPRESSION = self.saved
+        server.active_users.clear()
+
+    def _login(self, framing, offered, features=None):
+        session = server.ClientSession(RecordingConnection(), ("127.0.0.1", 1))
+        session.framing = framing
+        server.process_message(session, _payload(protocol.make_login_message("test", offered, features)))
+        responses = [json.loads(payload) for payload, _ in _read_all(session.conn.data, framing, step=4096)]
+        return session, responses
+
+    def test_framed_login_chooses_compression(self):
+        for offered, chosen in (([protocol.COMPRESSION_ZSTD, protocol.COMPRESSION_ZLIB],
+                                 protocol.available_compressions()[0]),
+                                ([protocol.COMPRESSION_ZLIB], protocol.COMPRESSION_ZLIB),
+                                (["lz4"], None)):
+            with self.subTest(offered=offered):
+                session, responses = self._login(protocol.FRAMING_FRAMED, offered)
+                self.assertEqual(responses, [{"response": "login", "compression": chosen}])
+                self.assertEqual(session.compression, chosen)
+
+        # Sonraki büyük yanıtlar seçilen yöntemle sıkıştırılır
+        session, _ = self._login(protocol.FRAMING_FRAMED, [protocol.COMPRESSION_ZLIB])
+        session.conn.data = b""
+        message = protocol.make_file_response("a.txt", "satır\n" * 2000, "v1")
+        session.send(message)
+        self.assertEqual(protocol.FRAME_HEADER.unpack_from(session.conn.data)[3], protocol.FRAME_FLAG_ZLIB)
+        self.assertEqual(_read_all(session.conn.data, step=4096), [(_payload(message), None)])
+
+    def test_newline_login_and_disabled_compression_are_uncompressed(self):
+        offered = protocol.available_compressions()
+        session, responses = self._login(protocol.FRAMING_NEWLINE, offered, list(protocol.FEATURES))
+        self.assertEqual(responses, [{"response": "login", "compression": None,
+                                      "features": list(protocol.FEATURES)}])
+        self.assertIsNone(session.compression)
+
+        server.COMPRESSION = False
+        session, responses = self._login(protocol.FRAMING_FRAMED, offered)
+        self.assertEqual(responses, [{"response": "login", "compression": None}])
+        self.assertIsNone(session.compression)
+
+    def test_old_client_login_gets_no_reply(self):
+        session, responses = self._login(protocol.FRAMING_NEWLINE, None)
+        self.assertEqual(responses, [])
+        self.assertIsNone(session.compression)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+İstek zamanlayıcısını sınar: kuyruk toplamda ve istemci başına dolduğunda iş kabul edilmez ve
+istemciye busy yanıtı gider; sırası gelmeden iptal edilen istekler çalıştırılmadan atlanır.
+"""
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared import protocol
+from server import server
+from server.scheduler import RequestScheduler
+
+TIMEOUT = 5
+
+
+class RecordingConnection:
+    """Sunucunun gönderdiği satır sonlu mesajları biriktiren bağlantı."""
+
+    def __init__(self):
+        self.data = b""
+
+    def sendall(self, data):
+        self.data += data
+
+    def messages(self):
+        return [json.loads(line) for line in self.data.splitlines()]
+
+
+def _wait_idle(scheduler):
+    """Zamanlayıcıdaki tüm işler bitene kadar bekler."""
+    deadline = time.monotonic() + TIMEOUT
+    while scheduler.pending():
+        if time.monotonic() > deadline:
+            raise AssertionError("işler bitmedi")
+        time.sleep(0.01)
+
+
+def _payload(message):
+    return message.encode("utf-8").rstrip(b"\n")
+
+
+class RequestSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = RequestScheduler(max_workers=1, max_pending=3, max_per_client=2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown()
+
+    def test_saturated_queue_rejects_jobs(self):
+        self.assertTrue(self.scheduler.submit("a", self.release.wait, TIMEOUT))
+        self.assertTrue(self.scheduler.submit("a", self.release.wait, TIMEOUT))
+        # İstemci sınırı dolu; diğer istemciler toplam sınıra kadar kabul edilir
+        self.assertFalse(self.scheduler.submit("a", self.release.wait, TIMEOUT))
+        self.assertTrue(self.scheduler.submit("b", self.release.wait, TIMEOUT))
+        self.assertFalse(self.scheduler.submit("c", self.release.wait, TIMEOUT))
+        self.assertEqual(self.scheduler.pending(), 3)
+        self.assertEqual(self.scheduler.pending("a"), 2)
+        self.assertEqual(self.scheduler.rejected, 2)
+
+        self.release.set()
+        _wait_idle(self.scheduler)
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.assertEqual(self.scheduler.pending("a"), 0)
+
+    def test_failing_job_releases_its_slot(self):
+        def fail():
+            raise ValueError("hata")
+        for _ in range(3):
+            self.assertTrue(self.scheduler.submit("a", fail))
+            _wait_idle(self.scheduler)
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.assertEqual(self.scheduler.rejected, 0)
+
+    def test_shutdown_rejects_new_jobs(self):
+        self.scheduler.shutdown()
+        self.assertFalse(self.scheduler.submit("a", self.release.set))
+        self.assertEqual(self.scheduler.pending(), 0)
+
+
+class ServerSchedulingTest(unittest.TestCase):
+    """_schedule'ın zamanlayıcı kararlarını istemciye nasıl yansıttığı."""
+
+    def setUp(self):
+        self.saved = server.scheduler
+        server.scheduler = RequestScheduler(max_workers=1, max_pending=2, max_per_client=2)
+        self.session = server.ClientSession(RecordingConnection(), ("127.0.0.1", 1))
+        self.session.framing = protocol.FRAMING_NEWLINE
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.ran = []
+
+    def tearDown(self):
+        self.release.set()
+        server.scheduler.shutdown()
+        server.scheduler = self.saved
+
+    def _blocking(self, reply, name):
+        self.started.set()
+        self.release.wait(TIMEOUT)
+        self.ran.append(name)
+        reply.send(protocol.make_error_response(name))
+
+    def _quick(self, reply, name):
+        self.ran.append(name)
+        reply.send(protocol.make_error_response(name))
+
+    def _schedule(self, request_id, func, name):
+        server._schedule(server.RequestReply(self.session, request_id), "get_file", func, name, path=name)
+
+    def test_saturated_queue_sends_busy_reply(self):
+        self._schedule(1, self._blocking, "a.txt")
+        self.assertTrue(self.started.wait(TIMEOUT))
+        self._schedule(2, self._quick, "b.txt")
+        self._schedule(3, self._quick, "c.txt")
+
+        self.assertEqual(self.session.conn.messages(), [
+            {"id": 3, "response": "busy", "command": "get_file",
+             "retry_after": server.BUSY_RETRY_AFTER, "path": "c.txt"},
+        ])
+        # Reddedilen istek iptal edilebilecekler arasında tutulmaz
+        self.assertEqual(sorted(self.session.active), [1, 2])
+
+        self.release.set()
+        _wait_idle(server.scheduler)
+        self.assertEqual(self.ran, ["a.txt", "b.txt"])
+        self.assertEqual(self.session.active, {})
+        self.assertEqual(server.scheduler.pending(), 0)
+
+    def test_cancelled_request_is_skipped(self):
+        self._schedule(1, self._blocking, "a.txt")
+        self.assertTrue(self.started.wait(TIMEOUT))
+        self._schedule(2, self._quick, "b.txt")
+        server.process_message(self.session, _payload(protocol.make_cancel_message(2)))
+        # Bilinmeyen veya geçersiz kimliklerin iptali yok sayılır
+        server.process_message(self.session, _payload(protocol.make_cancel_message(99)))
+        server.process_message(self.session, _payload(protocol.make_cancel_message("2")))
+
+        self.release.set()
+        _wait_idle(server.scheduler)
+        self.assertEqual(self.ran, ["a.txt"])
+        self.assertEqual([message.get("id") for message in self.session.conn.messages()], [1])
+        self.assertEqual(self.session.active, {})
+        self.assertEqual(server.scheduler.pending(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+Arama ve yol indekslerini sınar: arama indeksi ağaçla eşitlenir, değişen dosyaları yeniden
+okur ve eşleşme konumlarını dosyadaki orijinal satıra göre verir; yol indeksi sonuçları
+dosya adına göre sıralar. Ağaçlar ağaç önbelleğinin formatında elle kurulur.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import search_index
+from server.search_index import SearchIndex, PathIndex, PATH_MATCH_PREFIX, PATH_MATCH_FUZZY, is_searchable
+
+
+def _tree(*paths):
+    """'/' ile ayrılmış yollardan ağaç önbelleği formatında düğüm kurar."""
+    root = {"files": [], "children": {}}
+    for path in paths:
+        node = root
+        *dirs, name = path.split("/")
+        for part in dirs:
+            node = node["children"].setdefault(part, {"files": [], "children": {}})
+        node["files"].append(name)
+    return root
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.share = tempfile.mkdtemp()
+        self.index = SearchIndex()
+
+    def tearDown(self):
+        shutil.rmtree(self.share, ignore_errors=True)
+
+    def _write(self, rel_path, text):
+        path = os.path.join(self.share, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+    def _sync(self, version, *paths):
+        self.index.sync(self.share, _tree(*paths), version)
+
+    def _paths(self, query, limit=10):
+        results, _ = self.index.search(self.share, query, limit)
+        return sorted({result["path"] for result in results})
+
+    def test_sync_adds_and_removes_files(self):
+        self._write("a.txt", "elma armut\n")
+        self._write("src/b.py", "armut = 1\n")
+        self._sync("1", "a.txt", "src/b.py")
+        self.assertEqual(self._paths("armut"), ["a.txt", "src/b.py"])
+        self.assertEqual(self.index.stats(), {"files": 2, "indexed": 2, "trigrams": 5})
+
+        os.remove(os.path.join(self.share, "a.txt"))
+        self._sync("2", "src/b.py")
+        self.assertEqual(self._paths("armut"), ["src/b.py"])
+        self.assertEqual(self._paths("elma"), [])
+        self.assertEqual(self.index.stats()["files"], 1)
+
+    def test_same_version_is_not_reindexed(self):
+        self._write("a.txt", "elma\n")
+        self._sync("1", "a.txt")
+        self._write("a.txt", "kiraz\n")
+        self._sync("1", "a.txt")
+        # İçerik diskten okunduğundan yalnızca indekste kalan trigram'lar aday bulur
+        self.assertEqual(self._paths("kiraz"), [])
+
+    def test_mark_stale_rereads_file_on_next_sync(self):
+        self._write("a.txt", "elma\n")
+        self._sync("1", "a.txt")
+        self._write("a.txt", "kiraz\n")
+        self.index.mark_stale(["a.txt"])
+        self._sync("1", "a.txt")
+        self.assertEqual(self._paths("kiraz"), ["a.txt"])
+        self.assertEqual(self._paths("elma"), [])
+
+    def test_refresh_marks_changed_files(self):
+        self._write("a.txt", "elma\n")
+        self._write("b.txt", "elma\n")
+        self._sync("1", "a.txt", "b.txt")
+        self.index.refresh(self.share)
+        self._write("a.txt", "kiraz ve elma\n")
+
+        # Son kontrolden bu yana REFRESH_INTERVAL geçmediyse disk kontrol edilmez
+        self.index.refresh(self.share)
+        self._sync("1", "a.txt", "b.txt")
+        self.assertEqual(self._paths("kiraz"), [])
+
+        saved = search_index.REFRESH_INTERVAL
+        search_index.REFRESH_INTERVAL = 0
+        try:
+            self.index.refresh(self.share)
+        finally:
+            search_index.REFRESH_INTERVAL = saved
+        self._sync("1", "a.txt", "b.txt")
+        self.assertEqual(self._paths("kiraz"), ["a.txt"])
+        self.assertEqual(self._paths("elma"), ["a.txt", "b.txt"])
+
+    def test_results_are_truncated_at_limit(self):
+        self._write("a.txt", "elma\n" * 3)
+        self._write("b.txt", "elma\n" * 3)
+        self._sync("1", "a.txt", "b.txt")
+        results, truncated = self.index.search(self.share, "ELMA", 4)
+        self.assertTrue(truncated)
+        self.assertEqual([(r["path"], r["line"]) for r in results],
+                         [("a.txt", 1), ("a.txt", 2), ("a.txt", 3), ("b.txt", 1)])
+        results, truncated = self.index.search(self.share, "elma", 6)
+        self.assertFalse(truncated)
+        self.assertEqual(len(results), 6)
+
+    def test_binary_files_are_not_indexed(self):
+        path = os.path.join(self.share, "a.bin")
+        with open(path, 'wb') as f:
+            f.write(b"elma\0armut")
+        self._sync("1", "a.bin")
+        self.assertEqual(self.index.stats(), {"files": 1, "indexed": 0, "trigrams": 0})
+        self.assertEqual(self._paths("elma"), [])
+
+    def test_queries_without_trigram_are_not_searched(self):
+        self._write("a.txt", "x = 1\nab cd\n")
+        self._sync("1", "a.txt")
+        for query in ("ab", "x = 1", "a b"):
+            self.assertFalse(is_searchable(query))
+            self.assertEqual(self.index.search(self.share, query, 10), ([], False))
+        self.assertTrue(is_searchable("x = 100"))
+
+    def test_column_is_offset_in_original_line(self):
+        # 'İ' küçültülünce iki karakter olur; sütun orijinal satırdaki konum olmalı
+        self._write("tr.txt", "İzmir İstanbul Ankara\n")
+        self._sync("1", "tr.txt")
+        results, truncated = self.index.search(self.share, "ankara", 10)
+        self.assertFalse(truncated)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["column"], 15)
+
+        results, _ = self.index.search(self.share, "istanbul", 10)
+        self.assertEqual(results, [])
+        results, _ = self.index.search(self.share, "i̇stanbul", 10)
+        self.assertEqual(results[0]["column"], 6)
+        self.assertEqual(results[0]["snippet"], "İzmir İstanbul Ankara")
+
+class PathIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PathIndex()
+        self.index.sync("/share", _tree(
+            "main.py",
+            "bin/main",
+            "docs/main.md",
+            "src/main.py",
+            "src/domain.py",
+            "src/main_window.py",
+            "main/notes.txt",
+            "lib/m_a_i_n.py",
+            "lib/remain.txt",
+        ), "1")
+
+    def test_ranking(self):
+        # Tam ad, ad başlangıcı, yol başlangıcı, adda geçen, yolda geçen ve fuzzy eşleşmeler sırayla
+        self.assertEqual(self.index.find("main", 20), [
+            "bin/main",
+            "main.py", "src/main.py", "docs/main.md", "src/main_window.py",
+            "main/notes.txt",
+            "src/domain.py", "lib/remain.txt",
+            "lib/m_a_i_n.py",
+        ])
+        self.assertEqual(self.index.find("src/ma", 20), ["src/main.py", "src/main_window.py", "src/domain.py"])
+        # Fuzzy eşleşmelerde harfleri birbirine yakın olan önce gelir
+        self.assertEqual(self.index.find("main.py", 20), [
+            "main.py", "src/main.py",
+            "src/domain.py",
+            "lib/m_a_i_n.py", "src/main_window.py",
+        ])
+
+    def test_limit_keeps_best_matches(self):
+        self.assertEqual(self.index.find("MAIN", 2), ["bin/main", "main.py"])
+
+    def test_prefix_mode_skips_substring_and_fuzzy_matches(self):
+        self.assertEqual(self.index.find("main", 20, PATH_MATCH_PREFIX), [
+            "bin/main", "main.py", "src/main.py", "docs/main.md", "src/main_window.py", "main/notes.txt",
+        ])
+        self.assertEqual(self.index.find("src/d", 20, PATH_MATCH_PREFIX), ["src/domain.py"])
+        self.assertEqual(self.index.find("ain", 20, PATH_MATCH_PREFIX), [])
+        self.assertEqual(self.index.find("i_n", 20, PATH_MATCH_PREFIX), [])
+        self.assertEqual(self.index.find("i_n", 20, PATH_MATCH_FUZZY), ["lib/m_a_i_n.py", "src/main_window.py"])
+
+    def test_sync_with_new_version_replaces_paths(self):
+        self.index.sync("/share", _tree("yeni.txt"), "1")
+        self.assertEqual(self.index.find("yeni", 10), [])
+        self.index.sync("/share", _tree("yeni.txt"), "2")
+        self.assertEqual(self.index.find("yeni", 10), ["yeni.txt"])
+        self.assertEqual(self.index.find("main", 10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
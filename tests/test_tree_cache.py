@@ -0,0 +1,115 @@
+"""
+Ağaç önbelleğinin taramaları kilit dışında ve tek thread'le yaptığını sınar: tarama sürerken
+önbellek kilitlenmez, aynı anda gelen istekler tek bir taramanın sonucunu paylaşır ve diskle
+karşılaştırma sürerken önceki ağaç kullanılır.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server.tree_cache import TreeCache
+
+TIMEOUT = 5
+
+
+class BlockingTreeCache(TreeCache):
+    """Taramaları ve diskle karşılaştırmaları test izin verene kadar bekleten önbellek."""
+
+    def __init__(self, revalidate_interval):
+        super().__init__(revalidate_interval)
+        self.scans = 0
+        self.scan_started = threading.Event()
+        self.release_scan = threading.Event()
+        self.revalidate_started = threading.Event()
+        self.release_revalidate = threading.Event()
+
+    def _build(self, base_dir):
+        self.scans += 1
+        self.scan_started.set()
+        self.release_scan.wait(TIMEOUT)
+        return super()._build(base_dir)
+
+    def _revalidate(self, entry):
+        self.revalidate_started.set()
+        self.release_revalidate.wait(TIMEOUT)
+        return super()._revalidate(entry)
+
+
+class TreeCacheLockingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.share = tempfile.mkdtemp()
+        self._write("a.txt")
+        self.threads = []
+
+    def tearDown(self):
+        for thread in self.threads:
+            thread.join(TIMEOUT)
+        shutil.rmtree(self.share, ignore_errors=True)
+
+    def _write(self, name):
+        with open(os.path.join(self.share, name), "w", encoding="utf-8") as f:
+            f.write(name)
+
+    def _start(self, target, results):
+        thread = threading.Thread(target=lambda: results.append(target()), daemon=True)
+        thread.start()
+        self.threads.append(thread)
+        return thread
+
+    def test_concurrent_requests_share_one_scan(self):
+        cache = BlockingTreeCache(revalidate_interval=60)
+        results = []
+        self._start(lambda: cache.get_tree(self.share), results)
+        self.assertTrue(cache.scan_started.wait(TIMEOUT))
+
+        # Tarama sürerken kilit serbesttir; ağacı isteyenler taramayı bekler
+        self.assertFalse(cache.has_entry(self.share))
+        waiter = self._start(lambda: cache.get_tree(self.share), results)
+        waiter.join(0.2)
+        self.assertTrue(waiter.is_alive())
+
+        cache.release_scan.set()
+        waiter.join(TIMEOUT)
+        self.assertEqual(len(results), 2)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[0]["files"], ["a.txt"])
+        self.assertEqual(cache.scans, 1)
+
+    def test_previous_tree_is_used_while_revalidating(self):
+        cache = BlockingTreeCache(revalidate_interval=0)
+        cache.release_scan.set()
+        old_tree = cache.get_tree(self.share)
+        self._write("b.txt")
+
+        results = []
+        updater = self._start(lambda: cache.get_tree(self.share), results)
+        self.assertTrue(cache.revalidate_started.wait(TIMEOUT))
+        self.assertIs(cache.get_tree(self.share), old_tree)
+        self.assertIsNotNone(cache.get_version(self.share))
+
+        cache.release_revalidate.set()
+        updater.join(TIMEOUT)
+        self.assertEqual(sorted(results[0]["files"]), ["a.txt", "b.txt"])
+        self.assertEqual(cache.scans, 1)
+
+    def test_scan_finished_after_invalidate_is_not_cached(self):
+        cache = BlockingTreeCache(revalidate_interval=60)
+        results = []
+        builder = self._start(lambda: cache.get_tree(self.share), results)
+        self.assertTrue(cache.scan_started.wait(TIMEOUT))
+        cache.invalidate()
+        cache.release_scan.set()
+        builder.join(TIMEOUT)
+
+        self.assertFalse(cache.has_entry(self.share))
+        cache.get_tree(self.share)
+        self.assertEqual(cache.scans, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()